@@ -347,30 +347,40 @@ OSErr CATSMover_c::get_move(int n, Seconds model_time, Seconds step_len,
 		return 2;
 	}
 
-	LERec* prec;
-	LERec rec;
-	prec = &rec;
-
 	WorldPoint3D zero_delta = { {0, 0}, 0.};
 
-	for (int i = 0; i < n; i++) {
-		if ( LE_status[i] != OILSTAT_INWATER) {
-			delta[i] = zero_delta;
-			continue;
-		}
+	// GetScaledPatValue() recomputes refScale if the step isn't set up, and
+	// the uncertainty may draw random numbers -- otherwise each LE is on
+	// its own
+	int numThreads = 1;
+	if (spillType == FORECAST_LE &&
+		(fOptimize.isOptimizedForStep || scaleType != SCALE_OTHERGRID))
+		numThreads = fNumThreads;
+
+	SplitLEs(n, numThreads, [&](int start, int stop) {
+		LERec* prec;
+		LERec rec;
+		prec = &rec;
+
+		for (int i = start; i < stop; i++) {
+			if ( LE_status[i] != OILSTAT_INWATER) {
+				delta[i] = zero_delta;
+				continue;
+			}
 
-		rec.p = ref[i].p;
-		rec.z = ref[i].z;
+			rec.p = ref[i].p;
+			rec.z = ref[i].z;
 
-		// let's do the multiply by 1000000 here - this is what gnome expects
-		rec.p.pLat *= 1e6;
-		rec.p.pLong *= 1e6;
+			// let's do the multiply by 1000000 here - this is what gnome expects
+			rec.p.pLat *= 1e6;
+			rec.p.pLong *= 1e6;
 
-		delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+			delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
 
-		delta[i].p.pLat /= 1e6;
-		delta[i].p.pLong /= 1e6;
-	}
+			delta[i].p.pLat /= 1e6;
+			delta[i].p.pLong /= 1e6;
+		}
+	});
 
 	return noErr;
 }
@@ -178,6 +178,59 @@ void GetRandomVectorInUnitCircle(float *u,float *v)
 	} while ( (*u)*(*u) +  (*v)*(*v) > 1.0);
 }
 
+static unsigned long long gRandomStreamSeed = 1;
+
+static unsigned long long MixBits(unsigned long long z)
+{	// the splitmix64 finalizer
+	z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ULL;
+	z = (z ^ (z >> 27)) * 0x94d049bb133111ebULL;
+	return z ^ (z >> 31);
+}
+
+void SetRandomStreamSeed(unsigned long seed)
+{
+	gRandomStreamSeed = seed;
+}
+
+void InitRandomStream(RandomStream *stream, unsigned long streamID, unsigned long spill, unsigned long elementID, unsigned long step)
+{
+	unsigned long long key = MixBits(gRandomStreamSeed);
+	
+	key = MixBits(key ^ streamID);
+	key = MixBits(key ^ spill);
+	key = MixBits(key ^ elementID);
+	key = MixBits(key ^ step);
+	
+	stream->key = key;
+	stream->counter = 0;
+}
+
+double GetStreamRandom(RandomStream *stream)
+{	// in [0, 1), from the top 53 bits
+	unsigned long long bits;
+	
+	stream->counter++;
+	bits = MixBits(stream->key + stream->counter * 0x9e3779b97f4a7c15ULL);
+	
+	return (bits >> 11) * (1.0 / 9007199254740992.0);
+}
+
+float GetRandomFloat(float low, float high, RandomStream *stream)
+{
+	if (!stream) return GetRandomFloat(low, high);
+	
+	return low + (high - low) * GetStreamRandom(stream);
+}
+
+void GetRandomVectorInUnitCircle(float *u,float *v, RandomStream *stream)
+{
+	do
+	{
+		*u = GetRandomFloat(-1.0,1.0,stream);
+		*v = GetRandomFloat(-1.0,1.0,stream);
+	} while ( (*u)*(*u) +  (*v)*(*v) > 1.0);
+}
+
 
 char *SwapN(char *s, short n)
 {
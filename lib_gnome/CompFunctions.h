@@ -11,6 +11,7 @@
 
 #include "Basics.h"
 #include "TypeDefs.h"
+#include "ExportSymbols.h"
 
 #ifdef pyGNOME
 #define PtCurMap PtCurMap_c
@@ -18,6 +19,15 @@
 
 class PtCurMap;
 
+// Counter based random numbers: the n-th draw from the stream for a given
+// (seed, stream, spill, element, step) is always the same number, whatever
+// the order or the thread the elements are done in.
+// gnome.utilities.rand.stream_random() makes the same numbers in python.
+typedef struct {
+	unsigned long long key;		// the seed, stream, spill, element and step mixed together
+	unsigned long long counter;	// number of draws so far
+} RandomStream;
+
 double UorV(VelocityRec vector, short index);
 double UorV(VelocityRec3D vector, short index);
 double Hermite(double v1, double s1, double t1,
@@ -41,6 +51,12 @@ short ScaleToShort(long n);
 long GetRandom(long low, long high);
 float GetRandomFloat(float low, float high);
 void GetRandomVectorInUnitCircle(float *u,float *v);
+void DLL_API SetRandomStreamSeed(unsigned long seed);
+void InitRandomStream(RandomStream *stream, unsigned long streamID, unsigned long spill, unsigned long elementID, unsigned long step);
+double GetStreamRandom(RandomStream *stream);
+// these use rand(), like the ones above, if stream is NULL
+float GetRandomFloat(float low, float high, RandomStream *stream);
+void GetRandomVectorInUnitCircle(float *u,float *v, RandomStream *stream);
 char *SwapN(char *s, short n);
 long Assoc(long key, LONGPTR table, short n);
 void SwitchShorts(SHORTPTR a, SHORTPTR b);
@@ -233,32 +233,41 @@ OSErr GridCurrentMover_c::get_move(int n, Seconds model_time, Seconds step_len,
 		return 2;
 	}
 	
-	LERec* prec;
-	LERec rec;
-	prec = &rec;
-	
 	WorldPoint3D zero_delta ={{0,0},0.};
 	
-	for (int i = 0; i < n; i++) {
+	// GetMove() loads the data if the step isn't set up (and for each LE
+	// with RK4), and the uncertainty may draw random numbers -- otherwise
+	// each LE is on its own
+	int numThreads = 1;
+	if (spillType == FORECAST_LE && fIsOptimizedForStep && num_method != RK4)
+		numThreads = fNumThreads;
+	
+	SplitLEs(n, numThreads, [&](int start, int stop) {
+		LERec* prec;
+		LERec rec;
+		prec = &rec;
 		
-		// only operate on LE if the status is in water
-		if( LE_status[i] != OILSTAT_INWATER)
-		{
-			delta[i] = zero_delta;
-			continue;
+		for (int i = start; i < stop; i++) {
+			
+			// only operate on LE if the status is in water
+			if( LE_status[i] != OILSTAT_INWATER)
+			{
+				delta[i] = zero_delta;
+				continue;
+			}
+			rec.p = ref[i].p;
+			rec.z = ref[i].z;
+			
+			// let's do the multiply by 1000000 here - this is what gnome expects
+			rec.p.pLat *= 1000000;	
+			rec.p.pLong*= 1000000;
+			
+			delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+			
+			delta[i].p.pLat /= 1000000;
+			delta[i].p.pLong /= 1000000;
 		}
-		rec.p = ref[i].p;
-		rec.z = ref[i].z;
-		
-		// let's do the multiply by 1000000 here - this is what gnome expects
-		rec.p.pLat *= 1000000;	
-		rec.p.pLong*= 1000000;
-		
-		delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
-		
-		delta[i].p.pLat /= 1000000;
-		delta[i].p.pLong /= 1000000;
-	}
+	});
 	
 	return noErr;
 }
@@ -135,32 +135,38 @@ OSErr GridWindMover_c::get_move(int n, Seconds model_time, Seconds step_len,
 		return 2;
 	}
 
-	LERec rec, *prec;
-	prec = &rec;
-
 	WorldPoint3D zero_delta = {0, 0, 0.};
 
-	for (int i = 0; i < n; i++) {
+	// GetMove() loads the data if the step isn't set up, and the
+	// uncertainty may draw random numbers -- otherwise each LE is on its own
+	int numThreads = (spillType == FORECAST_LE && fIsOptimizedForStep) ? fNumThreads : 1;
 
-		// only operate on LE if the status is in water
-		if (LE_status[i] != OILSTAT_INWATER) {
-			delta[i] = zero_delta;
-			continue;
-		}
+	SplitLEs(n, numThreads, [&](int start, int stop) {
+		LERec rec, *prec;
+		prec = &rec;
 
-		rec.p = ref[i].p;
-		rec.z = ref[i].z;
-		rec.windage = windages[i];	// define the windage for the current LE
+		for (int i = start; i < stop; i++) {
 
-		// let's do the multiply by 1000000 here - this is what gnome expects
-		rec.p.pLat *= 1000000;	
-		rec.p.pLong *= 1000000;
+			// only operate on LE if the status is in water
+			if (LE_status[i] != OILSTAT_INWATER) {
+				delta[i] = zero_delta;
+				continue;
+			}
 
-		delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+			rec.p = ref[i].p;
+			rec.z = ref[i].z;
+			rec.windage = windages[i];	// define the windage for the current LE
 
-		delta[i].p.pLat /= 1000000;
-		delta[i].p.pLong /= 1000000;
-	}
+			// let's do the multiply by 1000000 here - this is what gnome expects
+			rec.p.pLat *= 1000000;	
+			rec.p.pLong *= 1000000;
+
+			delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+
+			delta[i].p.pLat /= 1000000;
+			delta[i].p.pLong /= 1000000;
+		}
+	});
 	
 	return noErr;
 }
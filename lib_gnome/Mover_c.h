@@ -17,6 +17,10 @@
 //#include "Map_c.h"
 #include "ExportSymbols.h"
 
+#include <algorithm>
+#include <thread>
+#include <vector>
+
 #ifdef pyGNOME
 //#define TMap Map_c
 #endif
@@ -33,11 +37,40 @@ public:
 #endif
 	Seconds				fUncertainStartTime;
 	double				fDuration; 				// duration time for uncertainty;
+	int					fNumThreads;			// most threads get_move() may split the LEs between
 	//RGBColor			fColor;
 	
 protected:
 	double				fTimeUncertaintyWasSet;	// time to measure next uncertainty update
 
+	// Call loop(start, stop) for the LEs [0, n), split between up to
+	// numThreads threads -- the first part is done in the calling thread.
+	// Only for loops that change nothing but the LEs they are given.
+	template <class Loop>
+	void				SplitLEs(int n, int numThreads, Loop loop)
+	{
+		// not worth starting a thread for fewer LEs than this
+		const int minLEsPerThread = 1000;
+
+		numThreads = std::min(numThreads, n / minLEsPerThread);
+
+		if (numThreads <= 1) {
+			loop(0, n);
+			return;
+		}
+
+		int chunk = (n + numThreads - 1) / numThreads;
+		std::vector<std::thread> threads;
+
+		for (int start = chunk; start < n; start += chunk)
+			threads.push_back(std::thread(loop, start, std::min(start + chunk, n)));
+
+		loop(0, chunk);
+
+		for (size_t i = 0; i < threads.size(); i++)
+			threads[i].join();
+	}
+
 public:
 #ifndef pyGNOME
 	Mover_c (TMap *owner, char *name);
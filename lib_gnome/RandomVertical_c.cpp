@@ -54,7 +54,8 @@ void RandomVertical_c::ModelStepIsDone()
 }
 
 
-OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
+OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID,
+								  unsigned long streamID, unsigned int* elementIDs, unsigned short* spillNums) {
 	
 	// JS Ques: Is this required? Could cy/python invoke this method without well defined numpy arrays?
 	if(!delta || !ref) {
@@ -69,31 +70,46 @@ OSErr RandomVertical_c::get_move(int n, Seconds model_time, Seconds step_len, Wo
 		return 2;
 	}
 	
-	LERec* prec;
-	LERec rec;
-	prec = &rec;
+	bool useStreams = (elementIDs && spillNums);
 	
 	WorldPoint3D zero_delta ={{0,0},0.};
-
-	for (int i = 0; i < n; i++) {
-		// only operate on LE if the status is in water
-		if( LE_status[i] != OILSTAT_INWATER)
-		{
-			delta[i] = zero_delta;
-			continue;
+	
+	// the global random numbers depend on the order the LEs are done in, so
+	// only the random streams can be split between threads
+	int numThreads = useStreams ? fNumThreads : 1;
+	
+	SplitLEs(n, numThreads, [&](int start, int stop) {
+		LERec* prec;
+		LERec rec;
+		prec = &rec;
+		RandomStream stream;
+	
+		for (int i = start; i < stop; i++) {
+			// only operate on LE if the status is in water
+			if( LE_status[i] != OILSTAT_INWATER)
+			{
+				delta[i] = zero_delta;
+				continue;
+			}
+			rec.p = ref[i].p;
+			rec.z = ref[i].z;
+	
+			// let's do the multiply by 1000000 here - this is what gnome expects
+			rec.p.pLat *= 1000000;
+			rec.p.pLong*= 1000000;
+	
+			if (useStreams)
+			{
+				InitRandomStream(&stream, streamID, 2 * spillNums[i] + (spillType == UNCERTAINTY_LE), elementIDs[i], model_time);
+				delta[i] = this->GetRandomMove(step_len, prec, &stream);
+			}
+			else
+				delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+	
+			delta[i].p.pLat /= 1000000;
+			delta[i].p.pLong /= 1000000;
 		}
-		rec.p = ref[i].p;
-		rec.z = ref[i].z;
-		
-		// let's do the multiply by 1000000 here - this is what gnome expects
-		rec.p.pLat *= 1000000;	
-		rec.p.pLong*= 1000000;
-		
-		delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
-		
-		delta[i].p.pLat /= 1000000;
-		delta[i].p.pLong /= 1000000;
-	}
+	});
 	
 	return noErr;
 }
@@ -106,6 +122,12 @@ double GetDepthAtPoint(WorldPoint p)
 }
 
 WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType)
+{
+	return GetRandomMove(timeStep, theLE, NULL);
+}
+
+// draws from stream, or the global random numbers if it is NULL
+WorldPoint3D RandomVertical_c::GetRandomMove (Seconds timeStep, LERec *theLE, RandomStream *stream)
 {
 	double	dLong, dLat, z = 0;
 	WorldPoint3D	deltaPoint = {{0,0},0.};
@@ -128,8 +150,8 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		// diffusion coefficient is O(1) vs O(100000) for horizontal / vertical diffusion
 		// vertical is 3-5 cm^2/s, divide by sqrt of 10^4
 		
-		rand1 = GetRandomFloat(-1.0, 1.0);
-		rand2 = GetRandomFloat(-1.0, 1.0);
+		rand1 = GetRandomFloat(-1.0, 1.0, stream);
+		rand2 = GetRandomFloat(-1.0, 1.0, stream);
 		if ((*theLE).z>mixedLayerDepth)
 			horizontalDiffusionCoefficient = sqrt(6.*(fHorizontalDiffusionCoefficientBelowML/10000.)*timeStep)/METERSPERDEGREELAT;
 		else
@@ -152,7 +174,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		{
 			if (fVerticalDiffusionCoefficient==0) return deltaPoint;	
 			verticalDiffusionCoefficient = sqrt(6.*(fVerticalDiffusionCoefficient/10000.)*timeStep);
-			rand = GetRandomFloat(-1.0, 1.0);
+			rand = GetRandomFloat(-1.0, 1.0, stream);
 			deltaPoint.z = rand*verticalDiffusionCoefficient;
 			//z = deltaPoint.z;	// will add this on to the next move
 			
@@ -168,7 +190,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 			{
 				deltaPoint.z = mixedLayerDepth - (totalLEDepth - mixedLayerDepth) - (*theLE).z; // reflect about mixed layer depth
 				// check if went above surface and put randomly into mixed layer
-				if ((*theLE).z+deltaPoint.z <= 0) deltaPoint.z = GetRandomFloat(eps,mixedLayerDepth) - (*theLE).z;	
+				if ((*theLE).z+deltaPoint.z <= 0) deltaPoint.z = GetRandomFloat(eps,mixedLayerDepth, stream) - (*theLE).z;	
 					// or just let it go and deal with it later? then it will go into full water column...
 			}
 		}
@@ -177,7 +199,7 @@ WorldPoint3D RandomVertical_c::GetMove (const Seconds& model_time, Seconds timeS
 		// now apply below mixed layer depth diffusion to all particles above and below
 		if (fVerticalBottomDiffusionCoefficient==0/* && z==0*/) /*return deltaPoint*/goto dochecks;	// don't return until do checks
 		verticalDiffusionCoefficient = sqrt(6.*(fVerticalBottomDiffusionCoefficient/10000.)*timeStep);
-		rand = GetRandomFloat(-1.0, 1.0);
+		rand = GetRandomFloat(-1.0, 1.0, stream);
 		deltaPoint.z = rand*verticalDiffusionCoefficient;
 		
 		z = z + deltaPoint.z;	// add move to previous move if any
@@ -194,7 +216,7 @@ dochecks:
 			deltaPoint.z = - totalLEDepth - (*theLE).z;	// reflect below surface
 			totalLEDepth = (*theLE).z + deltaPoint.z;
 			if (totalLEDepth > depthAtPoint) 
-				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps) - (*theLE).z;
+				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps, stream) - (*theLE).z;
 			return deltaPoint;
 		}
 		if (totalLEDepth==depthAtPoint) 
@@ -209,7 +231,7 @@ dochecks:
 			totalLEDepth = (*theLE).z + deltaPoint.z;
 			if (totalLEDepth <= 0) 
 				// put randomly into water column
-				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps) - (*theLE).z;
+				deltaPoint.z = GetRandomFloat(eps,depthAtPoint-eps, stream) - (*theLE).z;
 			return deltaPoint;
 		}
 		else
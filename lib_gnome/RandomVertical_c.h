@@ -13,6 +13,7 @@
 #include "Basics.h"
 #include "TypeDefs.h"
 #include "Mover_c.h"
+#include "CompFunctions.h"
 #include "ExportSymbols.h"
 
 class DLL_API RandomVertical_c : virtual public Mover_c {
@@ -33,9 +34,12 @@ public:
 	virtual OSErr 		PrepareForModelStep(const Seconds&, const Seconds&, bool, int numLESets, int* LESetsSizesList); 
 	virtual void 		ModelStepIsDone();
 	virtual WorldPoint3D       GetMove(const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType);
+	WorldPoint3D		GetRandomMove(Seconds timeStep, LERec *theLE, RandomStream *stream);
 	
 	
-	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID);
+	// with elementIDs and spillNums, each LE draws from its own RandomStream
+	OSErr				get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID,
+								 unsigned long streamID = 0, unsigned int* elementIDs = NULL, unsigned short* spillNums = NULL);
 
 protected:
 	void				Init();
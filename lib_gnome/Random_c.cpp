@@ -59,7 +59,8 @@ void Random_c::ModelStepIsDone()
 }
 
 
-OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID) {
+OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint3D* ref, WorldPoint3D* delta, short* LE_status, LEType spillType, long spill_ID,
+						  unsigned long streamID, unsigned int* elementIDs, unsigned short* spillNums) {
 	
 	// JS Ques: Is this required? Could cy/python invoke this method without well defined numpy arrays?
 	if(!delta || !ref) {
@@ -74,36 +75,60 @@ OSErr Random_c::get_move(int n, Seconds model_time, Seconds step_len, WorldPoint
 		return 2;
 	}
 	
-	LERec* prec;
-	LERec rec;
-	prec = &rec;
+	bool useStreams = (elementIDs && spillNums);
 	
 	WorldPoint3D zero_delta ={{0,0},0.};
-
-	for (int i = 0; i < n; i++) {
-		// only operate on LE if the status is in water
-		if( LE_status[i] != OILSTAT_INWATER)
-		{
-			delta[i] = zero_delta;
-			continue;
-		}
-		rec.p = ref[i].p;
-		rec.z = ref[i].z;
-		
-		// let's do the multiply by 1000000 here - this is what gnome expects
-		rec.p.pLat *= 1000000;	// really only need this for the latitude
-		//rec.p.pLong*= 1000000;
-		
-		delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+	
+	// the global random numbers depend on the order the LEs are done in, so
+	// only the random streams can be split between threads -- and not if
+	// GetMove has to update fOptimize for each LE
+	int numThreads = 1;
+	if (useStreams && this->fOptimize.isOptimizedForStep && !bUseDepthDependent)
+		numThreads = fNumThreads;
+	
+	SplitLEs(n, numThreads, [&](int start, int stop) {
+		LERec* prec;
+		LERec rec;
+		prec = &rec;
+		RandomStream stream;
 		
-		delta[i].p.pLat /= 1000000;
-		delta[i].p.pLong /= 1000000;
-	}
+		for (int i = start; i < stop; i++) {
+			// only operate on LE if the status is in water
+			if( LE_status[i] != OILSTAT_INWATER)
+			{
+				delta[i] = zero_delta;
+				continue;
+			}
+			rec.p = ref[i].p;
+			rec.z = ref[i].z;
+			
+			// let's do the multiply by 1000000 here - this is what gnome expects
+			rec.p.pLat *= 1000000;	// really only need this for the latitude
+			//rec.p.pLong*= 1000000;
+			
+			if (useStreams)
+			{
+				InitRandomStream(&stream, streamID, 2 * spillNums[i] + (spillType == UNCERTAINTY_LE), elementIDs[i], model_time);
+				delta[i] = this->GetRandomMove(step_len, prec, spillType, &stream);
+			}
+			else
+				delta[i] = this->GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+			
+			delta[i].p.pLat /= 1000000;
+			delta[i].p.pLong /= 1000000;
+		}
+	});
 	
 	return noErr;
 }
 
 WorldPoint3D Random_c::GetMove (const Seconds& model_time, Seconds timeStep,long setIndex,long leIndex,LERec *theLE,LETYPE leType)
+{
+	return GetRandomMove(timeStep, theLE, leType, NULL);
+}
+
+// draws from stream, or the global random numbers if it is NULL
+WorldPoint3D Random_c::GetRandomMove (Seconds timeStep, LERec *theLE, LETYPE leType, RandomStream *stream)
 {
 	double		dLong, dLat;
 	WorldPoint3D	deltaPoint = {{0,0},0.};
@@ -164,12 +189,12 @@ WorldPoint3D Random_c::GetMove (const Seconds& model_time, Seconds timeStep,long
 	
 	if(this -> fOptimize.isFirstStep)
 	{
-		GetRandomVectorInUnitCircle(&rand1,&rand2);
+		GetRandomVectorInUnitCircle(&rand1,&rand2,stream);
 	}
 	else
 	{
-		rand1 = GetRandomFloat(-1.0, 1.0);
-		rand2 = GetRandomFloat(-1.0, 1.0);
+		rand1 = GetRandomFloat(-1.0, 1.0, stream);
+		rand2 = GetRandomFloat(-1.0, 1.0, stream);
 	}
 	
 	dLong = (rand1 * diffusionCoefficient )/ LongToLatRatio3 (refPoint.pLat);
@@ -552,32 +552,38 @@ OSErr WindMover_c::get_move(int n, Seconds model_time, Seconds step_len,
 		return 2;
 	}
 
-	LERec* prec;
-	LERec rec;
-	prec = &rec;
-
 	WorldPoint3D zero_delta ={{0,0},0.};
 
-	for (int i = 0; i < n; i++) {
-		// only operate on LE if the status is in water
-		if ( LE_status[i] != OILSTAT_INWATER) {
-			delta[i] = zero_delta;
-			continue;
-		}
+	// the uncertainty may draw random numbers, so the uncertainty LEs are
+	// done one after the other
+	int numThreads = (spillType == FORECAST_LE) ? fNumThreads : 1;
 
-		rec.p = ref[i].p;
-		rec.z = ref[i].z;
-		rec.windage = windages[i];	// define the windage for the current LE
+	SplitLEs(n, numThreads, [&](int start, int stop) {
+		LERec* prec;
+		LERec rec;
+		prec = &rec;
 
-		// let's do the multiply by 1000000 here - this is what gnome expects
-		rec.p.pLat *= 1000000;	// really only need this for the latitude
-		//rec.p.pLong*= 1000000;
+		for (int i = start; i < stop; i++) {
+			// only operate on LE if the status is in water
+			if ( LE_status[i] != OILSTAT_INWATER) {
+				delta[i] = zero_delta;
+				continue;
+			}
 
-		delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+			rec.p = ref[i].p;
+			rec.z = ref[i].z;
+			rec.windage = windages[i];	// define the windage for the current LE
 
-		delta[i].p.pLat /= 1000000;
-		delta[i].p.pLong /= 1000000;
-	}
+			// let's do the multiply by 1000000 here - this is what gnome expects
+			rec.p.pLat *= 1000000;	// really only need this for the latitude
+			//rec.p.pLong*= 1000000;
+
+			delta[i] = GetMove(model_time, step_len, spill_ID, i, prec, spillType);
+
+			delta[i].p.pLat /= 1000000;
+			delta[i].p.pLong /= 1000000;
+		}
+	});
 
 	return noErr;
 }
@@ -249,6 +249,10 @@ _default_values = {'positions': ((3,), world_point_type, 'positions',
                    'droplet_diameter': ((), np.float64, 'droplet_diameter',
                                         0.),
                    'age': ((), np.int32, 'age', 0),
+                   # the grid cell each element was last found in by a
+                   # PyMover, where its search starts next time. -1 if none.
+                   # The movers add one per grid, named cell_index_<grid id>
+                   'cell_index': ((), np.int64, 'cell_index', -1),
 
                    # WEATHERING DATA
                    # following used to compute spreading (LE thickness)
@@ -263,8 +263,8 @@ cdef class CyCatsMover(CyCurrentMover):
         return True
 
     def get_move(self,
-                 model_time,
-                 step_len,
+                 Seconds model_time,
+                 Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
@@ -297,11 +297,12 @@ cdef class CyCatsMover(CyCurrentMover):
         """
         cdef OSErr err
 
-        N = len(ref_points)
+        cdef int N = len(ref_points)
 
-        err = self.cats.get_move(N, model_time, step_len,
-                                 &ref_points[0], &delta[0], &LE_status[0],
-                                 spill_type, 0)
+        with nogil:
+            err = self.cats.get_move(N, model_time, step_len,
+                                     &ref_points[0], &delta[0], &LE_status[0],
+                                     spill_type, 0)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta, '
                              'and windages are defined')
@@ -306,8 +306,8 @@ cdef class CyComponentMover(CyCurrentMover):
 
 
     def get_move(self,
-                 model_time,
-                 step_len,
+                 Seconds model_time,
+                 Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points, 
                  cnp.ndarray[WorldPoint3D, ndim=1] delta, 
                  cnp.ndarray[short] LE_status, 
@@ -338,9 +338,10 @@ cdef class CyComponentMover(CyCurrentMover):
         """
         cdef OSErr err
 
-        N = len(ref_points)
+        cdef int N = len(ref_points)
  
-        err = self.component.get_move(N, model_time, step_len, &ref_points[0], &delta[0], &LE_status[0], spill_type, 0)
+        with nogil:
+            err = self.component.get_move(N, model_time, step_len, &ref_points[0], &delta[0], &LE_status[0], spill_type, 0)
         if err == 1:
             raise ValueError("Make sure numpy arrays for ref_points and deltas are defined")
 
@@ -209,8 +209,8 @@ cdef class CyGridCurrentMover(CyCurrentMoverBase):
         return end_time
 
     def get_move(self,
-                 model_time,
-                 step_len,
+                 Seconds model_time,
+                 Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
@@ -239,13 +239,14 @@ cdef class CyGridCurrentMover(CyCurrentMoverBase):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)
-
-        err = self.grid_current.get_move(N, model_time, step_len,
-                                         &ref_points[0],
-                                         &delta[0],
-                                         &LE_status[0],
-                                         spill_type, 0)
+        cdef int N = len(ref_points)
+
+        with nogil:
+            err = self.grid_current.get_move(N, model_time, step_len,
+                                             &ref_points[0],
+                                             &delta[0],
+                                             &LE_status[0],
+                                             spill_type, 0)
 
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points '
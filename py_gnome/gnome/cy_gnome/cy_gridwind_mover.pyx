@@ -138,8 +138,8 @@ cdef class CyGridWindMover(CyWindMoverBase):
         return end_time
 
     def get_move(self,
-                 model_time,
-                 step_len,
+                 Seconds model_time,
+                 Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[cnp.npy_double] windages,
@@ -172,11 +172,12 @@ cdef class CyGridWindMover(CyWindMoverBase):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)
+        cdef int N = len(ref_points)
 
-        err = self.grid_wind.get_move(N, model_time, step_len,
-                                      &ref_points[0], &delta[0], &windages[0],
-                                      <short *>&LE_status[0], spill_type, 0)
+        with nogil:
+            err = self.grid_wind.get_move(N, model_time, step_len,
+                                          &ref_points[0], &delta[0], &windages[0],
+                                          <short *>&LE_status[0], spill_type, 0)
         if err == 1:
             raise ValueError("Make sure numpy arrays for ref_points and"
                              " delta are defined")
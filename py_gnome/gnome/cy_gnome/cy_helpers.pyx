@@ -42,6 +42,14 @@ def srand(seed):
     stdlib.srand(seed)
 
 
+def set_random_stream_seed(unsigned long seed):
+    """
+    Sets the seed of the per element random streams of lib_gnome
+    (RandomStream in CompFunctions.h)
+    """
+    utils.SetRandomStreamSeed(seed)
+
+
 def rand():
     """
     Calls the C stdlib.rand() function
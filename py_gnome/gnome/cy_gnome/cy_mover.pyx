@@ -44,6 +44,30 @@ cdef class CyMover(object):
         return ('{0} object - see attributes for more info'
                 .format(self.__class__.__name__))
 
+    property num_threads:
+        """
+        The most threads the C++ get_move() may split the elements between.
+        The movers that can't do their elements independently of each other
+        (the uncertainty elements, the random movers unless they draw from
+        per element random streams) use one.
+        """
+        def __get__(self):
+            if not self.mover:
+                raise OSError('{0.__class__.__name__}: no C++ mover attached'
+                              .format(self))
+
+            return self.mover.fNumThreads
+
+        def __set__(self, int value):
+            if not self.mover:
+                raise OSError('{0.__class__.__name__}: no C++ mover attached'
+                              .format(self))
+
+            if value < 1:
+                raise ValueError('num_threads must be 1 or more')
+
+            self.mover.fNumThreads = value
+
     def prepare_for_model_run(self):
         """
         default implementation. It calls the C++ objects's
@@ -156,12 +156,15 @@ cdef class CyRandomMover3D(cy_mover.CyMover):
                         self.surface_is_allowed))
 
     def get_move(self,
-                 model_time,
-                 step_len,
+                 Seconds model_time,
+                 Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[short] LE_status,
-                 LEType spill_type):
+                 LEType spill_type,
+                 random_stream=None,
+                 cnp.ndarray[cnp.uint32_t] element_ids=None,
+                 cnp.ndarray[cnp.uint16_t] spill_nums=None):
         """
         .. function:: get_move(self,
                  model_time,
@@ -182,14 +185,34 @@ cdef class CyRandomMover3D(cy_mover.CyMover):
         :type delta: numpy array of WorldPoint3D
         :param le_status: status of each particle - movement is only on particles in water
         :param spill_type: LEType defining whether spill is forecast or uncertain 
+        :param random_stream: if not None, each element draws from its own
+                              random stream, keyed by this stream number and
+                              the element_ids and spill_nums, instead of the
+                              global random numbers
+        :param element_ids: the 'id' of each element
+        :param spill_nums: the 'spill_num' of each element
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
-
-        err = self.rand.get_move(N, model_time, step_len,
-                                 &ref_points[0], &delta[0], &LE_status[0],
-                                 spill_type, 0)
+        cdef int N = len(ref_points)
+        cdef unsigned long stream_id = 0
+        cdef unsigned int *ids = NULL
+        cdef unsigned short *nums = NULL
+
+        if random_stream is not None:
+            if (element_ids is None or spill_nums is None or
+                    len(element_ids) != N or len(spill_nums) != N):
+                raise ValueError('random streams need the element_ids and '
+                                 'spill_nums of all the elements')
+
+            stream_id = random_stream
+            ids = <unsigned int *>&element_ids[0]
+            nums = <unsigned short *>&spill_nums[0]
+
+        with nogil:
+            err = self.rand.get_move(N, model_time, step_len,
+                                     &ref_points[0], &delta[0], &LE_status[0],
+                                     spill_type, 0, stream_id, ids, nums)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta '
                              'are defined')
@@ -63,8 +63,8 @@ cdef class CyRiseVelocityMover(cy_mover.CyMover):
 #                 (self.water_density, self.water_viscosity)
 # 
     def get_move(self,
-                 model_time,
-                 step_len,
+                 Seconds model_time,
+                 Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[cnp.npy_double] rise_velocity,
@@ -96,17 +96,18 @@ cdef class CyRiseVelocityMover(cy_mover.CyMover):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
-
-        err = self.rise_vel.get_move(N,
-                                  model_time,
-                                  step_len,
-                                  &ref_points[0],
-                                  &delta[0],
-                                  &rise_velocity[0],
-                                  &LE_status[0],
-                                  spill_type,
-                                  0)
+        cdef int N = len(ref_points)
+
+        with nogil:
+            err = self.rise_vel.get_move(N,
+                                      model_time,
+                                      step_len,
+                                      &ref_points[0],
+                                      &delta[0],
+                                      &rise_velocity[0],
+                                      &LE_status[0],
+                                      spill_type,
+                                      0)
 
         if err == 1:
             raise ValueError("Make sure ref_points, delta and rise_velocity"
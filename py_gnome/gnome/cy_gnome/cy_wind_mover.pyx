@@ -123,7 +123,7 @@ cdef class CyWindMover(CyWindMoverBase):
         elif cmp == 3:
             return not self.__eq(other)
 
-    def get_move(self, model_time, step_len,
+    def get_move(self, Seconds model_time, Seconds step_len,
                  cnp.ndarray[WorldPoint3D, ndim=1] ref_points,
                  cnp.ndarray[WorldPoint3D, ndim=1] delta,
                  cnp.ndarray[cnp.npy_double] windages,
@@ -155,16 +155,17 @@ cdef class CyWindMover(CyWindMoverBase):
         :returns: none
         """
         cdef OSErr err
-        N = len(ref_points)  # set a data type?
+        cdef int N = len(ref_points)
 
         # modifies delta in place
-        err = self.wind.get_move(N, model_time, step_len,
-                                 &ref_points[0],
-                                 &delta[0],
-                                 &windages[0],
-                                 &LE_status[0],
-                                 spill_type,
-                                 0)
+        with nogil:
+            err = self.wind.get_move(N, model_time, step_len,
+                                     &ref_points[0],
+                                     &delta[0],
+                                     &windages[0],
+                                     &LE_status[0],
+                                     spill_type,
+                                     0)
         if err == 1:
             raise ValueError('Make sure numpy arrays for ref_points, delta '
                              'and windages are defined')
@@ -19,6 +19,7 @@ cython files since there maybe no need to expose all the C++ functionality.
 'movers:'
 cdef extern from "Mover_c.h":
     cdef cppclass Mover_c:
+        int fNumThreads
         OSErr PrepareForModelRun()
         OSErr PrepareForModelStep(Seconds &time, Seconds &time_step,
                                   bool uncertain, int numLESets,
@@ -33,7 +34,9 @@ cdef extern from "Random_c.h":
         double fUncertaintyFactor
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
-                       short* LE_status, LEType spillType, long spillID)        
+                       short* LE_status, LEType spillType, long spillID,
+                       unsigned long streamID, unsigned int* elementIDs,
+                       unsigned short* spillNums) nogil
 
 cdef extern from "RandomVertical_c.h":
     cdef cppclass RandomVertical_c(Mover_c):
@@ -46,7 +49,9 @@ cdef extern from "RandomVertical_c.h":
         bool bSurfaceIsAllowed
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
-                       short* LE_status, LEType spillType, long spillID)        
+                       short* LE_status, LEType spillType, long spillID,
+                       unsigned long streamID, unsigned int* elementIDs,
+                       unsigned short* spillNums) nogil
 
 cdef extern from "RiseVelocity_c.h":
     OSErr get_rise_velocity(int n, double *rise_vel, double *le_density,
@@ -61,7 +66,7 @@ cdef extern from "RiseVelocity_c.h":
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
                        double* rise_velocity,
-                       short* LE_status, LEType spillType, long spillID)        
+                       short* LE_status, LEType spillType, long spillID) nogil
 
 cdef extern from "WindMover_c.h":
     cdef cppclass WindMover_c(Mover_c):
@@ -77,7 +82,7 @@ cdef extern from "WindMover_c.h":
         OSErr get_move(int n, unsigned long model_time, unsigned long step_len,
                        WorldPoint3D* ref, WorldPoint3D* delta,
                        double* windages,
-                       short* LE_status, LEType spillType, long spill_ID)
+                       short* LE_status, LEType spillType, long spill_ID) nogil
 
         void SetTimeDep(OSSMTimeValue_c *ossm)
         OSErr GetTimeValue(Seconds &time, VelocityRec *vel)
@@ -21,6 +21,12 @@ cdef extern from "StringFunctions.h":
     void DateToSeconds(DateTimeRec *, Seconds *)
     void SecondsToDate(Seconds, DateTimeRec *)
 
+"""
+Seed of the per element random streams from lib_gnome/CompFunctions.h
+"""
+cdef extern from "CompFunctions.h":
+    void SetRandomStreamSeed(unsigned long seed)
+
 
 """
 Declare methods for interpolation of timeseries from
@@ -444,6 +444,8 @@ class GridCurrent(VelocityGrid, Environment):
     - Information about how to find currents in netCDF file
     - Ability to apply an angle adjustment of grid-aligned currents
     - overloading the memorization to memoize the angle-adjusted current.
+    - keeping the data slices of the last few time windows in a
+      TimeSliceCache, so they aren't read from the file for every call
     - add a get_data_vectors() provides  magnitude, direction -- used to
       draw the currents in a GUI
 
@@ -495,15 +497,17 @@ class GridCurrent(VelocityGrid, Environment):
 
         extrapolate = self.extrapolation_is_allowed
 
-        value = super(GridCurrent, self).at(points, time,
-                                            extrapolate=extrapolate,
-                                            **kwargs)
+        with self._reading_slices(time):
+            value = super(GridCurrent, self).at(points, time,
+                                                extrapolate=extrapolate,
+                                                **kwargs)
 
-        if self.angle is not None:
-            angs = (self.angle.at(points, time, extrapolate=extrapolate,
-                                  **kwargs)
-                    .reshape(-1))
+            if self.angle is not None:
+                angs = (self.angle.at(points, time, extrapolate=extrapolate,
+                                      **kwargs)
+                        .reshape(-1))
 
+        if self.angle is not None:
             if 'degree' in self.angle.units:
                 angs = angs * np.pi/180.
 
@@ -643,20 +647,22 @@ class GridWind(VelocityGrid, Environment):
         if value is None:
             extrapolate = self.extrapolation_is_allowed
 
-            value = super(GridWind, self).at(pts, time,
-                                             extrapolate=extrapolate,
-                                             _auto_align=False, **kwargs)
+            with self._reading_slices(time):
+                value = super(GridWind, self).at(pts, time,
+                                                 extrapolate=extrapolate,
+                                                 _auto_align=False, **kwargs)
+
+                if self.angle is not None:
+                    angs = (self.angle.at(pts, time,
+                                          extrapolate=extrapolate,
+                                          _auto_align=False,
+                                          **kwargs)
+                            .reshape(-1))
 
             if has_depth:
                 value[pts[:, 2] > 0.0] = 0  # no wind underwater!
 
             if self.angle is not None:
-                angs = (self.angle.at(pts, time,
-                                      extrapolate=extrapolate,
-                                      _auto_align=False,
-                                      **kwargs)
-                        .reshape(-1))
-
                 x = value[:, 0] * np.cos(angs) - value[:, 1] * np.sin(angs)
                 y = value[:, 0] * np.sin(angs) + value[:, 1] * np.cos(angs)
 
@@ -4,7 +4,10 @@ import copy
 import numpy as np
 # import logging
 import warnings
+import threading
 from functools import wraps
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from colander import (SchemaNode, SequenceSchema,
                       String, Boolean, DateTime,
@@ -21,6 +24,7 @@ from gnome.persist.base_schema import GeneralGnomeObjectSchema
 from gnome.persist.validators import convertible_to_seconds
 from gnome.persist.extend_colander import LocalDateTime
 from gnome.utilities.inf_datetime import InfDateTime
+from gnome.utilities.prefetch import netcdf_lock
 
 
 class TimeSchema(base_schema.ObjTypeSchema):
@@ -116,7 +120,145 @@ class Time(gridded.time.Time, GnomeId):
         return Time(t)
 
 
-class Grid_U(gridded.grids.Grid_U, GnomeId):
+def _points_in_polygons(points, polygons):
+    """
+    whether each point is inside its polygon (crossing number test)
+
+    :param points: Nx2 array
+    :param polygons: NxKx2 array of the vertices of a polygon for each point
+    """
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+
+    x0 = polygons[:, :, 0]
+    y0 = polygons[:, :, 1]
+    x1 = np.roll(x0, -1, axis=1)
+    y1 = np.roll(y0, -1, axis=1)
+
+    crosses = (y0 > y) != (y1 > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+
+    return (crosses & (x < x_cross)).sum(axis=1) % 2 == 1
+
+
+# the cell hints in use on each thread, by id of the grid
+_cell_hints = threading.local()
+
+
+class CellHints(object):
+    """
+    Mixin for the grids: locate_faces() can start from the cell each point
+    was found in last time.
+
+    Inside hinted(cell_index), the points passed to locate_faces() are taken
+    to be the same elements, in the same order, as cell_index. A point
+    still inside its hinted cell is left there; only the rest are looked
+    for in the cell tree. cell_index is updated in place with the result,
+    so the next RK stage or time step starts from there.
+
+    The hints are kept per thread, so movers on other threads (with
+    parallel_uncertain) that use the same grid don't see them.
+
+    Subclasses provide _num_hint_cells() and _hint_polygons(), and
+    _to_cell_index() and _from_cell_index() if locate_faces() doesn't
+    return one index per point. If what locate_faces() returns isn't what
+    _hints_fit() expects, the hints are not used.
+    """
+    _faces_format = None
+
+    @property
+    def _cell_hints(self):
+        'the cell_index passed to hinted() on this thread -- None if none'
+        return getattr(_cell_hints, 'hints', {}).get(id(self))
+
+    @contextmanager
+    def hinted(self, cell_index):
+        """
+        :param cell_index: int array of the cell each element was last in,
+                           -1 if not known.
+        """
+        if not hasattr(_cell_hints, 'hints'):
+            _cell_hints.hints = {}
+
+        hints = _cell_hints.hints
+        last = hints.get(id(self))
+        hints[id(self)] = cell_index
+        try:
+            yield
+        finally:
+            if last is None:
+                del hints[id(self)]
+            else:
+                hints[id(self)] = last
+
+    def _hints_fit(self, faces):
+        return faces.ndim == 1
+
+    def _to_cell_index(self, faces):
+        return faces
+
+    def _from_cell_index(self, cell_index):
+        return cell_index
+
+    def locate_faces(self, points, *args, **kwargs):
+        hints = self._cell_hints
+        points = np.asarray(points)
+
+        # only keyword arguments are understood: anything passed by
+        # position is left to gridded
+        if (hints is None or
+                args or
+                self._faces_format is False or
+                kwargs.get('method', 'celltree') != 'celltree' or
+                points.ndim != 2 or
+                len(points) != len(hints)):
+            return super(CellHints, self).locate_faces(points, *args, **kwargs)
+
+        # a search of only some of the points mustn't be memoized for all
+        if '_memo' in kwargs:
+            kwargs['_memo'] = False
+        kwargs.pop('_hash', None)
+
+        xy = points[:, 0:2]
+        if self._faces_format is None:
+            # first search: learn what locate_faces() returns
+            missed = np.ones((len(xy),), dtype=bool)
+        else:
+            missed = ~self._in_hinted_cells(xy, hints)
+
+        if missed.any():
+            faces = super(CellHints, self).locate_faces(xy[missed], **kwargs)
+
+            if not self._hints_fit(faces):
+                self._faces_format = False
+                if missed.all():
+                    return faces
+
+                return super(CellHints, self).locate_faces(xy, **kwargs)
+
+            self._faces_format = (np.ma.isMA(faces), faces.dtype)
+
+            hints[missed] = self._to_cell_index(np.ma.filled(faces, -1))
+
+        faces = self._from_cell_index(hints).astype(self._faces_format[1])
+        if self._faces_format[0]:
+            faces = np.ma.masked_less(faces, 0)
+
+        return faces
+
+    def _in_hinted_cells(self, points, hints):
+        inside = np.zeros((len(points),), dtype=bool)
+
+        valid = (hints >= 0) & (hints < self._num_hint_cells())
+        if valid.any():
+            inside[valid] = _points_in_polygons(points[valid],
+                                                self._hint_polygons(hints[valid]))
+
+        return inside
+
+
+class Grid_U(CellHints, gridded.grids.Grid_U, GnomeId):
 
     _schema = GridSchema
 
@@ -129,6 +271,24 @@ class Grid_U(gridded.grids.Grid_U, GnomeId):
                 self.logger.warning('Detected longitudes > 180 in {0}. Rotating -360 degrees'.format(self.name))
                 lon -= 360
 
+    def _num_hint_cells(self):
+        return len(self.faces)
+
+    def _hint_polygons(self, cells):
+        if self.__dict__.get('_hint_faces') is None:
+            faces = np.ma.filled(self.faces[:], -1).astype(np.int64)
+
+            # missing vertices of mixed triangle/quad meshes repeat the
+            # first one, adding an edge that crosses nothing
+            missing = faces < 0
+            faces[missing] = np.broadcast_to(faces[:, 0:1],
+                                             faces.shape)[missing]
+
+            self._hint_faces = faces
+            self._hint_nodes = np.asarray(self.nodes[:], dtype=np.float64)
+
+        return self._hint_nodes[self._hint_faces[cells]]
+
     def draw_to_plot(self, ax, features=None, style=None):
         import matplotlib
         def_style = {'color': 'blue',
@@ -185,7 +345,7 @@ class Grid_U(gridded.grids.Grid_U, GnomeId):
         return json_
 
 
-class Grid_S(GnomeId, gridded.grids.Grid_S):
+class Grid_S(CellHints, GnomeId, gridded.grids.Grid_S):
 
     _schema = GridSchema
 
@@ -205,6 +365,41 @@ class Grid_S(GnomeId, gridded.grids.Grid_S):
     def non_grid_variables(self):
         return None
 
+    # locate_faces() gives the [row, col] of the node cell of each point
+    def _hints_fit(self, faces):
+        return faces.ndim == 2 and faces.shape[1] == 2
+
+    def _num_hint_cells(self):
+        rows, cols = self.node_lon.shape
+
+        return (rows - 1) * (cols - 1)
+
+    def _to_cell_index(self, faces):
+        cell_index = faces[:, 0] * (self.node_lon.shape[1] - 1) + faces[:, 1]
+        cell_index[(faces < 0).any(axis=1)] = -1
+
+        return cell_index
+
+    def _from_cell_index(self, cell_index):
+        faces = np.column_stack(np.divmod(cell_index,
+                                          self.node_lon.shape[1] - 1))
+        faces[cell_index < 0] = -1
+
+        return faces
+
+    def _hint_polygons(self, cells):
+        if self.__dict__.get('_hint_nodes') is None:
+            self._hint_nodes = np.stack((self.node_lon[:], self.node_lat[:]),
+                                        axis=-1).astype(np.float64)
+
+        nodes = self._hint_nodes
+        row, col = np.divmod(cells, self.node_lon.shape[1] - 1)
+
+        return np.stack((nodes[row, col],
+                         nodes[row, col + 1],
+                         nodes[row + 1, col + 1],
+                         nodes[row + 1, col]), axis=1)
+
     def draw_to_plot(self, ax, features=None, style=None):
         def_style = {'node': {'color': 'green',
                               'linestyle': 'dashed',
@@ -395,7 +590,385 @@ class Depth(gridded.depth.Depth):
         return gridded.depth.Depth._get_depth_type(*args, **kwargs)
 
 
-class Variable(gridded.Variable, GnomeId):
+def _reads_from_file(var):
+    """
+    whether var is a Variable whose data is read from a file as needed,
+    rather than being in memory already
+    """
+    return (isinstance(var, Variable) and
+            not isinstance(var.data, (np.ndarray, _CachedSlices)))
+
+
+class _CachedSlices(object):
+    """
+    Stands in for the data of a Variable while it is being interpolated.
+
+    Each time slice is read (and decoded and masked, for a netCDF variable)
+    the first time it is asked for, and kept in store -- from the
+    prefetcher, if there is one. Data without a time dimension is read
+    once, whole.
+
+    gridded interpolates one time slice at a time, and indexes the data
+    with the time index first: data[t], or data[t, ...] with a depth index
+    and/or slices after it. With a depth index, data[t, k] is read and kept
+    rather than all of data[t], so only the levels that are used are read
+    (a slice prefetched whole is still used). The time index can also be a
+    list or array of indices, or a slice, as long as the rest of the key is
+    ints and slices -- then the slices are stacked. Any other key (all the
+    data, or arrays of indices after the time index) is read straight from
+    the data, as the netCDF library and numpy don't agree on what those
+    mean.
+
+    Every read of the data is made holding netcdf_lock.
+    """
+    def __init__(self, data, store, has_time, prefetcher=None):
+        self._data = data
+        self._store = store
+        self._has_time = has_time
+        self._prefetcher = prefetcher
+
+        # number of reading() contexts using it
+        self._users = 0
+
+    def __getattr__(self, name):
+        return getattr(self._data, name)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if not self._has_time:
+            if None not in self._store:
+                with netcdf_lock.held():
+                    self._store[None] = self._data[:]
+
+            return self._store[None][key]
+
+        if len(key) == 0:
+            return self._read(key)
+
+        by_level = len(key) > 1 and isinstance(key[1], (int, np.integer))
+
+        if isinstance(key[0], (int, np.integer)):
+            if by_level:
+                return self._level(key[0], key[1])[key[2:]]
+
+            return self._slice(key[0])[key[1:]]
+
+        indices = self._time_indices(key[0])
+        if indices is None or not all(k is Ellipsis or
+                                      isinstance(k, (int, np.integer, slice))
+                                      for k in key[1:]):
+            return self._read(key)
+
+        if by_level:
+            slices = [self._level(t, key[1]) for t in indices]
+            rest = key[2:]
+        else:
+            slices = [self._slice(t) for t in indices]
+            rest = key[1:]
+
+        if any(np.ma.isMA(s) for s in slices):
+            data = np.ma.stack(slices)
+        else:
+            data = np.stack(slices)
+
+        return data[(slice(None),) + rest]
+
+    def _time_indices(self, index):
+        """
+        the time indices in a slice, or a 1-d list or array of ints --
+        None if index isn't one
+        """
+        num_times = self._data.shape[0]
+
+        if isinstance(index, slice):
+            return range(*index.indices(num_times))
+
+        if isinstance(index, (list, np.ndarray)):
+            index = np.asarray(index)
+
+            if index.ndim == 1 and index.dtype.kind in 'iu':
+                return index.tolist()
+
+        return None
+
+    def _read(self, key):
+        'read data[key] straight from the data'
+        with netcdf_lock.held():
+            return self._data[key]
+
+    def _slice(self, t):
+        """
+        the time slice t, from the store
+        """
+        t = int(t) % self._data.shape[0]
+
+        if t not in self._store:
+            if self._prefetcher is None:
+                self._store[t] = self._read(t)
+            else:
+                self._store[t] = self._prefetcher.read(self._data, t)
+
+        return self._store[t]
+
+    def _level(self, t, k):
+        """
+        the level k of time slice t, kept in the store as (t, k)
+        """
+        t = int(t) % self._data.shape[0]
+        k = int(k) % self._data.shape[1]
+
+        if t in self._store:
+            return self._store[t][k]
+
+        if (t, k) not in self._store:
+            if (self._prefetcher is not None and
+                    self._prefetcher.prefetched(self._data, t)):
+                self._store[(t, k)] = self._prefetcher.read(self._data, t)[k]
+            else:
+                self._store[(t, k)] = self._read((t, k))
+
+        return self._store[(t, k)]
+
+
+# held while swapping the data of Variables in and out of the slice caches
+_swap_lock = threading.Lock()
+
+
+class TimeSliceCache(object):
+    """
+    Keeps the data slices read for the last few time windows
+
+    A window is the pair of time indices bracketing a model time. While
+    the variables of an environment object are interpolated inside
+    reading(), each data slice they use is read once, and kept with that
+    window -- so every RK stage of every mover that uses the same
+    environment object at that time gets it from here.
+
+    The least recently used window is dropped when there are more than
+    max_windows.
+
+    If prefetcher is set to a SlicePrefetcher, the time slices are read
+    through it.
+
+    Threads can interpolate at the same time: only the reads of the data
+    are made holding gnome.utilities.prefetch.netcdf_lock, as netCDF files
+    can't be read from two threads at once. A Variable read in reading()
+    on two threads at once uses the same cached slices, and gets its data
+    back when the last one is done. The grid gridded reads into memory
+    when it is loaded; the Variables of the depth are read through the
+    cache with the rest (see SliceCaching._cached_variables()).
+    """
+    def __init__(self, max_windows=2):
+        """
+        :param max_windows=2: number of time windows to keep. 0 turns
+                              caching off: the slices are only kept until
+                              the end of reading().
+        """
+        self.max_windows = max_windows
+        self.prefetcher = None
+
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # the slices can be read again, the prefetcher's thread and the
+        # lock can't be pickled
+        state = self.__dict__.copy()
+        state['prefetcher'] = None
+        state['_windows'] = OrderedDict()
+        del state['_lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._windows)
+
+    def __contains__(self, window):
+        return window in self._windows
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+    def _window(self, window):
+        if window in self._windows:
+            self._windows.move_to_end(window)
+        else:
+            self._windows[window] = {}
+
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+
+        return self._windows[window]
+
+    def _store(self, window, name, data):
+        """
+        the slices of data kept for a window. The new window of a time
+        step shares a time index with the last one, so those slices (and
+        any data without a time dimension) are picked up from it rather
+        than read again.
+        """
+        slices = self._window(window)
+
+        if name in slices and slices[name][0] is data:
+            return slices[name][1]
+
+        store = {}
+        for other, other_slices in self._windows.items():
+            if name in other_slices and other_slices[name][0] is data:
+                # keys are t, (t, k) for a level, or None
+                store.update((t, s) for t, s in other_slices[name][1].items()
+                             if t is None or
+                             (t[0] if isinstance(t, tuple) else t) in window)
+
+        slices[name] = (data, store)
+
+        return store
+
+    @contextmanager
+    def reading(self, window, variables):
+        """
+        interpolate the variables from the cached slices of window
+
+        :param window: tuple of the time indices bracketing the time
+        :param variables: dict of name: Variable. Variables with their
+                          data in memory already are left alone.
+        """
+        swapped = []
+
+        with _swap_lock:
+            for name, var in variables.items():
+                data = var.data
+
+                if isinstance(data, _CachedSlices):
+                    # being read on another thread, or by another cache
+                    cached = data
+                elif isinstance(var, Variable) and not isinstance(data,
+                                                              np.ndarray):
+                    if self.max_windows < 1:
+                        store = {}
+                    else:
+                        with self._lock:
+                            store = self._store(window, name, data)
+
+                    has_time = var.time is not None and len(var.time) > 1
+                    cached = _CachedSlices(data, store, has_time,
+                                           self.prefetcher)
+                    var.data = cached
+                else:
+                    continue
+
+                cached._users += 1
+                swapped.append((var, cached))
+
+        try:
+            yield
+        finally:
+            with _swap_lock:
+                for var, cached in swapped:
+                    cached._users -= 1
+
+                    # the last one done puts the data back
+                    if cached._users == 0 and var.data is cached:
+                        var.data = cached._data
+
+
+class SliceCaching(object):
+    """
+    Mixin for the gridded Variables: .at() interpolates from the data
+    slices kept in a TimeSliceCache, and prefetch() has the slices that
+    will be needed next read ahead of time by a SlicePrefetcher.
+    """
+    # how many time windows of data slices the slice cache keeps
+    slice_cache_windows = 2
+
+    @property
+    def slice_cache(self):
+        '''
+        The TimeSliceCache of the data slices read by .at()
+
+        Created on first use -- objects made by from_netCDF() don't go
+        through __init__
+        '''
+        cache = self.__dict__.get('_slice_cache')
+
+        if cache is None:
+            cache = self._slice_cache = TimeSliceCache(self.slice_cache_windows)
+
+        return cache
+
+    def _cached_variables(self):
+        '''
+        dict of the Variables whose data is read through the slice cache
+        '''
+        variables = {'data': self}
+        variables.update(self._depth_variables())
+
+        return variables
+
+    def _depth_variables(self):
+        '''
+        the Variables of the depth (the bathymetry and free surface of an
+        S_Depth), so they are read through the slice cache too
+        '''
+        depth = getattr(self, 'depth', None)
+
+        return {'depth.' + name: getattr(depth, name)
+                for name in ('bathymetry', 'zeta')
+                if isinstance(getattr(depth, name, None), Variable)}
+
+    def _time_window(self, time):
+        '''
+        the indices of the two time slices bracketing time
+        '''
+        if self.time is None or len(self.time) == 1:
+            return (0, 0)
+
+        idx = self.time.index_of(time, extrapolate=True)
+
+        return (max(idx - 1, 0), min(idx, len(self.time) - 1))
+
+    def _reading_slices(self, time):
+        '''
+        context for interpolating from the slice cache
+        '''
+        return self.slice_cache.reading(self._time_window(time),
+                                        self._cached_variables())
+
+    def prefetch(self, prefetcher, time, end_time, num_slices=2):
+        '''
+        Have prefetcher read the data slices that will be needed from time
+        on: the two bracketing time, and the next num_slices after those,
+        but none past the ones bracketing end_time.
+
+        The slice cache then reads its slices through prefetcher.
+        '''
+        self.slice_cache.prefetcher = prefetcher
+
+        for var in self._cached_variables().values():
+            if (not _reads_from_file(var) or
+                    var.time is None or len(var.time) == 1):
+                continue
+
+            first = max(var.time.index_of(time, extrapolate=True) - 1, 0)
+            last = min(first + 1 + num_slices,
+                       var.time.index_of(end_time, extrapolate=True),
+                       len(var.time) - 1)
+
+            for t in range(first, last + 1):
+                prefetcher.prefetch(var.data, t)
+
+
+class Variable(SliceCaching, gridded.Variable, GnomeId):
     _schema = VariableSchema
 
     default_names = []
@@ -587,7 +1160,8 @@ class Variable(gridded.Variable, GnomeId):
         if ('unmask' not in kwargs):
             kwargs['unmask'] = True
 
-        value = super(Variable, self).at(points, time, *args, **kwargs)
+        with self._reading_slices(time):
+            value = super(Variable, self).at(points, time, *args, **kwargs)
 
         data_units = self.units if self.units else self._gnome_unit
         req_units = units if units else data_units
@@ -681,7 +1255,7 @@ class S_Depth(gridded.depth.S_Depth, GnomeId):
         rv = cls.from_netCDF(**dict_)
         return rv
 
-class VectorVariable(gridded.VectorVariable, GnomeId):
+class VectorVariable(SliceCaching, gridded.VectorVariable, GnomeId):
 
     _schema = VectorVariableSchema
 
@@ -862,10 +1436,18 @@ class VectorVariable(gridded.VectorVariable, GnomeId):
 
     def at(self, points, time, units=None, *args, **kwargs):
         units = units if units else self._gnome_unit #no need to convert here, its handled in the subcomponents
-        value = super(VectorVariable, self).at(points, time, units=units, *args, **kwargs)
+        with self._reading_slices(time):
+            value = super(VectorVariable, self).at(points, time, units=units, *args, **kwargs)
 
         return value
 
+    def _cached_variables(self):
+        variables = dict(enumerate(self.variables))
+        variables['angle'] = getattr(self, 'angle', None)
+        variables.update(self._depth_variables())
+
+        return variables
+
     def get_data_vectors(self):
         '''
         return array of shape (time_slices, len_linearized_data,2)
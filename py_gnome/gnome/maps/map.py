@@ -24,6 +24,7 @@ Features:
 """
 
 import os
+import io
 import math
 
 import py_gd
@@ -43,6 +44,8 @@ from gnome.utilities.projections import (FlatEarthProjection,
                                          RectangularGridProjection,
                                          RegularGridProjection)
 from gnome.utilities.map_canvas import MapCanvas
+from gnome.utilities import rand
+from gnome.utilities.time_utils import date_to_sec
 from gnome.utilities.file_tools import haz_files
 # from gnome.utilities.file_tools.osgeo_helpers import (ogr_layers)
 # from gnome.utilities.file_tools.osgeo_helpers import (ogr_features)
@@ -51,11 +54,40 @@ from gnome.utilities.file_tools import haz_files
 from gnome.utilities.geometry.polygons import PolygonSet
 from gnome.utilities.geometry import points_in_poly, point_in_poly
 from gnome.utilities.appearance import AppearanceSchema
+from gnome.utilities.disk_cache import file_hash
+from gnome.maps import raster_cache
 
 from gnome.cy_gnome.cy_land_check import check_land_layers, move_particles
 from gnome.persist import base_schema
 
 
+def block_any(arr, factor):
+    """
+    Reduce a 2-d array by factor in both directions
+
+    Each cell of the result is True if any cell in the corresponding
+    factor x factor block of arr is non-zero. If the shape of arr is not a
+    multiple of factor, the last row/column of blocks is partly off the edge,
+    and only looks at what is there.
+
+    :param arr: 2-d array
+    :param factor: integer reduction factor
+
+    :returns: boolean array of shape ceil(arr.shape / factor)
+    """
+    arr = np.asarray(arr) != 0
+    w, h = arr.shape
+    c_w = -(-w // factor)
+    c_h = -(-h // factor)
+
+    if (c_w * factor, c_h * factor) != (w, h):
+        padded = np.zeros((c_w * factor, c_h * factor), dtype=bool)
+        padded[:w, :h] = arr
+        arr = padded
+
+    return arr.reshape(c_w, factor, c_h, factor).any(axis=3).any(axis=1)
+
+
 class GnomeMapSchema(base_schema.ObjTypeSchema):
     map_bounds = base_schema.LongLatBounds(save_reference=False)
     # .MetaDataList is not serialized at all
@@ -76,9 +108,30 @@ class ParamMapSchema(GnomeMapSchema):
 class RasterMapSchema(GnomeMapSchema):
     pass
 
+
+class MapFromBNAType(base_schema.ObjType):
+    def save(self, node, appstruct, zipfile_, refs):
+        # write the raster file straight into the save file. to_dict() gives
+        # its name, so it is found there, and not added again
+        name = appstruct._raster_file_name()
+
+        if name not in zipfile_.namelist():
+            buf = io.BytesIO()
+            appstruct._write_raster_file(buf)
+            zipfile_.writestr(name, buf.getvalue())
+
+        return super(MapFromBNAType, self).save(node, appstruct, zipfile_,
+                                                refs)
+
+
 class MapFromBNASchema(RasterMapSchema):
+    schema_type = MapFromBNAType
+
     filename = SchemaNode(
         String(), isdatafile=True, test_equal=False)
+    raster_file = SchemaNode(
+        String(), isdatafile=True, test_equal=False, update=False,
+        missing=drop)
     refloat_halflife = SchemaNode(Float())
     raster_size = SchemaNode(Float())
     shift_lons = SchemaNode(Integer(), missing=drop)
@@ -105,6 +158,10 @@ class GnomeMap(GnomeId):
     refloat_halflife = None  # note -- no land, so never used
     _ref_as = 'map'
 
+    # the stream the refloating draws from -- None for the global random
+    # numbers. Set by the Model (see Model.random_streams)
+    random_stream = None
+
     def __init__(self,
                  map_bounds=None,
                  spillable_area=None,
@@ -373,6 +430,20 @@ class GnomeMap(GnomeId):
         """
         pass
 
+    def _refloat_random(self, spill_container, r_idx, model_time):
+        """
+        Random numbers in [0, 1) for the elements r_idx to refloat with --
+        from their random streams, if random_stream is set.
+        """
+        if self.random_stream is None or model_time is None:
+            return np.random.uniform(0, 1, len(r_idx))
+
+        return rand.stream_random(spill_container['id'][r_idx],
+                                  spill_container['spill_num'][r_idx],
+                                  date_to_sec(model_time),
+                                  stream=self.random_stream,
+                                  uncertain=spill_container.uncertain)
+
     def resurface_airborne_elements(self, spill_container):
         """
         Takes any elements that are left above the water surface (z < 0.0)
@@ -623,7 +694,7 @@ class ParamMap(GnomeMap):
             # refloat particles based on probability
             refloat_probability = 1.0 - 0.5 ** (float(time_step) /
                                                 self._refloat_halflife)
-            rnd = np.random.uniform(0, 1, len(r_idx))
+            rnd = self._refloat_random(spill_container, r_idx, model_time)
 
             # subset of indices that will refloat
             # maybe we should rename refloat_probability since
@@ -698,6 +769,7 @@ class RasterMap(GnomeMap):
                  raster=None,
                  projection=None,
                  refloat_halflife=1,
+                 layers=None,
                  **kwargs):
         """
         create a new RasterMap
@@ -721,6 +793,12 @@ class RasterMap(GnomeMap):
                                  < 0.0 means never re-float.
         :type refloat_halflife: float. Units are hours
 
+        :param layers: The coarser rasters for the raster, as built by
+                       build_coarser_rasters() -- if they have already been
+                       built (loaded from a file, for instance).
+                       If None, they are built.
+        :type layers: list of numpy arrays of uint8
+
         :param map_bounds: The polygon bounding the map -- could be larger
                            or smaller than the land raster
         :type map_bounds: (N,2) numpy array of floats
@@ -739,7 +817,7 @@ class RasterMap(GnomeMap):
         if raster is None:
             self.raster = np.zeros((1024, 1024))
         else:
-            self.raster = np.ascontiguousarray(raster)
+            self._set_raster(raster, layers)
 
         self.projection = projection
 
@@ -767,27 +845,28 @@ class RasterMap(GnomeMap):
         then land was hit.
         """
         self.logger.info('generating coarser rasters')
-        self.layers = []
-        base_w = self.raster.shape[0]
-        base_h = self.raster.shape[1]
+        self.layers = [self.raster]
+
+        # build from the finest up -- a coarser layer can be reduced from
+        # the next finer one when its ratio is a multiple of that one's
+        finer, finer_ratio = self.raster, 1
 
-        for ratio in self.ratios[:-1]:
-            genned_layer = np.zeros((int(math.ceil(float(base_w) / ratio)),
-                                     int(math.ceil(float(base_h) / ratio))),
-                                    dtype=np.uint8, order='C')
+        for ratio in self.ratios[-2::-1]:
+            if ratio % finer_ratio == 0:
+                genned_layer = block_any(finer, ratio // finer_ratio)
+            else:
+                genned_layer = block_any(self.raster, ratio)
 
-            for j in range(0, genned_layer.shape[1]):
-                for i in range(0, genned_layer.shape[0]):
-                    genned_layer[i, j] = np.any(self.raster[
-                                                i * ratio:(i + 1) * ratio,
-                                                j * ratio:(j + 1) * ratio
-                                                ])
+            finer, finer_ratio = genned_layer, ratio
+            self.layers.insert(0, genned_layer.astype(np.uint8))
 
-            self.layers.append(genned_layer)
+    def _layers_shapes(self):
+        'the shapes of the coarser rasters for the current raster and ratios'
+        base_w, base_h = self.raster.shape
 
-        self.layers.append(self.raster)
-        # self.layers = np.array(self.layers)
-        # print("the layers array:", self.layers)
+        return [(int(math.ceil(float(base_w) / ratio)),
+                 int(math.ceil(float(base_h) / ratio)))
+                for ratio in self.ratios[:-1]]
 
     @property
     def ratios(self):
@@ -806,6 +885,16 @@ class RasterMap(GnomeMap):
 
     @raster.setter
     def raster(self, arr):
+        self._set_raster(arr)
+
+    def _set_raster(self, arr, layers=None):
+        '''
+        Set the raster, and the ratios for its size
+
+        :param layers=None: the coarser rasters already built for arr.
+                            If None, or if they don't fit the raster,
+                            they are built.
+        '''
         if arr.size > 16000000:
             self._ratios = np.array((128, 32, 1,), dtype=np.int32)
         elif arr.size > 1000000:
@@ -814,7 +903,48 @@ class RasterMap(GnomeMap):
             self._ratios = np.array((16, 1,), dtype=np.int32)
 
         self._raster = np.ascontiguousarray(arr)
-        self.build_coarser_rasters()
+
+        if (layers is not None and
+                [l.shape for l in layers] == self._layers_shapes()):
+            self.layers = [np.ascontiguousarray(l, dtype=np.uint8)
+                           for l in layers]
+            self.layers.append(self._raster)
+        else:
+            self.build_coarser_rasters()
+
+    def _save_raster_file(self, filename, **kwargs):
+        '''
+        Save the raster and the coarser rasters to a numpy .npz file
+
+        :param kwargs: other arrays to save in the file
+        '''
+        layers = dict(('layer_{}'.format(i), layer)
+                      for i, layer in enumerate(self.layers[:-1]))
+
+        np.savez(filename,
+                 raster=self.raster,
+                 ratios=np.asarray(self.ratios),
+                 **dict(layers, **kwargs))
+
+    @staticmethod
+    def _load_raster_file(filename):
+        '''
+        Load a file written by _save_raster_file()
+
+        :returns: (raster, layers, data) -- layers is the list of coarser
+                  rasters, data is a dict of the other arrays in the file.
+        '''
+        with np.load(filename) as npz:
+            data = dict(npz.items())
+
+        raster = data.pop('raster')
+        data.pop('ratios')
+
+        layers = []
+        while 'layer_{}'.format(len(layers)) in data:
+            layers.append(data.pop('layer_{}'.format(len(layers))))
+
+        return raster, layers, data
 
     @property
     def refloat_halflife(self):
@@ -1015,7 +1145,7 @@ class RasterMap(GnomeMap):
 
             refloat_probability = 1.0 - 0.5 ** (float(time_step) /
                                                 self._refloat_halflife)
-            rnd = np.random.uniform(0, 1, len(r_idx))
+            rnd = self._refloat_random(spill_container, r_idx, model_time)
 
             # subset of indices that will refloat
             # maybe we should rename refloat_probability since
@@ -1105,6 +1235,7 @@ class MapFromBNA(RasterMap):
                  map_bounds=None,
                  spillable_area=None,
                  shift_lons=0,
+                 raster_file=None,
                  **kwargs):
         """
         Creates a RasterMap from a data file.
@@ -1124,6 +1255,11 @@ class MapFromBNA(RasterMap):
                           180, or 360 are valid inputs
         :type shiftLons: integer
 
+        :param raster_file=None: a file with the raster already built for
+                                 this map -- written when the map is saved.
+                                 If it doesn't match the bna file and the
+                                 raster_size, the raster is rebuilt.
+
         Optional arguments (kwargs):
 
         :param refloat_halflife: the half-life (in hours) for the re-floating.
@@ -1140,6 +1276,7 @@ class MapFromBNA(RasterMap):
         self.filename = filename
         self._raster_size = raster_size
         self.shift_lons = shift_lons
+        self._bna_hash = None
 
         # fixme: do some file type checking here.
         polygons = haz_files.ReadBNA(filename, 'PolygonSet')
@@ -1201,15 +1338,32 @@ class MapFromBNA(RasterMap):
                 map_bounds = BB.AsPoly()
 
         # get the raster as a numpy array:
-        raster, projection = self.build_raster(land_polys, BB)
+        # from the file saved with the map, or the raster cache, if they
+        # have it -- otherwise draw it.
+        raster = layers = None
+        if raster_file is not None:
+            raster, projection, layers = self._read_raster_file(raster_file,
+                                                                BB)
+
+        if raster is None:
+            raster, projection, layers = self._get_cached_raster(BB)
+
+        built = raster is None
+        if built:
+            raster, projection = self.build_raster(land_polys, BB)
 
         super(MapFromBNA, self).__init__(
             raster=raster,
             projection=projection,
+            layers=layers,
             map_bounds=map_bounds,
             spillable_area=spillable_area,
             land_polys=land_polys,
             **kwargs)
+
+        if built:
+            self._cache_raster(BB)
+
         return None
 
 
@@ -1268,6 +1422,119 @@ class MapFromBNA(RasterMap):
         # will give incorrect results going forward.
         return raster_array, canvas.projection
 
+    def _read_raster_file(self, raster_file, BB):
+        '''
+        Read the raster saved with the map, if it was built from the same
+        land polygons with the same settings
+
+        :returns: (raster, projection, layers). All None if the file
+                  can't be used.
+        '''
+        try:
+            raster, layers, data = self._load_raster_file(raster_file)
+        except (IOError, ValueError, KeyError) as err:
+            self.logger.warning('could not read raster file: {}: {}'
+                                .format(raster_file, err))
+            return None, None, None
+
+        if (data.get('raster_size') != self.raster_size or
+                data.get('shift_lons') != self.shift_lons or
+                not np.array_equal(data.get('land_bounds'), BB) or
+                str(data.get('bna_hash')) != self._file_hash()):
+            self.logger.info('raster file: {} does not match the map -- '
+                             'rebuilding the raster'.format(raster_file))
+            return None, None, None
+
+        projection = FlatEarthProjection(BB, tuple(data['image_size']))
+
+        return raster, projection, layers
+
+    def _file_hash(self):
+        'hash of the contents of the bna file -- computed once'
+        if self._bna_hash is None:
+            self._bna_hash = file_hash(self.filename)
+
+        return self._bna_hash
+
+    def _raster_cache_key(self, BB):
+        'key for the raster in the raster cache'
+        return raster_cache.RasterCache.make_key(self._file_hash(),
+                                                 float(self.raster_size),
+                                                 np.asarray(BB),
+                                                 self.shift_lons,
+                                                 'FlatEarthProjection')
+
+    def _get_cached_raster(self, BB):
+        '''
+        Get the raster from the raster cache
+
+        :returns: (raster, projection, layers). All None if the cache is off,
+                  or the raster isn't in it.
+        '''
+        cache = raster_cache.get_default_cache()
+        if cache is None:
+            return None, None, None
+
+        entry = cache.get(self._raster_cache_key(BB))
+        if entry is None:
+            return None, None, None
+
+        raster, layers, info = entry
+        projection = FlatEarthProjection(BB, tuple(info['image_size']))
+
+        return raster, projection, layers
+
+    def _cache_raster(self, BB):
+        'add the raster to the raster cache, if it is on'
+        cache = raster_cache.get_default_cache()
+
+        if cache is not None:
+            cache.put(self._raster_cache_key(BB),
+                      self.raster,
+                      self.layers[:-1],
+                      image_size=[int(x) for x in self.projection.image_size])
+
+    def to_dict(self, json_=None):
+        dict_ = super(MapFromBNA, self).to_dict(json_)
+
+        if json_ == 'save':
+            # the raster and coarser rasters are saved with the map, so they
+            # don't have to be rebuilt when it is loaded -- the file is
+            # written into the save file by MapFromBNAType.save()
+            dict_['raster_file'] = self._raster_file_name()
+        else:
+            dict_.pop('raster_file', None)
+
+        return dict_
+
+    def _raster_file_name(self):
+        'name of the raster file in a save file'
+        basename = os.path.splitext(os.path.split(self.filename)[1])[0]
+
+        return '{}_{}_raster.npz'.format(basename, self.id)
+
+    def _write_raster_file(self, filename):
+        '''
+        Save the raster, the coarser rasters, and the settings they were
+        built with
+
+        :param filename: file name or open binary file
+        '''
+        self._save_raster_file(filename,
+                               raster_size=self.raster_size,
+                               shift_lons=self.shift_lons,
+                               land_bounds=self.land_polys.bounding_box,
+                               image_size=self.projection.image_size,
+                               bna_hash=self._file_hash())
+
+    @property
+    def raster_file(self):
+        '''
+        the raster is written to a file when the map is saved -- it isn't
+        kept around otherwise
+        '''
+        return None
+
     @property
     def raster_size(self):
         '''
@@ -1279,8 +1546,17 @@ class MapFromBNA(RasterMap):
     def raster_size(self, size):
         if size != self._raster_size:
             self._raster_size = size
-            #should trigger base class to recreate coarser rasters
-            self.raster, self.projection = self.build_raster()
+
+            BB = self.land_polys.bounding_box
+            raster, projection, layers = self._get_cached_raster(BB)
+
+            if raster is None:
+                #should trigger base class to recreate coarser rasters
+                self.raster, self.projection = self.build_raster()
+                self._cache_raster(BB)
+            else:
+                self._set_raster(raster, layers)
+                self.projection = projection
 
     def to_geojson(self):
         """
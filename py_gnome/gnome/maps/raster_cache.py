@@ -0,0 +1,131 @@
+"""
+An on-disk cache for the land-water rasters of maps
+
+Rasterizing a detailed shoreline can take a long time, and it gives the same
+result every time for the same file and settings. The cache stores the
+raster, and the coarser rasters built from it, as .npy files in a directory
+per entry, named by a hash of everything the raster depends on, so they can
+be shared between runs (and processes).
+
+Entries are loaded as memory-mapped arrays. When the cache gets bigger than
+its max_size, the least recently used entries are removed.
+
+The cache is off by default. Turn it on with::
+
+    gnome.maps.raster_cache.set_default_cache('/path/to/cache/dir')
+
+or by setting the PYGNOME_RASTER_CACHE environment variable to a directory.
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import logging
+
+import numpy as np
+
+from gnome.utilities.disk_cache import DiskCache, DefaultCache
+
+
+log = logging.getLogger(__name__)
+
+
+class RasterCache(DiskCache):
+    """
+    A directory of rasters, keyed by a hash of what they were built from
+    """
+    # bump if the format of the entries, or the way rasters are built, changes
+    cache_version = 1
+
+    def __init__(self, cache_dir, max_size=2 * 1024 ** 3):
+        """
+        :param cache_dir: directory to keep the cache in. It is created if it
+                          doesn't exist.
+        :param max_size=2GB: the maximum total size of the entries, in bytes.
+        """
+        super(RasterCache, self).__init__(cache_dir, max_size)
+
+    def get(self, key):
+        """
+        Get an entry from the cache
+
+        :returns: (raster, layers, info) or None if it isn't there.
+                  raster and layers are copy-on-write memory-mapped arrays,
+                  info is the dict passed to put().
+        """
+        entry_dir = self._entry_path(key)
+
+        try:
+            with open(os.path.join(entry_dir, 'info.json')) as infile:
+                info = json.load(infile)
+
+            raster = np.load(os.path.join(entry_dir, 'raster.npy'),
+                             mmap_mode='c')
+            layers = [np.load(os.path.join(entry_dir,
+                                           'layer_{}.npy'.format(i)),
+                              mmap_mode='c')
+                      for i in range(info.pop('num_layers'))]
+        except (IOError, OSError, ValueError, KeyError):
+            return None
+
+        self._touch(key)
+
+        return raster, layers, info
+
+    def put(self, key, raster, layers, **info):
+        """
+        Add an entry to the cache
+
+        :param raster: the raster
+        :param layers: list of coarser rasters
+        :param info: other (json-serializable) data to store with it
+        """
+        entry_dir = self._entry_path(key)
+
+        if os.path.isdir(entry_dir):
+            return
+
+        # write to a temp dir, and move it into place when done, so an
+        # entry is never seen half-written
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir)
+
+        try:
+            np.save(os.path.join(tmp_dir, 'raster.npy'), raster)
+
+            for i, layer in enumerate(layers):
+                np.save(os.path.join(tmp_dir, 'layer_{}.npy'.format(i)),
+                        layer)
+
+            info['num_layers'] = len(layers)
+            with open(os.path.join(tmp_dir, 'info.json'), 'w') as outfile:
+                json.dump(info, outfile)
+
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # another process may have put the same one in
+            log.info('could not add raster: {} to the cache'.format(key))
+        finally:
+            shutil.rmtree(tmp_dir, True)
+
+        self.evict(keep=key)
+
+
+_default = DefaultCache(RasterCache, 'PYGNOME_RASTER_CACHE', 2 * 1024 ** 3)
+
+
+def set_default_cache(cache_dir, max_size=2 * 1024 ** 3):
+    """
+    Set the cache used by the maps
+
+    :param cache_dir: directory for the cache. None turns the cache off.
+    :param max_size=2GB: the maximum total size of the cache, in bytes.
+
+    :returns: the RasterCache, or None
+    """
+    return _default.set(cache_dir, max_size)
+
+
+def get_default_cache():
+    'the cache used by the maps -- None if it is off'
+    return _default.get()
@@ -63,6 +63,15 @@ class TideflatMap(GnomeId):
         """
         return getattr(self.land_map, name)
 
+    # set on the enclosed map, which does the refloating
+    @property
+    def random_stream(self):
+        return self.land_map.random_stream
+
+    @random_stream.setter
+    def random_stream(self, stream):
+        self.land_map.random_stream = stream
+
     # These are the methods that need to be overridden:
     def beach_elements(self, spill_container, model_time=None):
 
@@ -108,7 +117,7 @@ class TideflatMap(GnomeId):
             status_codes[tf_idx[now_wet]] = oil_status.in_water
 
         # Pass off to the map
-        self.land_map.refloat_elements(spill_container, time_step)
+        self.land_map.refloat_elements(spill_container, time_step, model_time)
 
 
 class TideflatBase(GnomeId):
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 import zipfile
 from pprint import pformat
 import copy
+import time
+from functools import partial
 
 import numpy as np
 
@@ -15,9 +17,15 @@ from colander import (SchemaNode,
 
 from gnome.utilities.time_utils import round_time, asdatetime
 import gnome.utilities.rand
-from gnome.utilities.cache import ElementCache
+from gnome.utilities.cache import cache_backends
+from gnome.utilities.spill_query import SpillQuery
+from gnome.utilities.background_writer import BackgroundWriter
+from gnome.utilities.prefetch import SlicePrefetcher, netcdf_lock
+from gnome.utilities.paired_pipeline import RANDOM, run_tasks, run_paired
 from gnome.utilities.orderedcollection import OrderedCollection
-from gnome.spill_container import SpillContainerPair
+from gnome.spill_container import (SpillContainerPair,
+                                   SpillContainerPairData,
+                                   SpillContainerData)
 from gnome.basic_types import oil_status, fate
 
 from gnome.maps.map import (GnomeMapSchema,
@@ -68,6 +76,14 @@ class ModelSchema(ObjTypeSchema):
     )
     uncertain = SchemaNode(Bool())
     cache_enabled = SchemaNode(Bool())
+    cache_backend = SchemaNode(
+        String(), validator=OneOf(list(cache_backends)), missing=drop
+    )
+    output_queue_size = SchemaNode(Int(), missing=drop)
+    prefetch_slices = SchemaNode(Int(), missing=drop)
+    parallel_uncertain = SchemaNode(Bool(), missing=drop)
+    partition_fates = SchemaNode(Bool(), missing=drop)
+    random_streams = SchemaNode(Bool(), missing=drop)
     num_time_steps = SchemaNode(Int(), read_only=True)
     make_default_refs = SchemaNode(Bool())
     mode = SchemaNode(
@@ -159,6 +175,12 @@ class Model(GnomeId):
                  map=None,
                  uncertain=False,
                  cache_enabled=False,
+                 cache_backend='npz',
+                 output_queue_size=0,
+                 prefetch_slices=0,
+                 parallel_uncertain=False,
+                 partition_fates=False,
+                 random_streams=False,
                  mode=None,
                  make_default_refs=True,
                  location=[],
@@ -194,7 +216,62 @@ class Model(GnomeId):
         :param uncertain=False: Flag for setting uncertainty.
 
         :param cache_enabled=False: Flag for setting whether the model should
-                                    cache results to disk.
+                                    cache results to disk. It can also be
+                                    the name of a cache backend, which
+                                    turns the cache on with that backend.
+
+        :param cache_backend='npz': The type of cache used for the element
+                                    data. Options are:
+                                      - 'npz': each step copied and saved
+                                        as a numpy .npz file
+                                      - 'memmap': arrays appended to
+                                        memory-mapped files, read back as
+                                        views rather than copies.
+
+        :param output_queue_size=0: If greater than zero, the cache and
+                                    outputter writes for each step are done
+                                    on a background thread while the model
+                                    computes the next step, with up to this
+                                    many steps' worth of writing queued up.
+                                    In this mode, step() returns only the
+                                    step_num -- the outputters' info is
+                                    returned by full_run(), or available in
+                                    the async_output_info attribute once
+                                    the run is complete.
+
+        :param prefetch_slices=0: If greater than zero, the time slices of
+                                  the gridded environment objects read from
+                                  files are read on a background thread
+                                  ahead of when they are needed -- this
+                                  many slices past the ones bracketing the
+                                  current model time. The counts of the
+                                  slices that were (hits) or weren't
+                                  (misses) read ahead, and the time spent
+                                  waiting for them, are in prefetch_stats.
+
+        :param parallel_uncertain=False: If True, and uncertainty is on, the
+                                         forecast and uncertainty spill
+                                         containers are moved, weathered and
+                                         cleaned up at the same time, on two
+                                         threads. The results are exactly
+                                         the same as running them one after
+                                         the other.
+
+        :param partition_fates=False: If True, the elements in the forecast
+                                      spill container are kept in order of
+                                      their fate_status, so the weatherers
+                                      work on views of the data arrays,
+                                      rather than copies. This changes the
+                                      order of the elements in the output.
+
+        :param random_streams=False: If True, the random movers and the
+                                     refloating of beached elements draw
+                                     the random numbers for each element
+                                     from its own stream, keyed by the
+                                     seed, spill, element id and time step.
+                                     The results then don't depend on the
+                                     order the elements are in, or on how
+                                     they are split between threads.
 
         :param mode='Gnome': The runtime 'mode' that the model should use.
                              This is a value that the Web Client uses to
@@ -220,8 +297,21 @@ class Model(GnomeId):
             _spills = spills
         self.spills.add(_spills)
 
-        self._cache = ElementCache()
-        self._cache.enabled = cache_enabled
+        if isinstance(cache_enabled, str):
+            cache_backend, cache_enabled = cache_enabled, True
+
+        self._cache = self._make_cache(cache_backend, cache_enabled)
+
+        # set up when first needed, so a Model without it can be pickled
+        self._output_writer = None
+        self.output_queue_size = output_queue_size
+        self.async_output_info = []
+        self._prefetcher = None
+        self.prefetch_slices = prefetch_slices
+        self._weathering_times = {}
+        self.parallel_uncertain = parallel_uncertain
+        self.random_streams = random_streams
+        self.partition_fates = partition_fates
 
         # default to now, rounded to the nearest hour
         self.start_time = start_time
@@ -341,6 +431,16 @@ class Model(GnomeId):
         # set rand before each call so windages are set correctly
         gnome.utilities.rand.seed(1)
 
+        # finish any writing in progress before clearing things out
+        if self._output_writer is not None:
+            self._output_writer.reset()
+        self.async_output_info = []
+
+        if self._prefetcher is not None:
+            self._prefetcher.reset()
+
+        self._weathering_times = {}
+
         # clear the cache:
         self._cache.rewind()
 
@@ -456,8 +556,117 @@ class Model(GnomeId):
 
     @cache_enabled.setter
     def cache_enabled(self, enabled):
+        if isinstance(enabled, str):
+            self.cache_backend = enabled
+            enabled = True
+
         self._cache.enabled = enabled
 
+    @property
+    def cache_backend(self):
+        '''
+        Name of the type of cache used for the element data.
+        Changing it rewinds the model.
+        '''
+        return self._cache.backend
+
+    @cache_backend.setter
+    def cache_backend(self, backend):
+        if backend != self._cache.backend:
+            self._cache = self._make_cache(backend, self._cache.enabled)
+
+            for outputter in self.outputters:
+                outputter.cache = self._cache
+
+            self.rewind()
+
+    @staticmethod
+    def _make_cache(backend, enabled):
+        try:
+            cache_type = cache_backends[backend]
+        except KeyError:
+            raise ValueError('Cache backend ({}) invalid, '
+                             'should be one of {{{}}}'
+                             .format(backend, ', '.join(cache_backends)))
+
+        return cache_type(enabled=enabled)
+
+    @property
+    def output_queue_size(self):
+        '''
+        Number of steps of output that can be queued up for the background
+        writer. If 0, output is written synchronously in step().
+        '''
+        return self._output_queue_size
+
+    @output_queue_size.setter
+    def output_queue_size(self, size):
+        if self._output_writer is not None:
+            self._output_writer.stop()
+            self._output_writer = None
+            netcdf_lock.stop()
+
+        self._output_queue_size = int(size)
+
+    @property
+    def prefetch_slices(self):
+        '''
+        Number of time slices of gridded data read ahead on a background
+        thread. If 0, they are read when they are needed.
+        '''
+        return self._prefetch_slices
+
+    @prefetch_slices.setter
+    def prefetch_slices(self, num):
+        if self._prefetcher is not None:
+            self._prefetcher.stop()
+            self._prefetcher = None
+
+            # so they don't read through the stopped one
+            for env in self.environment:
+                if hasattr(env, 'prefetch'):
+                    env.slice_cache.prefetcher = None
+
+        self._prefetch_slices = int(num)
+
+    @property
+    def prefetch_stats(self):
+        '''
+        The hits, misses and wait_time (in seconds) of the prefetching of
+        time slices in this run, or None if prefetch_slices is 0.
+        '''
+        if self._prefetcher is None:
+            return None
+
+        return self._prefetcher.stats
+
+    @property
+    def weathering_times(self):
+        '''
+        Time spent (in seconds) in each weatherer's weather_elements() in
+        this run, by weatherer name -- to see which processes dominate.
+        '''
+        return dict((w.name, self._weathering_times.get(w.id, 0.0))
+                    for w in self.weatherers)
+
+    def _prefetch_data(self):
+        '''
+        Start reading the data slices of the gridded environment objects
+        that will be needed from this time step on
+        '''
+        if self.prefetch_slices <= 0:
+            return
+
+        if self._prefetcher is None:
+            self._prefetcher = SlicePrefetcher(
+                max_buffered=4 * (self.prefetch_slices + 2))
+
+        end_time = self.start_time + self.duration
+        for env in self.environment:
+            if hasattr(env, 'prefetch'):
+                env.prefetch(self._prefetcher, self.model_time, end_time,
+                             self.prefetch_slices)
+
     @property
     def has_weathering_uncertainty(self):
         return (any([w.on for w in self.weatherers]) and
@@ -800,6 +1009,8 @@ class Model(GnomeId):
         for environment in self.environment:
             environment.prepare_for_model_run(self.start_time)
 
+        self._set_random_streams()
+
         if self.time_step is None:
             # for now hard-code this; however, it should depend on weathering
             # note: do not set time_step attribute because we don't want to
@@ -829,7 +1040,13 @@ class Model(GnomeId):
         '''
         A place where the model goes through all collections and calls
         post_model_run if the object has it.
+
+        If output is being written in the background, this waits for all of
+        it to be written first.
         '''
+        if self._output_writer is not None:
+            self._output_writer.flush()
+
         for env in self.environment:
             env.post_model_run()
         for mov in self.movers:
@@ -842,6 +1059,16 @@ class Model(GnomeId):
             if wea.on:
                 wea.post_model_run()
 
+        # so nothing is read or written on another thread between runs --
+        # netcdf_lock isn't taken then
+        if self._prefetcher is not None:
+            self._prefetcher.shutdown()
+
+        if self._output_writer is not None:
+            self._output_writer.stop()
+            self._output_writer = None
+            netcdf_lock.stop()
+
     def setup_time_step(self):
         '''
         sets up everything for the current time_step:
@@ -859,8 +1086,8 @@ class Model(GnomeId):
         for environment in self.environment:
             environment.prepare_for_model_step(self.model_time)
 
-        for outputter in self.outputters:
-            outputter.prepare_for_model_step(self.time_step, self.model_time)
+        self._call_outputters('prepare_for_model_step',
+                              self.time_step, self.model_time)
 
     def move_elements(self):
         '''
@@ -870,31 +1097,90 @@ class Model(GnomeId):
          - calls the beaching code to beach the elements that need beaching.
          - sets the new position
         '''
-        for sc in self.spills.items():
-            if sc.num_released > 0:  # can this check be removed?
-                # possibly refloat elements
-                self.map.refloat_elements(sc, self.time_step, self.model_time)
+        self._run_for_spill_containers(self._move_tasks)
 
-                # reset next_positions
-                (sc['next_positions'])[:] = sc['positions']
+    def _run_for_spill_containers(self, make_tasks):
+        '''
+        Run the tasks returned by make_tasks(sc) for each spill container --
+        for both at the same time if parallel_uncertain is on.
 
-                # loop through the movers
-                for m in self.movers:
-                    delta = m.get_move(sc, self.time_step, self.model_time)
-                    sc['next_positions'] += delta
+        make_tasks(sc) returns a list of (resources, func). See
+        gnome.utilities.paired_pipeline
+        '''
+        scs = self.spills.items()
 
-                self.map.beach_elements(sc, self.model_time)
+        if self.parallel_uncertain and len(scs) == 2:
+            with netcdf_lock.in_use():
+                run_paired(make_tasks(scs[0]), make_tasks(scs[1]))
+        else:
+            for sc in scs:
+                run_tasks(make_tasks(sc))
 
-                # let model mark these particles to be removed
-                tbr_mask = sc['status_codes'] == oil_status.off_maps
-                sc['status_codes'][tbr_mask] = oil_status.to_be_removed
+    def _set_random_streams(self):
+        '''
+        Give the map, and each mover that can draw from per element random
+        streams, its own stream number -- or None, for the global random
+        numbers, if random_streams is off.
+        '''
+        self.map.random_stream = 0 if self.random_streams else None
 
-                substances = sc.get_substances(False)
-                if len(substances) > 0:
-                    self._update_fate_status(sc)
+        for num, mover in enumerate(self.movers, 1):
+            if hasattr(mover, 'random_stream'):
+                mover.random_stream = num if self.random_streams else None
+
+    @staticmethod
+    def _random_resources(obj):
+        '''
+        The movers and refloating may draw global random numbers, so they
+        are marked as using them -- unless they draw from random streams.
+        '''
+        if getattr(obj, 'random_stream', None) is None:
+            return (RANDOM,)
+
+        return ()
+
+    def _move_tasks(self, sc):
+        '''
+        The steps of move_elements() for one spill container
+        '''
+        if sc.num_released == 0:  # can this check be removed?
+            return []
+
+        # possibly refloat elements
+        tasks = [(self._random_resources(self.map),
+                  partial(self.map.refloat_elements,
+                          sc, self.time_step, self.model_time)),
+                 ((), partial(self._reset_next_positions, sc))]
+
+        # loop through the movers
+        for m in self.movers:
+            tasks.append(((m,) + self._random_resources(m),
+                          partial(self._add_move, m, sc)))
 
-                # the final move to the new positions
-                (sc['positions'])[:] = sc['next_positions']
+        tasks.append(((), partial(self._finish_move, sc)))
+
+        return tasks
+
+    def _reset_next_positions(self, sc):
+        (sc['next_positions'])[:] = sc['positions']
+
+    def _add_move(self, mover, sc):
+        delta = mover.get_move(sc, self.time_step, self.model_time)
+        sc['next_positions'] += delta
+
+    def _finish_move(self, sc):
+        self.map.beach_elements(sc, self.model_time)
+
+        # let model mark these particles to be removed
+        tbr_mask = sc['status_codes'] == oil_status.off_maps
+        sc['status_codes'][tbr_mask] = oil_status.to_be_removed
+
+        substances = sc.get_substances(False)
+        if len(substances) > 0:
+            self._update_fate_status(sc)
+
+        # the final move to the new positions
+        (sc['positions'])[:] = sc['next_positions']
 
     def _update_fate_status(self, sc):
         '''
@@ -924,6 +1210,10 @@ class Model(GnomeId):
                     nw_mask = sc['spill_num'] == i
                     sc['fate_status'][nw_mask] = fate.non_weather
 
+            # not the uncertain elements: the C++ movers keep uncertainty
+            # data for them by their index
+            if self.partition_fates and not sc.uncertain:
+                sc.partition_by_fate()
 
     def weather_elements(self):
         '''
@@ -945,18 +1235,45 @@ class Model(GnomeId):
             # if no weatherers then mass_components array may not be defined
             return
 
-        for sc in self.spills.items():
-            # elements may have beached to update fate_status
+        self._run_for_spill_containers(self._weather_tasks)
+
+    def _weather_tasks(self, sc):
+        '''
+        The steps of weather_elements() for one spill container
 
-            sc.reset_fate_dataview()
+        All the weatherers are run for each substep in turn. The
+        weatherers that only get at the data through the fate views share
+        them, so the views are extracted once and written back once per
+        substep.
+        '''
+        # elements may have beached to update fate_status
+        tasks = [((), sc.reset_fate_dataview)]
 
+        for model_time, time_step in self._split_into_substeps():
             for w in self.weatherers:
-                for model_time, time_step in self._split_into_substeps():
-                    # change 'mass_components' in weatherer
-                    w.weather_elements(sc, time_step, model_time)
-                    #self.logger.info('density after {0}: {1}'.format(w.name, sc['density'][-5:]))
+                # change 'mass_components' in weatherer
+                tasks.append(((w,), partial(self._weather, w,
+                                            sc, time_step, model_time)))
+
+            tasks.append(((), partial(sc.share_fatedataview, False)))
+
+        return tasks
+
+    def _weather(self, weatherer, sc, time_step, model_time):
+        '''
+        Run one weatherer, and add the time it took to its counter.
+
+        The shared fate view is flushed first for a weatherer that gets at
+        the data arrays directly.
+        '''
+        sc.share_fatedataview(weatherer.shares_fate_views)
+
+        start = time.perf_counter()
+        weatherer.weather_elements(sc, time_step, model_time)
 
-        #self.logger.info('density after weather_elements: {0}'.format(sc['density'][-5:]))
+        self._weathering_times[weatherer.id] = \
+            (self._weathering_times.get(weatherer.id, 0.0) +
+             time.perf_counter() - start)
 
     def _split_into_substeps(self):
         '''
@@ -991,34 +1308,66 @@ class Model(GnomeId):
 
         Output data
         '''
-        for mover in self.movers:
-            for sc in self.spills.items():
-                mover.model_step_is_done(sc)
+        self._run_for_spill_containers(self._step_is_done_tasks)
 
-        for w in self.weatherers:
-            for sc in self.spills.items():
-                w.model_step_is_done(sc)
+        self._call_outputters('model_step_is_done')
 
-        for outputter in self.outputters:
-            outputter.model_step_is_done()
+        self._run_for_spill_containers(self._remove_elements_tasks)
 
-        for sc in self.spills.items():
-            '''
-            removes elements with oil_status.to_be_removed
-            '''
-            sc.model_step_is_done()
+    def _step_is_done_tasks(self, sc):
+        '''
+        The movers' and weatherers' model_step_is_done() for one spill
+        container
+        '''
+        return ([((m,), partial(m.model_step_is_done, sc))
+                 for m in self.movers] +
+                [((w,), partial(w.model_step_is_done, sc))
+                 for w in self.weatherers])
+
+    def _remove_elements_tasks(self, sc):
+        'The end of step_is_done() for one spill container'
+        return [((), partial(self._remove_elements, sc))]
+
+    def _remove_elements(self, sc):
+        '''
+        removes elements with oil_status.to_be_removed
+        '''
+        sc.model_step_is_done()
 
-            # age remaining particles
-            sc['age'][:] = sc['age'][:] + self.time_step
+        # age remaining particles
+        sc['age'][:] = sc['age'][:] + self.time_step
 
-    def write_output(self, valid, messages=None):
-        output_info = {'step_num': self.current_time_step}
+    def _call_outputters(self, method, *args):
+        '''
+        Call the named method on all the outputters -- on the background
+        writer thread if there is one, so the calls stay in order with the
+        writing.
+        '''
+        def call(*args):
+            for outputter in self.outputters:
+                getattr(outputter, method)(*args)
+
+        if self._output_writer is not None:
+            self._output_writer.submit(call, *args)
+        else:
+            call(*args)
+
+    def write_output(self, valid, messages=None, step_num=None):
+        '''
+        Call write_output on all the outputters
+
+        :param step_num=None: step to write. Defaults to current_time_step
+        '''
+        if step_num is None:
+            step_num = self.current_time_step
+
+        output_info = {'step_num': step_num}
 
         for outputter in self.outputters:
-            if self.current_time_step == self.num_time_steps - 1:
-                output = outputter.write_output(self.current_time_step, True)
+            if step_num == self.num_time_steps - 1:
+                output = outputter.write_output(step_num, True)
             else:
-                output = outputter.write_output(self.current_time_step)
+                output = outputter.write_output(step_num)
 
             if output is not None:
                 output_info[outputter.__class__.__name__] = output
@@ -1035,6 +1384,11 @@ class Model(GnomeId):
         hindcasting.
         '''
         isValid = True
+
+        if self._output_writer is not None:
+            # raise any error from writing the previous steps' output
+            self._output_writer.check()
+
         for sc in self.spills.items():
             # Set the current time stamp only after current_time_step is
             # incremented and before the output is written. Set it to None here
@@ -1045,6 +1399,13 @@ class Model(GnomeId):
             # starting new run so run setup
             self.setup_model_run()
 
+            if self._output_writer is None and self.output_queue_size > 0:
+                # its thread may write netCDF output while the model reads
+                netcdf_lock.start()
+                self._output_writer = BackgroundWriter(self.output_queue_size)
+
+            self._prefetch_data()
+
             # let each object raise appropriate error if obj is incomplete
             # validate and send validation flag if model is invalid
             (msgs, isValid) = self.check_inputs()
@@ -1070,6 +1431,8 @@ class Model(GnomeId):
             raise StopIteration("Run complete for {0}".format(self.name))
 
         else:
+            self._prefetch_data()
+
             # release half the LEs for this time interval
             self.release_elements(self.time_step / 2, self.model_time)
             self.setup_time_step()
@@ -1083,14 +1446,45 @@ class Model(GnomeId):
             return output_info
 
     def output_step(self, isvalid):
-        self._cache.save_timestep(self.current_time_step, self.spills)
-        output_info = self.write_output(isvalid)
+        if self._output_writer is None:
+            self._cache.save_timestep(self.current_time_step, self.spills)
+            output_info = self.write_output(isvalid)
+        else:
+            # the arrays will be changed by the next step, so write a copy
+            self._output_writer.submit(self._write_output_step,
+                                       self.current_time_step,
+                                       self._snapshot_spills(),
+                                       isvalid)
+            output_info = {'step_num': self.current_time_step}
 
         self.logger.debug('{0._pid} '
                           'Completed step: {0.current_time_step} for {0.name}'
                           .format(self))
         return output_info
 
+    def _snapshot_spills(self):
+        '''
+        Returns a SpillContainerPairData holding a copy of the current
+        element data -- what the cache needs to save the step
+        '''
+        scs = []
+        for sc in self.spills.items():
+            data = {name: array.copy()
+                    for name, array in sc.data_arrays.items()}
+
+            sc_data = SpillContainerData(data, uncertain=sc.uncertain)
+            sc_data.current_time_stamp = sc.current_time_stamp
+            sc_data.mass_balance = copy.deepcopy(sc.mass_balance)
+            scs.append(sc_data)
+
+        return SpillContainerPairData(*scs)
+
+    def _write_output_step(self, step_num, spills, isvalid):
+        'run on the background writer thread'
+        self._cache.save_timestep(step_num, spills)
+        self.async_output_info.append(self.write_output(isvalid,
+                                                        step_num=step_num))
+
     def release_elements(self, time_step, model_time):
         num_released = 0
         for sc in self.spills.items():
@@ -1159,6 +1553,10 @@ class Model(GnomeId):
                 self.logger.info('** Run Complete **')
                 break
 
+        if self.output_queue_size > 0:
+            # the outputters' info was collected by the background writer
+            output_data = list(self.async_output_info)
+
         return output_data
 
     def _add_to_environ_collec(self, obj_added):
@@ -1318,6 +1716,8 @@ class Model(GnomeId):
                                      uncertain=self.uncertain,
                                      spills=self.spills)
         nc_out.write_output(self.current_time_step)
+        # flush and close the files
+        nc_out.post_model_run()
 
         if isinstance(saveloc, zipfile.ZipFile):
             saveloc.write(nc_filename, nc_filename)
@@ -1678,18 +2078,20 @@ class Model(GnomeId):
         ucert = 1 if ucert == 'ucert' else 0
         return list(self.spills.items())[ucert][prop_name]
 
-    def get_spill_data(self, target_properties, conditions, ucert=0):
+    def get_spill_data(self, target_properties, conditions, ucert=0,
+                       step=None):
         """
         Convenience method to allow user to write an expression to filter
         raw spill data
 
         Example case::
 
-          get_spill_data('position && mass',
-                         'position > 50 && spill_num == 1 || status_codes == 1'
-                         )
+          get_spill_data(['positions', 'mass'],
+                         'positions[2] > 50 && '
+                         'spill_num == 1 || status_codes == 1')
 
-        WARNING: EXPENSIVE! USE AT YOUR OWN RISK ON LARGE num_elements!
+        Conditions are joined with '&&' and '||' -- '||' binds more tightly.
+        See gnome.utilities.spill_query for the details.
 
         Example spill element properties are below. This list may not contain
         all properties tracked by the model.
@@ -1697,62 +2099,33 @@ class Model(GnomeId):
         'positions', 'next_positions', 'last_water_positions', 'status_codes',
         'spill_num', 'id', 'mass', 'age'
 
-        """
+        :param target_properties: names of the data arrays to return. A string
+                                  of names separated by '&&', commas or spaces
+                                  is also accepted.
+        :param conditions: the query -- a string, or a SpillQuery
+        :param ucert=0: 0 or 1 (or 'ucert') -- query the certain or uncertain
+                        elements
+        :param step=None: if None, query the current elements, otherwise
+                          query the elements of that step from the cache.
 
+        :returns: dict of arrays -- the values for just the matching elements
+        """
         if ucert == 'ucert':
             ucert = 1
 
-        def elem_val(prop, index):
-            '''
-            Gets the column containing the information on one element
-            '''
-            val = list(self.spills.items())[ucert].data_arrays[prop][index]
-            return val
-
-        def test_phrase(phrase):
-            for sub_cond in phrase:
-                cond = sub_cond.rsplit()
-                prop_val = elem_val(cond[0], i)
-                op = cond[1]
-                test_num = cond[2]
-                if test(prop_val, op, test_num):
-                    return True
-
-            return False
+        if isinstance(target_properties, str):
+            target_properties = target_properties.replace('&&', ' ')
+            target_properties = target_properties.replace(',', ' ').split()
 
-        def test(elem_value, op, test_val):
-            if op in {'<', '<=', '>', '>=', '=='}:
-                return eval(str(int(elem_value)) + op + test_val)
+        if not isinstance(conditions, SpillQuery):
+            conditions = SpillQuery(conditions)
 
-        def num(s):
-            try:
-                return int(s)
-            except ValueError:
-                return float(s)
-
-        conditions = conditions.rsplit('&&')
-        conditions = [str(cond).rsplit('||') for cond in conditions]
-
-        sc = list(self.spills.items())[ucert]
-        result = {}
-
-        for t in target_properties:
-            result[t] = []
-
-        for i in range(0, len(sc)):
-            test_result = True
-
-            for phrase in conditions:
-                if not test_phrase(phrase):
-                    test_result = False
-                    break
-
-            if test_result:
-                for k in result.keys():
-                    n = elem_val(k, i)
-                    result[k].append(n)
+        if step is None:
+            sc = self.spills.items()[ucert]
+        else:
+            sc = self._cache.load_timestep(step).items()[ucert]
 
-        return result
+        return conditions.select(sc, target_properties)
 
     def add_env(self, env, quash=False):
         for item in env:
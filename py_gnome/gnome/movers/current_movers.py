@@ -26,6 +26,7 @@ from gnome.persist.extend_colander import LocalDateTime
 
 from gnome.environment import Tide, TideSchema, Wind, WindSchema
 from gnome.movers import CyMover, ProcessSchema
+from gnome.movers import topology_cache
 
 from gnome.persist.base_schema import WorldPoint
 from gnome.persist.extend_colander import FilenameSchema
@@ -34,6 +35,7 @@ from gnome.persist.extend_colander import FilenameSchema
 class CurrentMoversBaseSchema(ProcessSchema):
     uncertain_duration = SchemaNode(Float())
     uncertain_time_delay = SchemaNode(Float())
+    num_threads = SchemaNode(Int(), save=True, update=True, missing=drop)
     data_start = SchemaNode(LocalDateTime(), read_only=True,
                             validator=convertible_to_seconds)
     data_stop = SchemaNode(LocalDateTime(), read_only=True,
@@ -462,7 +464,9 @@ class GridCurrentMover(CurrentMoversBase):
                          could be netcdf or filelist
         :param topology_file=None: absolute or relative path to topology file.
                                    If not given, the GridCurrentMover will
-                                   compute the topology from the data file.
+                                   compute the topology from the data file,
+                                   or read it from the topology cache, if
+                                   it is on (see gnome.movers.topology_cache).
 
         :param active_range: Range of datetimes for when the mover should be
                              active
@@ -509,13 +513,17 @@ class GridCurrentMover(CurrentMoversBase):
         self.uncertain_across = uncertain_across
         self.uncertain_cross = uncertain_cross
 
-        self.mover.text_read(filename, topology_file)
+        topology_cache.text_read(self.mover, filename, topology_file)
         self.mover.extrapolate_in_time(extrapolate)
         self.mover.offset_time(time_offset * 3600.)
 
         self.num_method = num_method
 
-        if self.topology_file is None:
+        # with the topology cache on, topology_file stays None -- the cache
+        # can remove its file at any time, and it is found again from the
+        # grid when the mover is loaded.
+        if (self.topology_file is None and
+                topology_cache.get_default_cache() is None):
             # this causes an error saving for currents that don't have topology
             #self.topology_file = filename + '.dat'
             #self.export_topology(self.topology_file)
@@ -723,7 +731,9 @@ class IceMover(CurrentMoversBase):
                          could be netcdf or filelist
         :param topology_file=None: absolute or relative path to topology file.
                                    If not given, the IceMover will
-                                   compute the topology from the data file.
+                                   compute the topology from the data file,
+                                   or read it from the topology cache, if
+                                   it is on (see gnome.movers.topology_cache).
 
         :param active_range: Range of datetimes for when the mover should be
                              active
@@ -764,7 +774,7 @@ class IceMover(CurrentMoversBase):
 
         # check if this is stored with cy_ice_mover?
         self.topology_file = topology_file
-        self.mover.text_read(filename, topology_file)
+        topology_cache.text_read(self.mover, filename, topology_file)
 
         self.extrapolate = extrapolate
         self.mover.extrapolate_in_time(extrapolate)
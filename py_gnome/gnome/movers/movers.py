@@ -1,5 +1,6 @@
 
 from datetime import datetime, timedelta
+from contextlib import nullcontext
 
 import numpy as np
 
@@ -14,6 +15,7 @@ from gnome.utilities import time_utils
 from gnome.persist.base_schema import ObjTypeSchema
 from gnome.cy_gnome.cy_rise_velocity_mover import CyRiseVelocityMover
 from gnome import GnomeId
+from gnome.array_types import gat
 from gnome.utilities.projections import FlatEarthProjection
 from gnome.utilities.inf_datetime import InfDateTime, InfTime, MinusInfTime
 
@@ -207,6 +209,17 @@ class Mover(Process):
         return ((-360, -90), (360, 90))
 
 
+def _cell_index_name(grid):
+    '''
+    name of the data array of the cells the elements were last found in on
+    grid -- None if the grid doesn't take hints
+    '''
+    if not hasattr(grid, 'hinted'):
+        return None
+
+    return 'cell_index_{}'.format(grid.id)
+
+
 class PyMover(Mover):
     def __init__(self, default_num_method='RK2',
                  **kwargs):
@@ -228,6 +241,31 @@ class PyMover(Mover):
     def is_data_on_cells(self):
         return self.data.grid.infer_location(self.data.u.data) != 'node'
 
+    @property
+    def all_array_types(self):
+        '''
+        adds a cell_index array for the grid of each environment object the
+        mover interpolates -- one per grid, so the hints of a current and a
+        wind on different grids are each kept from one step to the next
+        '''
+        array_types = super(PyMover, self).all_array_types
+
+        for vel_field in self._vel_fields():
+            name = _cell_index_name(getattr(vel_field, 'grid', None))
+
+            if name is not None:
+                cell_index = gat('cell_index')
+                cell_index.name = name
+                array_types[name] = cell_index
+
+        return array_types
+
+    def _vel_fields(self):
+        '''
+        the environment objects passed to the delta methods as vel_field
+        '''
+        return ()
+
     def delta_method(self, method_name=None):
         '''
             Returns a delta function based on its registered name
@@ -242,8 +280,26 @@ class PyMover(Mover):
 
         return self.num_methods[method_name]
 
+    def _cell_hints(self, sc, pos, vel_field):
+        '''
+        context in which the grid of vel_field looks for each element
+        starting from the cell it was last found in -- kept in the
+        cell_index array of the spill container for that grid
+        '''
+        grid = getattr(vel_field, 'grid', None)
+        name = _cell_index_name(grid)
+
+        if (sc is None or
+                name is None or
+                name not in sc or
+                len(sc[name]) != len(pos)):
+            return nullcontext()
+
+        return grid.hinted(sc[name])
+
     def get_delta_Euler(self, sc, time_step, model_time, pos, vel_field):
-        vels = vel_field.at(pos, model_time)
+        with self._cell_hints(sc, pos, vel_field):
+            vels = vel_field.at(pos, model_time)
 
         return vels * time_step
 
@@ -252,12 +308,13 @@ class PyMover(Mover):
         dt_s = dt.seconds
         t = model_time
 
-        v0 = vel_field.at(pos, t)
-        d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s, pos)
-        p1 = pos.copy()
-        p1 += d0
+        with self._cell_hints(sc, pos, vel_field):
+            v0 = vel_field.at(pos, t)
+            d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s, pos)
+            p1 = pos.copy()
+            p1 += d0
 
-        v1 = vel_field.at(p1, t + dt)
+            v1 = vel_field.at(p1, t + dt)
 
         return dt_s / 2 * (v0 + v1)
 
@@ -266,28 +323,29 @@ class PyMover(Mover):
         dt_s = dt.seconds
         t = model_time
 
-        v0 = vel_field.at(pos, t)
-        d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s / 2, pos)
-        p1 = pos.copy()
-        p1 += d0
+        with self._cell_hints(sc, pos, vel_field):
+            v0 = vel_field.at(pos, t)
+            d0 = FlatEarthProjection.meters_to_lonlat(v0 * dt_s / 2, pos)
+            p1 = pos.copy()
+            p1 += d0
 
-        v1 = vel_field.at(p1, t + dt / 2)
-        d1 = FlatEarthProjection.meters_to_lonlat(v1 * dt_s / 2, pos)
-        p2 = pos.copy()
-        p2 += d1
+            v1 = vel_field.at(p1, t + dt / 2)
+            d1 = FlatEarthProjection.meters_to_lonlat(v1 * dt_s / 2, pos)
+            p2 = pos.copy()
+            p2 += d1
 
-        v2 = vel_field.at(p2, t + dt / 2)
-        d2 = FlatEarthProjection.meters_to_lonlat(v2 * dt_s, pos)
-        p3 = pos.copy()
-        p3 += d2
+            v2 = vel_field.at(p2, t + dt / 2)
+            d2 = FlatEarthProjection.meters_to_lonlat(v2 * dt_s, pos)
+            p3 = pos.copy()
+            p3 += d2
 
-        v3 = vel_field.at(p3, t + dt)
+            v3 = vel_field.at(p3, t + dt)
 
         return dt_s / 6 * (v0 + 2 * v1 + 2 * v2 + v3)
 
 
 class CyMover(Mover):
-    def __init__(self, **kwargs):
+    def __init__(self, num_threads=1, **kwargs):
         """
         Base class for python wrappers around cython movers.
         Uses ``super(CyMover, self).__init__(**kwargs)`` to call Mover class
@@ -300,10 +358,20 @@ class CyMover(Mover):
         We assumes any derived class will instantiate a 'mover' object that
         has methods like: prepare_for_model_run, prepare_for_model_step,
 
-        All kwargs passed on to super class
+        :param num_threads=1: the most threads the C++ mover may split the
+                              elements between. Only the wind, grid wind,
+                              CATS and grid current (not RK4) movers split
+                              their forecast elements, and the random
+                              movers when they draw from random streams
+                              (see Model.random_streams) -- the others
+                              ignore it.
+
+        All other kwargs passed on to super class
         """
         super(CyMover, self).__init__(**kwargs)
 
+        self.num_threads = num_threads
+
         # initialize variables here for readability, though self.mover = None
         # produces errors, so that is not initialized here
 
@@ -315,6 +383,14 @@ class CyMover(Mover):
         # either a 1, or 2 depending on whether spill is certain or not
         self.spill_type = 0
 
+    @property
+    def num_threads(self):
+        return self.mover.num_threads
+
+    @num_threads.setter
+    def num_threads(self, value):
+        self.mover.num_threads = value
+
     def prepare_for_model_run(self):
         """
         Calls the contained cython mover's prepare_for_model_run()
@@ -387,11 +463,25 @@ class CyMover(Mover):
         if self.active and len(self.positions) > 0:
             self.mover.get_move(self.model_time, time_step,
                                 self.positions, self.delta,
-                                self.status_codes, self.spill_type)
+                                self.status_codes, self.spill_type,
+                                *self._random_stream_args(sc))
 
         return (self.delta.view(dtype=world_point_type)
                 .reshape((-1, len(world_point))))
 
+    def _random_stream_args(self, sc):
+        """
+        The extra arguments to the cython get_move() for the movers that
+        can draw from per element random streams (the ones with a
+        random_stream attribute): the stream, and the element ids and spill
+        numbers that key it.
+        """
+        stream = getattr(self, 'random_stream', None)
+        if stream is None:
+            return ()
+
+        return (stream, sc['id'], sc['spill_num'])
+
     def prepare_data_for_get_move(self, sc, model_time_datetime):
         """
         organizes the spill object into inputs for calling with Cython
@@ -254,6 +254,9 @@ class PyCurrentMover(movers.PyMover):
 
         return vels
 
+    def _vel_fields(self):
+        return (self.current,)
+
     def get_move(self, sc, time_step, model_time_datetime, num_method=None):
         """
         Compute the move in (long,lat,z) space. It returns the delta move
@@ -249,6 +249,9 @@ class PyWindMover(movers.PyMover):
 
             return centroids
 
+    def _vel_fields(self):
+        return (self.wind,)
+
     def get_move(self, sc, time_step, model_time_datetime, num_method=None):
         """
         Compute the move in (long,lat,z) space. It returns the delta move
@@ -43,6 +43,10 @@ class RandomMover(CyMover):
     """
     _schema = RandomMoverSchema
 
+    # the stream of the elements' random numbers -- None for the global
+    # random numbers. Set by the Model (see Model.random_streams)
+    random_stream = None
+
     def __init__(self, **kwargs):
         """
         Uses super to invoke base class __init__ method.
@@ -200,6 +204,10 @@ class RandomMover3D(CyMover):
     """
     _schema = RandomMover3DSchema
 
+    # the stream of the elements' random numbers -- None for the global
+    # random numbers. Set by the Model (see Model.random_streams)
+    random_stream = None
+
     def __init__(self, **kwargs):
         """
         Uses super to invoke base class __init__ method.
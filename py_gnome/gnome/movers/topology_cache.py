@@ -0,0 +1,219 @@
+"""
+An on-disk cache for the topology of gridded current and wind data
+
+Without a topology file, the grid movers build the triangles and the DAG
+tree for a curvilinear grid every time a data file is read, and for a big
+grid that can take close to a minute. It is the same every time for the same
+grid and land mask, so the cache keeps the exported topology files, named by
+a hash of the grid (and mask) variables, and reads them back in place of
+building it again.
+
+When the cache gets bigger than its max_size, the least recently used
+topology files are removed.
+
+The cache is off by default. Turn it on with::
+
+    gnome.movers.topology_cache.set_default_cache('/path/to/cache/dir')
+
+or by setting the PYGNOME_TOPOLOGY_CACHE environment variable to a directory.
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+import logging
+
+import numpy as np
+import netCDF4
+
+from gnome.utilities.disk_cache import DiskCache, DefaultCache, file_hash
+
+
+log = logging.getLogger(__name__)
+
+
+def _is_mask(var):
+    'is a netCDF variable a land (or wet/dry) mask'
+    names = (var.name,
+             getattr(var, 'standard_name', ''),
+             getattr(var, 'long_name', ''))
+
+    return any('mask' in str(n).lower() for n in names)
+
+
+def grid_hash(filename):
+    """
+    The sha1 hash of the grid of a data file, as a hex string
+
+    For a netCDF file, it is a hash of the variables that don't depend on
+    time -- the coordinates, the land mask and the like -- so a new forecast
+    on the same grid gets the same hash. A mask that does depend on time
+    (wetting and drying) is hashed too, all of it. Anything else (a filelist)
+    is hashed by its contents.
+    """
+    try:
+        dataset = netCDF4.Dataset(filename)
+    except (IOError, OSError):
+        return file_hash(filename)
+
+    sha = hashlib.sha1()
+
+    with dataset:
+        time_dims = set(name for name, dim in dataset.dimensions.items()
+                        if dim.isunlimited() or 'time' in name.lower())
+
+        for name in sorted(dataset.variables):
+            var = dataset.variables[name]
+
+            if time_dims.intersection(var.dimensions) and not _is_mask(var):
+                continue
+
+            var.set_auto_mask(False)
+            data = np.asarray(var[...])
+
+            sha.update(repr((name, var.dimensions, var.shape)).encode('utf-8'))
+            if data.dtype == object:
+                # variable length strings
+                sha.update(repr(data.tolist()).encode('utf-8'))
+            else:
+                sha.update(data.tobytes())
+
+    return sha.hexdigest()
+
+
+class TopologyCache(DiskCache):
+    """
+    A directory of topology files, keyed by a hash of the grid they were
+    built from
+    """
+    # bump if the topology files, or the way they are built, change
+    cache_version = 1
+
+    _suffix = '.dat'
+
+    def __init__(self, cache_dir, max_size=1024 ** 3):
+        """
+        :param cache_dir: directory to keep the cache in. It is created if it
+                          doesn't exist.
+        :param max_size=1GB: the maximum total size of the files, in bytes.
+        """
+        super(TopologyCache, self).__init__(cache_dir, max_size)
+
+    def get(self, key):
+        """
+        Get a topology file from the cache
+
+        :returns: the path to the file, or None if it isn't there.
+        """
+        if not self._touch(key):
+            return None
+
+        return self._entry_path(key)
+
+    def put(self, key, export_topology):
+        """
+        Add a topology file to the cache
+
+        :param export_topology: function that writes the topology to the
+                                filename it is passed -- the export_topology()
+                                of a grid mover.
+
+        :returns: the path to the file, or None if nothing was written
+        """
+        entry_file = self._entry_path(key)
+
+        if os.path.isfile(entry_file):
+            return entry_file
+
+        # write to a temp dir, and move it into place when done, so an
+        # entry is never seen half-written
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir)
+        tmp_file = os.path.join(tmp_dir, 'topology.dat')
+
+        try:
+            export_topology(tmp_file)
+
+            if not os.path.isfile(tmp_file):
+                # not a grid with a topology to export
+                return None
+
+            os.rename(tmp_file, entry_file)
+        except OSError:
+            log.info('could not add topology: {} to the cache'.format(key))
+            return None
+        finally:
+            shutil.rmtree(tmp_dir, True)
+
+        self.evict(keep=key)
+
+        return entry_file
+
+
+_default = DefaultCache(TopologyCache, 'PYGNOME_TOPOLOGY_CACHE', 1024 ** 3)
+
+
+def set_default_cache(cache_dir, max_size=1024 ** 3):
+    """
+    Set the cache used by the grid movers
+
+    :param cache_dir: directory for the cache. None turns the cache off.
+    :param max_size=1GB: the maximum total size of the cache, in bytes.
+
+    :returns: the TopologyCache, or None
+    """
+    return _default.set(cache_dir, max_size)
+
+
+def get_default_cache():
+    'the cache used by the grid movers -- None if it is off'
+    return _default.get()
+
+
+def text_read(cy_mover, filename, topology_file=None):
+    """
+    Read a gridded data file into a cython grid mover, with the topology from
+    the default cache when there is one. If the topology isn't in the cache
+    yet, it is built from the data file, and then added to it.
+
+    :param cy_mover: the cython mover -- CyGridCurrentMover, CyGridWindMover,
+                     CyIceMover, ...
+    :param filename: the data file: netCDF or filelist
+    :param topology_file=None: topology file given by the user. If there is
+                               one, the cache isn't used.
+
+    :returns: the topology file read, or added to the cache -- None if there
+              isn't one.
+    """
+    cache = get_default_cache()
+
+    if topology_file is not None or cache is None:
+        cy_mover.text_read(filename, topology_file)
+
+        return topology_file
+
+    start = time.time()
+    key = cache.make_key(cy_mover.__class__.__name__, grid_hash(filename))
+    topology_file = cache.get(key)
+
+    if topology_file is not None:
+        try:
+            cy_mover.text_read(filename, topology_file)
+        except OSError:
+            # a bad entry -- remove it and build the topology again
+            log.warning('could not read cached topology: {}'
+                        .format(topology_file))
+            cache.remove(key)
+            topology_file = None
+        else:
+            log.info('{}: read with cached topology in {:.2f} s'
+                     .format(filename, time.time() - start))
+
+            return topology_file
+
+    cy_mover.text_read(filename, None)
+    log.info('{}: read and built topology in {:.2f} s'
+             .format(filename, time.time() - start))
+
+    return cache.put(key, cy_mover.export_topology)
@@ -6,7 +6,7 @@ import os
 
 import numpy as np
 
-from colander import (SchemaNode, Bool, String, Float, drop)
+from colander import (SchemaNode, Bool, String, Float, Int, drop)
 
 from gnome.exceptions import ReferencedObjectNotSet
 
@@ -26,6 +26,7 @@ from gnome.utilities.rand import random_with_persistance
 from gnome.environment import Wind, WindSchema
 from gnome.environment.wind import constant_wind
 from gnome.movers import CyMover, ProcessSchema
+from gnome.movers import topology_cache
 from gnome.persist.base_schema import GeneralGnomeObjectSchema
 from gnome.persist.extend_colander import FilenameSchema
 from gnome.persist.validators import convertible_to_seconds
@@ -42,6 +43,7 @@ class WindMoversBaseSchema(ProcessSchema):
                                        missing=drop)
     uncertain_angle_scale = SchemaNode(Float(), save=True, update=True,
                                        missing=drop)
+    num_threads = SchemaNode(Int(), save=True, update=True, missing=drop)
 
 
 class WindMoversBase(CyMover):
@@ -341,7 +343,11 @@ class GridWindMover(WindMoversBase):
         :param wind_file: file containing wind data on a grid
         :param filename: file containing wind data on a grid
         :param topology_file: Default is None. When exporting topology, it
-                              is stored in this file
+                              is stored in this file.
+                              If not given, the topology is computed
+                              from the data file, or read from the
+                              topology cache if it is on (see
+                              gnome.movers.topology_cache)
         :param wind_scale: Value to scale wind data
         :param extrapolate: Allow current data to be extrapolated before and
                             after file data
@@ -360,7 +366,7 @@ class GridWindMover(WindMoversBase):
                                  .format(topology_file))
 
         self.mover = CyGridWindMover(wind_scale=kwargs.pop('wind_scale', 1))
-        self.mover.text_read(filename, topology_file)
+        topology_cache.text_read(self.mover, filename, topology_file)
 
         # Ideally, we would be able to run the base class initialization first
         # because we designed the Movers well.  As it is, we inherit from the
@@ -555,7 +561,7 @@ class IceWindMover(WindMoversBase):
 
         self.extrapolate = extrapolate
 
-        self.mover.text_read(filename, topology_file)
+        topology_cache.text_read(self.mover, filename, topology_file)
         self.mover.extrapolate_in_time(extrapolate)
         self.mover.offset_time(time_offset * 3600.)
 
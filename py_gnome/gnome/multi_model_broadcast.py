@@ -19,6 +19,9 @@ from zmq.eventloop import ioloop, zmqstream
 from gnome import GnomeId
 from gnome.environment import Wind
 from gnome.outputters import WeatheringOutput
+from gnome.utilities.shared_arrays import (SharedArraySender,
+                                           SharedArrayReceiver,
+                                           start_resource_tracker)
 
 
 # allows us to pickle exception traceback info
@@ -43,14 +46,18 @@ class ModelConsumer(mp.Process):
           are defined as private methods of this class.
         - Returns the results in a results queue
 
+        If shared_arrays is True, the numpy arrays in the results are
+        passed through shared memory, rather than pickled.
     '''
     def __init__(self, task_port, model,
-                 ipc_folder='.'):
+                 ipc_folder='.',
+                 shared_arrays=True):
         mp.Process.__init__(self)
 
         self.task_port = task_port
         self.model = model
         self.ipc_folder = ipc_folder
+        self.shared_arrays = shared_arrays
 
     def run(self):
         # remove any root handlers else we get IOErrors for shared file
@@ -64,6 +71,11 @@ class ModelConsumer(mp.Process):
 
         self.cleanup_inherited_files()
 
+        if self.shared_arrays:
+            self.array_sender = SharedArraySender()
+        else:
+            self.array_sender = None
+
         context = zmq.Context()
 
         self.loop = ioloop.IOLoop.instance()
@@ -81,6 +93,9 @@ class ModelConsumer(mp.Process):
         sock.close()
         context.destroy(linger=0)
 
+        if self.array_sender is not None:
+            self.array_sender.close()
+
     def cleanup_inherited_files(self):
         proc = psutil.Process(os.getpid())
         try:
@@ -103,6 +118,9 @@ class ModelConsumer(mp.Process):
                 cmd, args = cmd[:2]
                 res = getattr(self, '_' + cmd)(**args)
 
+                if self.array_sender is not None:
+                    res = self.array_sender.pack(res)
+
                 self.stream.send_unicode(dumps(res))
             except Exception:
                 self.stream.send_unicode(dumps(sys.exc_info()))
@@ -146,6 +164,13 @@ class ModelConsumer(mp.Process):
 
         return res
 
+    def _get_spill_property(self, prop_name, ucert=0):
+        return self.model.get_spill_property(prop_name, ucert=ucert)
+
+    def _get_spill_data(self, target_properties, conditions, ucert=0):
+        return self.model.get_spill_data(target_properties, conditions,
+                                         ucert=ucert)
+
     def _get_spill_amounts(self):
         return [s.amount for s in self.model.spills]
 
@@ -201,17 +226,25 @@ class ModelBroadcaster(GnomeId):
 
         More specifically, the model variations we are interested in are
         uncertainty variations.
+
+        If shared_arrays is True (the default), the numpy arrays in the
+        results of the commands (element data, ...) are passed back from
+        the subprocesses through shared memory, and only a small
+        description of them goes through the sockets.
     '''
     def __init__(self, model,
                  wind_speed_uncertainties,
                  spill_amount_uncertainties,
-                 ipc_folder='.'):
+                 ipc_folder='.',
+                 shared_arrays=True):
         self.model = model
         self.ipc_folder = ipc_folder
+        self.shared_arrays = shared_arrays
         self.context = None
         self.consumers = []
         self.tasks = []
         self.task_files = []
+        self.receivers = []
         self.lookup = {}
 
         self._get_available_ports(wind_speed_uncertainties,
@@ -325,7 +358,12 @@ class ModelBroadcaster(GnomeId):
             return out
 
     def recv_from_task(self, task):
-        return loads(task.recv())
+        res = loads(task.recv())
+
+        if self.shared_arrays:
+            res = self.receivers[self.tasks.index(task)].unpack(res)
+
+        return res
 
     def handle_child_exception(self, response):
         if (isinstance(response, tuple) and len(response) == 3 and
@@ -351,11 +389,17 @@ class ModelBroadcaster(GnomeId):
 
             self.logger.info('joined all consumers!')
 
+            # a consumer may have been terminated before it removed its
+            # shared memory
+            for r in self.receivers:
+                r.close(unlink=True)
+
             self.context.term()
 
             self.clean_task_files()
             self.consumers = []
             self.tasks = []
+            self.receivers = []
             self.lookup = {}
 
     def clean_task_files(self):
@@ -383,8 +427,12 @@ class ModelBroadcaster(GnomeId):
                 idx += 1
 
     def _spawn_consumers(self):
+        if self.shared_arrays:
+            start_resource_tracker()
+
         for p in self.task_ports:
-            model_consumer = ModelConsumer(p, self.model, self.ipc_folder)
+            model_consumer = ModelConsumer(p, self.model, self.ipc_folder,
+                                           self.shared_arrays)
             model_consumer.start()
             self.consumers.append(model_consumer)
 
@@ -402,6 +450,7 @@ class ModelBroadcaster(GnomeId):
 
             self.tasks.append(task)
             self.task_files.append(task_file)
+            self.receivers.append(SharedArrayReceiver())
 
     def _set_uncertainty(self,
                          wind_speed_uncertainty,
@@ -4,12 +4,14 @@ Does not contain a schema for persistence yet
 '''
 
 import os
+import gzip
+import json
 from collections.abc import Iterable
 from glob import glob
 
 import numpy as np
 
-from geojson import (Feature, FeatureCollection, dump,
+from geojson import (Feature, FeatureCollection,
                      Point, MultiPolygon)
 from gnome.persist import (SchemaNode, String, drop, Int, Boolean,
                            SequenceSchema, GeneralGnomeObjectSchema)
@@ -33,6 +35,29 @@ class TrajectoryGeoJsonSchema(BaseOutputterSchema):
     output_dir = SchemaNode(
         String(), missing=drop, save=True, update=True
     )
+    gzip_output = SchemaNode(
+        Boolean(), missing=drop, save=True, update=True
+    )
+
+
+# the text of one feature, as written by geojson.dump(..., indent=True)
+_feature_template = ('  {\n'
+                     '   "type": "Feature",\n'
+                     '   "id": %d,\n'
+                     '   "geometry": {\n'
+                     '    "type": "Point",\n'
+                     '    "coordinates": [\n'
+                     '     %r,\n'
+                     '     %r\n'
+                     '    ]\n'
+                     '   },\n'
+                     '   "properties": {\n'
+                     '    "status_code": %d,\n'
+                     '    "sc_type": {sc_type},\n'
+                     '    "mass": %r,\n'
+                     '    "spill_num": %d\n'
+                     '   }\n'
+                     '  }')
 
 
 class TrajectoryGeoJsonOutput(Outputter):
@@ -68,13 +93,24 @@ class TrajectoryGeoJsonOutput(Outputter):
             ...
         }
 
+    With an output_dir, the FeatureCollection text is written to the files
+    straight from the data arrays, a chunk of elements at a time, and the
+    Feature objects are not made -- the returned dict has the
+    output_filename in place of the FeatureCollections.
     '''
     _schema = TrajectoryGeoJsonSchema
 
+    # number of elements written at a time
+    _chunk_size = 10000
+
+    # geojson rounds the coordinates of a Point to this many digits
+    _coord_precision = 6
+
     def __init__(self,
                  round_data=True,
                  round_to=4,
                  output_dir=None,
+                 gzip_output=False,
                  **kwargs):
         '''
         :param bool round_data=True: if True, then round the numpy arrays
@@ -85,12 +121,15 @@ class TrajectoryGeoJsonOutput(Outputter):
         :param str output_dir=None: output directory for geojson files. Default
             is None since data is returned in dict for webapi. For using
             write_output_post_run(), this must be set
+        :param bool gzip_output=False: if True, the files are gzipped:
+            geojson_<step_num>.geojson.gz
 
         use super to pass optional ``**kwargs`` to base class __init__ method
         '''
         self.round_data = round_data
         self.round_to = round_to
         self.output_dir = output_dir
+        self.gzip_output = gzip_output
 
         super(TrajectoryGeoJsonOutput, self).__init__(output_dir=output_dir,
                                                       **kwargs)
@@ -120,13 +159,37 @@ class TrajectoryGeoJsonOutput(Outputter):
         if not self._write_step:
             return None
 
+        scs = list(self.cache.load_timestep(step_num).items())
+
+        # default geojson should not output data to file
+        # read data from file and send it to web client
+        output_info = {'time_stamp': scs[-1].current_time_stamp.isoformat()}
+
+        if self.output_dir:
+            # the certain and uncertain collections were both written to the
+            # same file, so the file has the uncertain one (empty without
+            # uncertainty) -- only that one is written
+            uc_scs = [sc for sc in scs if sc.uncertain]
+
+            output_info['output_filename'] = self.output_to_file(uc_scs,
+                                                                 step_num)
+        else:
+            (output_info['certain'],
+             output_info['uncertain']) = self._feature_collections(scs)
+
+        return output_info
+
+    def _feature_collections(self, scs):
+        '''
+        the certain and uncertain FeatureCollections of the spill containers
+        '''
         # one feature per element client; replaced with multipoint
         # because client performance is much more stable with one
         # feature per step rather than (n) features per step.features = []
         c_features = []
         uc_features = []
 
-        for sc in self.cache.load_timestep(step_num).items():
+        for sc in scs:
             position = self._dataarray_p_types(sc['positions'])
             status = self._dataarray_p_types(sc['status_codes'])
             mass = self._dataarray_p_types(sc['mass'])
@@ -154,34 +217,86 @@ class TrajectoryGeoJsonOutput(Outputter):
                 else:
                     c_features.append(feature)
 
-        c_geojson = FeatureCollection(c_features)
-        uc_geojson = FeatureCollection(uc_features)
-
-        # default geojson should not output data to file
-        # read data from file and send it to web client
-        output_info = {'time_stamp': sc.current_time_stamp.isoformat(),
-                       'certain': c_geojson,
-                       'uncertain': uc_geojson}
+        return FeatureCollection(c_features), FeatureCollection(uc_features)
 
-        if self.output_dir:
-            output_info['output_filename'] = self.output_to_file(c_geojson,
-                                                                 step_num)
-            self.output_to_file(uc_geojson, step_num)
-
-        return output_info
+    def output_to_file(self, scs, step_num):
+        '''
+        write the FeatureCollection of the elements in the spill containers
+        to the geojson file for the step
 
-    def output_to_file(self, json_content, step_num):
+        The text is the same as geojson.dump(..., indent=True) writes for the
+        FeatureCollection made by the webapi output
+        '''
         file_format = 'geojson_{0:06d}.geojson'
         filename = os.path.join(self.output_dir,
                                 file_format.format(step_num))
 
-        print("output to file")
-        print(type(json_content))
-        with open(filename, 'w+') as outfile:
-            dump(json_content, outfile, indent=True)
+        if self.gzip_output:
+            filename += '.gz'
+            outfile = gzip.open(filename, 'wt')
+        else:
+            outfile = open(filename, 'w+')
+
+        with outfile:
+            self._write_features(outfile, scs)
 
         return filename
 
+    def _write_features(self, outfile, scs):
+        '''
+        write the text of a FeatureCollection of the elements, rendered from
+        the data arrays a chunk of elements at a time
+        '''
+        outfile.write('{\n "type": "FeatureCollection",\n "features": [')
+        sep = '\n'
+
+        for sc in scs:
+            sc_type = 'uncertain' if sc.uncertain else 'forecast'
+            template = _feature_template.replace('{sc_type}',
+                                                 json.dumps(sc_type))
+
+            position = self._p_type_array(sc['positions'])
+            status = self._p_type_array(sc['status_codes'])
+            mass = self._p_type_array(sc['mass'])
+            spill_num = self._p_type_array(sc['spill_num'])
+
+            if not (np.isfinite(position[:, :2]).all() and
+                    np.isfinite(mass).all()):
+                raise ValueError('Out of range float values are not '
+                                 'JSON compliant')
+
+            for start in range(0, len(position), self._chunk_size):
+                stop = start + self._chunk_size
+
+                rows = zip(range(start, stop),
+                           *(self._coordinates(position[start:stop]) +
+                             [status[start:stop].tolist(),
+                              mass[start:stop].tolist(),
+                              spill_num[start:stop].tolist()]))
+
+                outfile.write(sep)
+                outfile.write(',\n'.join([template % row for row in rows]))
+                sep = ',\n'
+
+        if sep == '\n':
+            # no features
+            outfile.write(']\n}')
+        else:
+            outfile.write('\n ]\n}')
+
+    def _coordinates(self, position):
+        '''
+        [longitudes, latitudes] lists, rounded like the coordinates of a
+        geojson Point
+        '''
+        if self.round_to <= self._coord_precision:
+            # already rounded to fewer digits -- round() wouldn't change them
+            return [position[:, 0].tolist(), position[:, 1].tolist()]
+
+        return [[round(c, self._coord_precision)
+                 for c in position[:, i].tolist()]
+                for i in (0, 1)]
+
     def _dataarray_p_types(self, data_array):
         '''
         return array as list with appropriate python dtype
@@ -201,15 +316,20 @@ class TrajectoryGeoJsonOutput(Outputter):
         #     data = data_array.astype(p_type).tolist()
 
         # refactored to simply use the correct python type:
+        return self._p_type_array(data_array).tolist()
+
+    def _p_type_array(self, data_array):
+        '''
+        the array rounded, with the dtype of the python type its data are
+        output as
+        '''
         if issubclass(data_array.dtype.type, float):
-            data = data_array.round(self.round_to).astype(float).tolist()
+            return data_array.round(self.round_to).astype(float)
         elif issubclass(data_array.dtype.type, np.integer):
-            data = data_array.astype(int).tolist()
+            return data_array.astype(int)
         else:
             raise TypeError("geojon can only handle float or integer types")
 
-        return data
-
     # def rewind(self):
     #     'remove previously written files'
     #     super(TrajectoryGeoJsonOutput, self).rewind()
@@ -218,7 +338,7 @@ class TrajectoryGeoJsonOutput(Outputter):
     def clean_output_files(self):
         print("in clean_output_files")
         if self.output_dir:
-            files = glob(os.path.join(self.output_dir, 'geojson_*.geojson'))
+            files = glob(os.path.join(self.output_dir, 'geojson_*.geojson*'))
 
             print("files are:")
             print(files)
@@ -3,9 +3,11 @@ JSON outputter
 Does not contain a schema for persistence yet
 '''
 
+import base64
+
 import numpy as np
 from collections.abc import Iterable
-from colander import SchemaNode, SequenceSchema, String, drop
+from colander import SchemaNode, SequenceSchema, String, OneOf, drop
 
 from gnome.utilities.time_utils import date_to_sec
 
@@ -23,6 +25,10 @@ class SpillJsonSchema(BaseOutputterSchema):
     _additional_data = SequenceSchema(
         SchemaNode(String()), missing=drop, save=True, update=True
     )
+    encoding = SchemaNode(
+        String(), validator=OneOf(['json', 'base64', 'binary']),
+        missing=drop, save=True, update=True
+    )
 
 
 class SpillJsonOutput(Outputter):
@@ -52,20 +58,66 @@ class SpillJsonOutput(Outputter):
             "step_num": <STEP_NUM>
             "timestamp": <TIMESTAMP>
         }
+
+    With encoding='base64' or 'binary', the arrays are not lists of numbers,
+    but little-endian buffers, so a client can read them as typed arrays.
+    The dtype of each one is in "dtypes", and the shape in "shapes" -- the
+    arrays of _additional_data can have more than one dimension, like
+    mass_components. The buffers are in C order::
+
+            "certain": {
+                "length":<LENGTH>
+                "encoding": "base64"
+                "dtypes": {"longitude": "<f4",
+                           "latitude": "<f4",
+                           "status": "|u1",
+                           "mass": "<f4",
+                           "spill_num": "<u2"}
+                "shapes": {"longitude": [<LENGTH>],
+                           ...}
+                "longitude": <BUFFER>
+                ...
+            }
+
+    The buffers are base64 strings for 'base64', and bytes for 'binary' --
+    for a server that sends the output with a binary framing, like msgpack.
     '''
     _schema = SpillJsonSchema
 
-    def __init__(self, _additional_data=None, **kwargs):
+    # dtypes of the arrays for the binary encodings -- _additional_data
+    # floats are float32
+    _binary_dtypes = {'longitude': np.dtype('<f4'),
+                      'latitude': np.dtype('<f4'),
+                      'status': np.dtype('u1'),
+                      'mass': np.dtype('<f4'),
+                      'spill_num': np.dtype('<u2')}
+
+    def __init__(self, _additional_data=None, encoding='json', **kwargs):
         '''
-        :param list current_movers: A list or collection of current grid mover
-                                    objects.
+        :param list _additional_data: names of other data arrays to output
+        :param encoding='json': how the arrays are output: 'json' for lists,
+                                'base64' or 'binary' for little-endian
+                                buffers, base64 encoded or as bytes.
 
         use super to pass optional kwargs to base class __init__ method
         '''
         self._additional_data =_additional_data if _additional_data else []
+        self.encoding = encoding
 
         super(SpillJsonOutput, self).__init__(**kwargs)
 
+    @property
+    def encoding(self):
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, encoding):
+        if encoding not in ('json', 'base64', 'binary'):
+            raise ValueError("encoding must be 'json', 'base64' or 'binary'. "
+                             "Got: {}".format(encoding))
+
+        self._encoding = encoding
+
     def write_output(self, step_num, islast_step=False):
         'dump data in geojson format'
         super(SpillJsonOutput, self).write_output(step_num, islast_step)
@@ -80,6 +132,16 @@ class SpillJsonOutput(Outputter):
         uncertain_scs = []
 
         for sc in self.cache.load_timestep(step_num).items():
+            if self.encoding != 'json':
+                out = self._encode_arrays(sc)
+
+                if sc.uncertain:
+                    uncertain_scs.append(out)
+                else:
+                    certain_scs.append(out)
+
+                continue
+
             position = sc['positions']
             longitude = np.around(position[:, 0], 5).tolist()
             latitude = np.around(position[:, 1], 5).tolist()
@@ -130,6 +192,42 @@ class SpillJsonOutput(Outputter):
 
         return output_info
 
+    def _encode_arrays(self, sc):
+        '''
+        the arrays of a spill container as little-endian buffers
+        '''
+        position = sc['positions']
+        arrays = {'longitude': position[:, 0],
+                  'latitude': position[:, 1],
+                  'status': sc['status_codes'],
+                  'mass': sc['mass'],
+                  'spill_num': sc['spill_num']}
+        dtypes = dict(self._binary_dtypes)
+
+        for d in self._additional_data:
+            arrays[d] = sc[d]
+            if sc[d].dtype.kind == 'f':
+                dtypes[d] = np.dtype('<f4')
+            else:
+                dtypes[d] = sc[d].dtype.newbyteorder('<')
+
+        out = {'length': len(position),
+               'encoding': self.encoding,
+               'dtypes': {},
+               'shapes': {}}
+
+        for name, array in arrays.items():
+            buf = np.ascontiguousarray(array, dtype=dtypes[name]).tobytes()
+
+            if self.encoding == 'base64':
+                buf = base64.b64encode(buf).decode('ascii')
+
+            out[name] = buf
+            out['dtypes'][name] = dtypes[name].str
+            out['shapes'][name] = list(array.shape)
+
+        return out
+
 
 class CurrentJsonSchema(BaseOutputterSchema):
     current_movers = SequenceSchema(
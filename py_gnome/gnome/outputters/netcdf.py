@@ -14,6 +14,7 @@ from colander import SchemaNode, String, Boolean, drop, Int, Bool
 from gnome import __version__
 from gnome.basic_types import oil_status, world_point_type
 from gnome.persist.extend_colander import FilenameSchema
+from gnome.utilities.prefetch import netcdf_lock
 
 
 from .outputter import Outputter, BaseOutputterSchema, OutputterFilenameMixin
@@ -35,6 +36,10 @@ var_attributes = {
                        'long_name': 'number of particles in a given timestep',
                        'ragged_row_count': 'particle count at nth timestep',
                        },
+    'particle_start': {'units': '1',
+                       'long_name': 'index of the first particle of a given '
+                                    'timestep in the data dimension',
+                       },
     'longitude': {'long_name': 'longitude of the particle',
                   'standard_name': 'longitude',
                   'units': 'degrees_east',
@@ -178,6 +183,9 @@ class NetCDFOutputSchema(BaseOutputterSchema):
     zip_output = SchemaNode(
         Boolean(), missing=drop, save=True, update=True
     )
+    flush_interval = SchemaNode(
+        Int(), missing=drop, save=True, update=True
+    )
 
 
 class NetCDFOutput(Outputter, OutputterFilenameMixin):
@@ -278,6 +286,7 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
                  # FIXME: this should not be default, but since we don't have
                  #        a way for WebGNOME to set it yet..
                  surface_conc="kde",
+                 flush_interval=10,
                  # _middle_of_run=False,
                  _start_idx=0,
                  **kwargs):
@@ -301,6 +310,12 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
             attributes
         :type which_data: string -- one of {'standard', 'most', 'all'}
 
+        :param flush_interval=10: The files are kept open for the whole run,
+            and the data for this many output steps is held in memory, then
+            written to the files in one batch. The files are always flushed
+            at the end of the run.
+        :type flush_interval: int
+
         Optional arguments passed on to base class (kwargs):
 
         :param cache: sets the cache object from which to read data. The model
@@ -325,6 +340,14 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
 
         # uncertain file is only written out if model is uncertain
 
+        # open netCDF4.Datasets, and the data waiting to be written to them,
+        # keyed by filename -- needed by rewind(), which the base class
+        # __init__ calls
+        self._datasets = {}
+        self._buffers = {}
+        self._next_idx = {}
+        self.flush_interval = flush_interval
+
         ## why is this even here ?!?!
         # kwargs['_middle_of_run'] = _middle_of_run
         super(NetCDFOutput, self).__init__(filename=filename,
@@ -554,6 +577,9 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
         if not self.on:
             return
 
+        # the files are about to be deleted and re-created
+        self._close_datasets()
+
         super(NetCDFOutput, self).prepare_for_model_run(model_start_time,
                                                         spills, **kwargs)
 
@@ -573,66 +599,76 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
             self._file_exists_error(file_)
 
             # create the netcdf files and write the standard stuff:
-            with nc.Dataset(file_, 'w', format=self._format) as rootgrp:
+            # they are kept open until the end of the run
+            with netcdf_lock.held():
+                rootgrp = nc.Dataset(file_, 'w', format=self._format)
+                self._datasets[file_] = rootgrp
+                self._buffers[file_] = []
+                # next (time, data) index to write in the file
+                self._next_idx[file_] = (0, 0)
+
                 self._initialize_rootgrp(rootgrp, sc)
 
-                # create a dict with dims {2: 'two', 3: 'three' ...}
-                # use this to define the NC variable's shape in code below
-                d_dims = {len(dim): name
-                          for name, dim in rootgrp.dimensions.items()
-                          if len(dim) > 0}
-
-                # create the time/particle_count variables
-                self._create_nc_var(rootgrp, 'time', np.float64,
-                                    ('time', ), (self._chunksize,))
-                self._create_nc_var(rootgrp, 'particle_count', np.int32,
-                                    ('time', ), (self._chunksize,))
-
-                self._update_arrays_to_output(sc)
-
-                for var_name in self.arrays_to_output:
-                    # the special cases:
-                    if var_name in ('latitude', 'longitude', 'depth'):
-                        # these don't  map directly to an array_type
-                        dt = world_point_type
-                        shape = ('data', )
-                        chunksz = (self._chunksize,)
+            # create a dict with dims {2: 'two', 3: 'three' ...}
+            # use this to define the NC variable's shape in code below
+            d_dims = {len(dim): name
+                      for name, dim in rootgrp.dimensions.items()
+                      if len(dim) > 0}
+
+            # create the time/particle_count variables
+            self._create_nc_var(rootgrp, 'time', np.float64,
+                                ('time', ), (self._chunksize,))
+            self._create_nc_var(rootgrp, 'particle_count', np.int32,
+                                ('time', ), (self._chunksize,))
+            # index of each step's data -- for random access when reading
+            self._create_nc_var(rootgrp, 'particle_start', np.int64,
+                                ('time', ), (self._chunksize,))
+
+            self._update_arrays_to_output(sc)
+
+            for var_name in self.arrays_to_output:
+                # the special cases:
+                if var_name in ('latitude', 'longitude', 'depth'):
+                    # these don't  map directly to an array_type
+                    dt = world_point_type
+                    shape = ('data', )
+                    chunksz = (self._chunksize,)
+                else:
+                    # in prepare_for_model_run, nothing is released but
+                    # numpy arrays are initialized with 0 elements so use
+                    # the arrays to get shape and dtype instead of the
+                    # array_types since array_type could contain None for
+                    # shape
+                    try:
+                        dt = sc[var_name].dtype
+                    except KeyError:  # ignore arrays that aren't there
+                        pass
                     else:
-                        # in prepare_for_model_run, nothing is released but
-                        # numpy arrays are initialized with 0 elements so use
-                        # the arrays to get shape and dtype instead of the
-                        # array_types since array_type could contain None for
-                        # shape
-                        try:
-                            dt = sc[var_name].dtype
-                        except KeyError:  # ignore arrays that aren't there
-                            pass
+                        if len(sc[var_name].shape) == 1:
+                            shape = ('data',)
+                            chunksz = (self._chunksize,)
                         else:
-                            if len(sc[var_name].shape) == 1:
-                                shape = ('data',)
-                                chunksz = (self._chunksize,)
-                            else:
-                                y_sz = d_dims[sc[var_name].shape[1]]
-                                shape = ('data', y_sz)
-                                chunksz = (self._chunksize,
-                                           sc[var_name].shape[1])
-
-                    self._create_nc_var(rootgrp, var_name, dt, shape, chunksz)
-
-                # Add subgroup for mass_balance - could do it w/o subgroup
-                if sc.mass_balance:
-                    grp = rootgrp.createGroup('mass_balance')
-
-                    # give this grp a dimension for time
-                    grp.createDimension('time', None)  # unlimited
-
-                    for key in sc.mass_balance:
-                        # mass_balance variables get a smaller chunksize
-                        self._create_nc_var(grp,
-                                            var_name=key,
-                                            dtype='float',
-                                            shape=('time',),
-                                            chunksz=(256,))
+                            y_sz = d_dims[sc[var_name].shape[1]]
+                            shape = ('data', y_sz)
+                            chunksz = (self._chunksize,
+                                       sc[var_name].shape[1])
+
+                self._create_nc_var(rootgrp, var_name, dt, shape, chunksz)
+
+            # Add subgroup for mass_balance - could do it w/o subgroup
+            if sc.mass_balance:
+                grp = rootgrp.createGroup('mass_balance')
+
+                # give this grp a dimension for time
+                grp.createDimension('time', None)  # unlimited
+
+                for key in sc.mass_balance:
+                    # mass_balance variables get a smaller chunksize
+                    self._create_nc_var(grp,
+                                        var_name=key,
+                                        dtype='float',
+                                        shape=('time',),
+                                        chunksz=(256,))
 
         # need to keep track of starting index for writing data since variable
         # number of particles are released
@@ -715,51 +751,138 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
 
             time_stamp = sc.current_time_stamp
 
-            with nc.Dataset(file_, 'a') as rootgrp:
-                rg_vars = rootgrp.variables
-                idx = len(rg_vars['time'])
-
-                rg_vars['time'][idx] = nc.date2num(time_stamp,
-                                                   rg_vars['time'].units,
-                                                   rg_vars['time'].calendar)
-                pc = rg_vars['particle_count']
-                pc[idx] = len(sc)
-
-                _end_idx = self._start_idx + pc[idx]
-
-                # add the data:
-                for var_name in self.arrays_to_output:
-                    # special case positions:
-                    if var_name == 'longitude':
-                        rg_vars['longitude'][self._start_idx:_end_idx] = sc['positions'][:, 0]
-                    elif var_name == 'latitude':
-                        rg_vars['latitude'][self._start_idx:_end_idx] = sc['positions'][:, 1]
-                    elif var_name == 'depth':
-                        rg_vars['depth'][self._start_idx:_end_idx] = sc['positions'][:, 2]
-                    else:
-                        rg_vars[var_name][self._start_idx:_end_idx] = sc[var_name]
-
-                # write mass_balance data
-                if sc.mass_balance:
-                    grp = rootgrp.groups['mass_balance']
-                    for key, val in sc.mass_balance.items():
-                        if key not in grp.variables:
-                            self._create_nc_var(grp,
-                                                key, 'float', ('time', ),
-                                                (self._chunksize,)
-                                                )
-                        grp.variables[key][idx] = val
+            self._buffer_step(file_, sc)
+
+        self._start_idx += len(sc)
+
+        if (islast_step or
+                len(self._buffers[self.forecast_filename]) >=
+                self.flush_interval):
+            self._flush()
 
         if islast_step:
+            self._close_datasets()
+
             if self.zip_output is True:
                 self._zip_output_files()
 
-        self._start_idx = _end_idx  # set _start_idx for the next timestep
-
         return {'filename': (self.filename,
                              self._u_filename),
                 'time_stamp': time_stamp.isoformat()}
 
+    def _buffer_step(self, file_, sc):
+        """
+        Hold a copy of the data for a step in memory until it is flushed
+
+        copies, as the arrays from the cache may be re-used
+        """
+        data = {}
+        for var_name in self.arrays_to_output:
+            # special case positions:
+            if var_name == 'longitude':
+                data[var_name] = np.array(sc['positions'][:, 0])
+            elif var_name == 'latitude':
+                data[var_name] = np.array(sc['positions'][:, 1])
+            elif var_name == 'depth':
+                data[var_name] = np.array(sc['positions'][:, 2])
+            else:
+                data[var_name] = np.array(sc[var_name])
+
+        self._buffers[file_].append((sc.current_time_stamp,
+                                     len(sc),
+                                     data,
+                                     dict(sc.mass_balance)))
+
+    def _flush(self):
+        """
+        Write the buffered steps to the open files
+
+        Each variable gets written as one slab covering all the buffered
+        steps -- the particles for consecutive steps are contiguous in the
+        'data' dimension.
+
+        Holds netcdf_lock: it may be run by the background writer while
+        gridded data is read on another thread.
+        """
+        with netcdf_lock.held():
+            self._flush_buffers()
+
+    def _flush_buffers(self):
+        for file_, steps in self._buffers.items():
+            if len(steps) == 0:
+                continue
+
+            rootgrp = self._datasets[file_]
+            rg_vars = rootgrp.variables
+
+            t_start, d_start = self._next_idx[file_]
+            t_end = t_start + len(steps)
+
+            time_stamps, counts, data, mass_balance = list(zip(*steps))
+            d_end = d_start + sum(counts)
+
+            rg_vars['time'][t_start:t_end] = nc.date2num(
+                list(time_stamps),
+                rg_vars['time'].units,
+                rg_vars['time'].calendar)
+            rg_vars['particle_count'][t_start:t_end] = counts
+            rg_vars['particle_start'][t_start:t_end] = \
+                d_start + np.cumsum(counts) - counts
+
+            # add the data:
+            if d_end > d_start:
+                for var_name in data[0]:
+                    rg_vars[var_name][d_start:d_end] = \
+                        np.concatenate([d[var_name] for d in data])
+
+            # write mass_balance data
+            mb_keys = set()
+            for mb in mass_balance:
+                mb_keys.update(mb)
+
+            if mb_keys:
+                grp = rootgrp.groups['mass_balance']
+                for key in mb_keys:
+                    if key not in grp.variables:
+                        self._create_nc_var(grp,
+                                            key, 'float', ('time', ),
+                                            (self._chunksize,)
+                                            )
+
+                    values = [mb.get(key) for mb in mass_balance]
+                    if None not in values:
+                        grp.variables[key][t_start:t_end] = values
+                    else:
+                        for idx, val in enumerate(values, t_start):
+                            if val is not None:
+                                grp.variables[key][idx] = val
+
+            rootgrp.sync()
+
+            self._next_idx[file_] = (t_end, d_end)
+            del steps[:]
+
+    def _close_datasets(self):
+        """
+        Flush any buffered data and close the files
+        """
+        if self._datasets:
+            self._flush()
+
+        with netcdf_lock.held():
+            for rootgrp in self._datasets.values():
+                rootgrp.close()
+
+        self._datasets = {}
+        self._buffers = {}
+        self._next_idx = {}
+
+    def post_model_run(self):
+        """
+        Make sure everything is written and the files are closed
+        """
+        self._close_datasets()
+
     def _zip_output_files(self):
         zfilename = self.zip_filename
         zipf = zipfile.ZipFile(zfilename, 'w')
@@ -805,6 +928,7 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
         '''
         super(NetCDFOutput, self).rewind()
 
+        self._close_datasets()
         self._start_idx = 0
 
     # fixme: we should use the code in nc_particles for this!!!
@@ -875,104 +999,241 @@ class NetCDFOutput(Outputter, OutputterFilenameMixin):
         if not os.path.exists(netcdf_file):
             raise IOError('File not found: {0}'.format(netcdf_file))
 
-        arrays_dict = {}
-        with nc.Dataset(netcdf_file) as data:
-            _start_ix = 0
-
-            # first find the index of index in which we are interested
-            time_ = data.variables['time']
-
+        with NetCDFReader(netcdf_file) as reader:
             if time is None and index is None:
                 # there should only be 1 time in file. Read and
                 # return data associated with it
-                if len(time_) > 1:
+                if len(reader) > 1:
                     raise ValueError('More than one time found in netcdf '
                                      'file. Please specify time/index for '
                                      'which data is desired')
                 else:
                     index = 0
-            else:
-                if time is not None:
-                    time_offset = nc.date2num(time, time_.units,
-                                              calendar=time_.calendar)
-                    if time_offset < 0:
-                        'desired time is before start of model'
-                        index = 0
-                    else:
-                        index = abs(time_[:] - time_offset).argmin()
-                elif index is not None:
-                    if index < 0:
-                        index = len(time_) + index
-
-            for idx in range(index):
-                _start_ix += data.variables['particle_count'][idx]
-
-            _stop_ix = _start_ix + data.variables['particle_count'][index]
-            elem = data.variables['particle_count'][index]
-
-            c_time = nc.num2date(time_[index], time_.units,
-                                 calendar=time_.calendar)
-
-            arrays_dict['current_time_stamp'] = np.array(c_time)
-
-            # figure out what arrays to read in:
-            if which_data == 'standard':
-                data_arrays = set(klass.standard_arrays)
-
-                # swap out positions:
-                [data_arrays.discard(x) for x in ('latitude',
-                                                  'longitude',
-                                                  'depth')]
-                data_arrays.add('positions')
-            elif which_data == 'all':
-                # pull them from the nc file
-                data_arrays = set(data.variables.keys())
-
-                # remove the irrelevant ones:
-                [data_arrays.discard(x) for x in ('time',
-                                                  'particle_count',
-                                                  'latitude',
-                                                  'longitude',
-                                                  'depth')]
-                data_arrays.add('positions')
-            else:  # should be list of data arrays
-                data_arrays = set(which_data)
-
-            # get the data
-            for array_name in data_arrays:
-                # special case time and positions:
-                if array_name == 'positions':
-                    positions = np.zeros((elem, 3), dtype=world_point_type)
-
-                    positions[:, 0] = \
-                        data.variables['longitude'][_start_ix:_stop_ix]
-                    positions[:, 1] = \
-                        data.variables['latitude'][_start_ix:_stop_ix]
-                    positions[:, 2] = \
-                        data.variables['depth'][_start_ix:_stop_ix]
-
-                    arrays_dict['positions'] = positions
-                else:
-                    try:
-                        arrays_dict[array_name] = data.variables[array_name][_start_ix:_stop_ix]
-                    except KeyError:
-                        # it's OK if it's not there, not all standard_arrays
-                        # will always be output
-                        pass
-
-            # get mass_balance
-            weathering_data = {}
-            if 'mass_balance' in data.groups:
-                mb = data.groups['mass_balance']
+            elif time is not None:
+                index = reader.time_index(time)
 
-                for key, val in mb.variables.items():
-                    # assume SI units
-                    weathering_data[key] = val[index]
-
-        return (arrays_dict, weathering_data)
+            return reader.read_step(index, which_data)
 
     def to_dict(self, json_=None):
         dict_ = super(NetCDFOutput, self).to_dict(json_)
         if json_ == 'save':
             dict_['filename'] = os.path.join('./', dict_['filename'])
         return dict_
+
+
+class NetCDFReader(object):
+    """
+    Random access to the data in a file written by NetCDFOutput
+
+    The dataset is kept open until close() is called -- or use it as a
+    context manager::
+
+        with NetCDFReader('my_run.nc') as reader:
+            for arrays, mass_balance in reader.iter_steps():
+                ...
+
+    The data for each time step is a contiguous slice of the 'data'
+    dimension. The start of each slice is read from the 'particle_start'
+    variable, or, for files written before that was added, computed from
+    'particle_count' once per file and cached.
+    """
+    # offsets computed for files without 'particle_start', keyed by
+    # (filename, modification time, size)
+    _offsets_cache = {}
+    _offsets_cache_size = 32
+
+    def __init__(self, netcdf_file):
+        """
+        :param netcdf_file: name of a netcdf file written by NetCDFOutput
+        """
+        if not os.path.exists(netcdf_file):
+            raise IOError('File not found: {0}'.format(netcdf_file))
+
+        self.filename = netcdf_file
+        self.dataset = nc.Dataset(netcdf_file)
+        self._offsets = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.dataset.close()
+
+    def __len__(self):
+        'number of time steps in the file'
+        return len(self.dataset.variables['time'])
+
+    @property
+    def offsets(self):
+        """
+        array of len(self) + 1 indexes into the 'data' dimension:
+        the data for step i is in [offsets[i]:offsets[i + 1]]
+        """
+        if self._offsets is None:
+            variables = self.dataset.variables
+
+            if 'particle_start' in variables:
+                counts = np.asarray(variables['particle_count'][:],
+                                    dtype=np.int64)
+                starts = np.asarray(variables['particle_start'][:],
+                                    dtype=np.int64)
+                self._offsets = np.append(starts,
+                                          starts[-1:] + counts[-1:])
+                if len(self._offsets) == 1:
+                    self._offsets = np.zeros((1,), dtype=np.int64)
+            else:
+                self._offsets = self._legacy_offsets()
+
+        return self._offsets
+
+    def _legacy_offsets(self):
+        'compute the offsets from particle_count, or get them from the cache'
+        stat = os.stat(self.filename)
+        key = (os.path.realpath(self.filename), stat.st_mtime, stat.st_size)
+
+        try:
+            return self._offsets_cache[key]
+        except KeyError:
+            pass
+
+        counts = np.asarray(self.dataset.variables['particle_count'][:],
+                            dtype=np.int64)
+        offsets = np.zeros((len(counts) + 1,), dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        if len(self._offsets_cache) >= self._offsets_cache_size:
+            # drop the oldest one
+            self._offsets_cache.pop(next(iter(self._offsets_cache)))
+        self._offsets_cache[key] = offsets
+
+        return offsets
+
+    def time_index(self, time):
+        """
+        index of the step closest to the given time
+
+        :param time: datetime of the data desired
+        """
+        time_ = self.dataset.variables['time']
+        time_offset = nc.date2num(time, time_.units, calendar=time_.calendar)
+
+        if time_offset < 0:
+            # desired time is before start of model
+            return 0
+        else:
+            return abs(time_[:] - time_offset).argmin()
+
+    def _array_names(self, which_data):
+        'figure out what arrays to read in'
+        if which_data == 'standard':
+            data_arrays = set(NetCDFOutput.standard_arrays)
+
+            # swap out positions:
+            data_arrays -= NetCDFOutput.special_arrays
+            data_arrays.add('positions')
+        elif which_data == 'all':
+            # pull them from the nc file
+            data_arrays = set(self.dataset.variables.keys())
+
+            # remove the irrelevant ones:
+            data_arrays -= {'time', 'particle_count', 'particle_start'}
+            data_arrays -= NetCDFOutput.special_arrays
+            data_arrays.add('positions')
+        else:  # should be list of data arrays
+            data_arrays = set(which_data)
+
+        return data_arrays
+
+    def read_arrays(self, which_data='standard', start=0, stop=None):
+        """
+        Read the data for a range of steps as single arrays
+
+        :param which_data='standard': Which data arrays are desired.
+                                      Options are:
+                                      ('standard', 'all',
+                                      [list_of_array_names])
+        :param start=0: first step to read
+        :param stop=None: step to stop before. If None, read to the end.
+
+        :return: dict of arrays holding the data for the steps. The data for
+                 step i starts at offsets[i] - offsets[start]
+        """
+        if stop is None:
+            stop = len(self)
+
+        variables = self.dataset.variables
+        start_ix = self.offsets[start]
+        stop_ix = self.offsets[stop]
+
+        arrays_dict = {}
+        for array_name in self._array_names(which_data):
+            # special case positions:
+            if array_name == 'positions':
+                positions = np.zeros((stop_ix - start_ix, 3),
+                                     dtype=world_point_type)
+
+                positions[:, 0] = variables['longitude'][start_ix:stop_ix]
+                positions[:, 1] = variables['latitude'][start_ix:stop_ix]
+                positions[:, 2] = variables['depth'][start_ix:stop_ix]
+
+                arrays_dict['positions'] = positions
+            else:
+                try:
+                    arrays_dict[array_name] = \
+                        variables[array_name][start_ix:stop_ix]
+                except KeyError:
+                    # it's OK if it's not there, not all standard_arrays
+                    # will always be output
+                    pass
+
+        return arrays_dict
+
+    def read_step(self, index, which_data='standard'):
+        """
+        Read the data for one time step
+
+        :param int index: Index of the 'time' variable (or time_step).
+                          Negative values count back from the end.
+        :param which_data='standard': Which data arrays are desired.
+                                      Options are:
+                                      ('standard', 'all',
+                                      [list_of_array_names])
+
+        :return: (arrays_dict, weathering_data), as NetCDFOutput.read_data()
+        """
+        if index < 0:
+            index = len(self) + index
+
+        if not 0 <= index < len(self):
+            raise IndexError('index {0} is out of range for {1} time steps'
+                             .format(index, len(self)))
+
+        arrays_dict = self.read_arrays(which_data, index, index + 1)
+
+        time_ = self.dataset.variables['time']
+        c_time = nc.num2date(time_[index], time_.units,
+                             calendar=time_.calendar)
+        arrays_dict['current_time_stamp'] = np.array(c_time)
+
+        # get mass_balance
+        weathering_data = {}
+        if 'mass_balance' in self.dataset.groups:
+            mb = self.dataset.groups['mass_balance']
+
+            for key, val in mb.variables.items():
+                # assume SI units
+                weathering_data[key] = val[index]
+
+        return (arrays_dict, weathering_data)
+
+    def iter_steps(self, which_data='standard'):
+        """
+        Iterate through the steps in the file
+
+        :return: (arrays_dict, weathering_data) for each step
+        """
+        for index in range(len(self)):
+            yield self.read_step(index, which_data)
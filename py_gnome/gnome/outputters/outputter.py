@@ -106,8 +106,8 @@ class Outputter(GnomeId):
         :param surface_conc = None: Compute surface concentration
                                   Any non-zero string will compute (and output)
                                   the surface concentration the contents of the
-                                  string determine the algorithm used. "kde" is
-                                  currently the only working option.
+                                  string determine the algorithm used: "kde"
+                                  or "binned" (faster for many elements).
         :type surface_conc: string or None
         """
 
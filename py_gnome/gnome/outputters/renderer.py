@@ -10,11 +10,14 @@ This one used the new map_canvas, which uses the gd rendering lib.
 import os
 from os.path import basename
 import glob
+from datetime import timedelta
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import py_gd
 
-from colander import SchemaNode, String, drop
+from colander import SchemaNode, String, Boolean, drop
 
 from gnome.basic_types import oil_status
 
@@ -25,6 +28,7 @@ from gnome.utilities import projections
 from gnome.utilities.projections import ProjectionSchema
 
 from gnome.environment.gridded_objects_base import Grid_S
+from gnome.spill_container import SpillContainerData, SpillContainerPairData
 
 from gnome.persist import base_schema
 from gnome.persist.extend_colander import FilenameSchema
@@ -47,6 +51,8 @@ class RendererSchema(BaseOutputterSchema):
     image_size = base_schema.ImageSize(save=True, update=False, missing=drop)
     output_dir = SchemaNode(String(), save=True, update=True, test_equal=False)
     draw_ontop = SchemaNode(String(), save=True, update=True)
+    render_post_run = SchemaNode(Boolean(), missing=drop,
+                                 save=True, update=True)
 
 
 class Renderer(Outputter, MapCanvas):
@@ -98,6 +104,8 @@ class Renderer(Outputter, MapCanvas):
                  output_start_time=None,
                  on=True,
                  timestamp_attrib={},
+                 render_post_run=False,
+                 num_workers=None,
                  **kwargs
                  ):
         """
@@ -154,6 +162,17 @@ class Renderer(Outputter, MapCanvas):
             final step is written regardless of output_timestep
         :type output_last_step: boolean
 
+        :param render_post_run=False: If True, write_output only makes a note
+            of the frames to draw, and they are all drawn in post_model_run,
+            from the model's cache, in parallel -- see render_frames(). The
+            model's cache must be enabled.
+        :type render_post_run: boolean
+
+        :param num_workers=None: number of processes used to draw the frames
+            if render_post_run is True. If None, one per CPU. If 1, they are
+            drawn in this process.
+        :type num_workers: int
+
         Remaining kwargs are passed onto baseclass's __init__ with a direct
         call: Outputter.__init__(..)
 
@@ -230,6 +249,11 @@ class Renderer(Outputter, MapCanvas):
         self.grids = []
         self.props = []
 
+        self.render_post_run = render_post_run
+        self.num_workers = num_workers
+        # (step_num, image_filename) of the frames to draw post run
+        self._frames = []
+
     @property
     def delay(self):
         return self._delay if 'gif' in self.formats else -1
@@ -302,6 +326,12 @@ class Renderer(Outputter, MapCanvas):
         """
         super(Renderer, self).prepare_for_model_run(*args, **kwargs)
 
+        if self.render_post_run and not self.cache.enabled:
+            raise ValueError('render_post_run needs the model cache to be '
+                             'enabled, to read the frames from it.')
+
+        self._frames = []
+
         self.clean_output_files()
         self.draw_background()
 
@@ -517,8 +547,7 @@ class Renderer(Outputter, MapCanvas):
 
         draws a grid for the pixels
 
-        this is pretty slow, but only used for diagnostics.
-        (not bad for just the lines)
+        only used for diagnostics.
         """
         if self.raster_map is not None:
             raster_map = self.raster_map
@@ -526,33 +555,41 @@ class Renderer(Outputter, MapCanvas):
             w, h = raster_map.raster.shape
 
             if self.raster_map_outline:
-                # vertical lines
-                for i in range(w):
-                    coords = projection.to_lonlat(np.array(((i, 0.0),
-                                                            (i, h)),
-                                                           dtype=np.float64))
-                    self.draw_polyline(coords, background=True,
-                                       line_color='raster_map_outline')
-                # horizontal lines
-                for i in range(h):
-                    coords = projection.to_lonlat(np.array(((0.0, i),
-                                                            (w, i)),
-                                                           dtype=np.float64))
+                # each set of lines is drawn as one polyline that zig-zags
+                # back and forth along the edges of the raster
+                ends = np.tile((0.0, h, h, 0.0), (w + 1) // 2)[:2 * w]
+                vertical = np.column_stack((np.repeat(np.arange(w), 2),
+                                            ends))
+
+                ends = np.tile((0.0, w, w, 0.0), (h + 1) // 2)[:2 * h]
+                horizontal = np.column_stack((ends,
+                                              np.repeat(np.arange(h), 2)))
+
+                for lines in (vertical, horizontal):
+                    coords = projection.to_lonlat(lines.astype(np.float64))
                     self.draw_polyline(coords, background=True,
                                        line_color='raster_map_outline')
 
             if self.raster_map_fill:
-                for i in range(w):
-                    for j in range(h):
-                        if raster_map.raster[i, j] == 1:
-                            rect = (projection
-                                    .to_lonlat(np.array(((i, j),
-                                                         (i + 1, j),
-                                                         (i + 1, j + 1),
-                                                         (i, j + 1)),
-                                                        dtype=np.float64)))
-                            self.draw_polygon(rect, fill_color='raster_map',
-                                              background=True)
+                # the raster cell that the center of each image pixel is in
+                # -- the centers are passed as floats, so to_lonlat doesn't
+                # depend on its shift of integer pixel coords
+                width, height = self.image_size
+                pixels = np.mgrid[0:width, 0:height].reshape(2, -1).T
+                centers = pixels.astype(np.float64) + 0.5
+                cells = projection.to_pixel(self.projection.to_lonlat(centers),
+                                            asint=True)
+
+                on_raster = ((cells[:, 0] >= 0) & (cells[:, 0] < w) &
+                             (cells[:, 1] >= 0) & (cells[:, 1] < h))
+                land = np.zeros((len(cells),), dtype=bool)
+                land[on_raster] = raster_map.raster[cells[on_raster, 0],
+                                                    cells[on_raster, 1]] == 1
+
+                image = self.back_asarray()
+                image[land.reshape((width, height))] = \
+                    self.back_image.get_color_index('raster_map')
+                self.back_image.set_data(image)
 
     def write_output(self, step_num, islast_step=False):
         """
@@ -586,13 +623,60 @@ class Renderer(Outputter, MapCanvas):
         image_filename = os.path.join(self.output_dir,
                                       self.foreground_filename_format.format(step_num))
 
+        if self.render_post_run:
+            # drawn later, by render_frames()
+            self._frames.append((step_num, image_filename))
+
+            for ftype in self.formats:
+                if ftype != 'gif':
+                    image_filename += ftype
+
+            return {'image_filename': image_filename,
+                    'time_stamp': self._step_time_stamp(step_num)}
+
+        time_stamp = self.draw_frame(self.cache.load_timestep(step_num))
+
+        for ftype in self.formats:
+            if ftype == 'gif':
+                self.animation.add_frame(self.fore_image, self.delay)
+            else:
+                image_filename += ftype
+                self.save_foreground(image_filename, file_type=ftype)
+
+        self.last_filename = image_filename
+
+        return {'image_filename': image_filename,
+                'time_stamp': time_stamp}
+
+    def _step_time_stamp(self, step_num):
+        """
+        The model time of step step_num -- from the start time and time step
+        of the run, so the step isn't loaded from the cache just for it.
+        """
+        if self._model_start_time is None or self.model_timestep is None:
+            return (self.cache.load_timestep(step_num).items()[0]
+                    .current_time_stamp)
+
+        return (self._model_start_time +
+                timedelta(seconds=step_num * self.model_timestep))
+
+    def draw_frame(self, scp):
+        """
+        Draws one frame to the foreground image: the background (if
+        draw_back_to_fore), the elements, the timestamp and the props.
+
+        :param scp: the elements to draw
+        :type scp: SpillContainerPairData, as from the cache
+
+        :returns: the time stamp of the frame
+        """
         self.clear_foreground()
 
         if self.draw_back_to_fore:
             self.copy_back_to_fore()
 
         # draw prop for self.draw_ontop second so it draws on top
-        scp = self.cache.load_timestep(step_num).items()
+        scp = scp.items()
         if len(scp) == 1:
             self.draw_elements(scp[0])
         else:
@@ -608,23 +692,89 @@ class Renderer(Outputter, MapCanvas):
         self.draw_timestamp(time_stamp)
         self.draw_props(time_stamp)
 
-        for ftype in self.formats:
-            if ftype == 'gif':
+        return time_stamp
+
+    def render_frames(self):
+        """
+        Draws and saves the frames that write_output() put off, when
+        render_post_run is True. Called by post_model_run().
+
+        The frames are drawn by a pool of num_workers processes, each with
+        its own copy of the background image. The element data for each
+        frame is read from the cache, and the workers save the image files.
+        The frames for the animated gif are sent back, and added to it in
+        order.
+        """
+        frames, self._frames = self._frames, []
+
+        if len(frames) == 0:
+            return
+
+        state = {'image_size': self.image_size,
+                 'projection': self.projection,
+                 'viewport': self.viewport,
+                 'palette': [(name, self.back_image.get_colors()[name])
+                             for name in self.back_image.get_color_names()],
+                 'background': self.back_asarray(),
+                 'draw_back_to_fore': self.draw_back_to_fore,
+                 'draw_ontop': self.draw_ontop,
+                 'timestamp_attribs': self.timestamp_attribs,
+                 'props': self.props,
+                 'formats': self.formats,
+                 }
+
+        jobs = ((image_filename,
+                 self._frame_data(self.cache.load_timestep(step_num)))
+                for step_num, image_filename in frames)
+
+        num_workers = (os.cpu_count() if self.num_workers is None
+                       else self.num_workers)
+
+        if num_workers == 1:
+            _init_frame_worker(state)
+            self._add_frames(_render_frame(job) for job in jobs)
+        else:
+            with ProcessPoolExecutor(num_workers,
+                                     initializer=_init_frame_worker,
+                                     initargs=(state,)) as pool:
+                self._add_frames(_ordered_results(pool, _render_frame, jobs,
+                                                  num_workers * 2))
+
+    def _add_frames(self, results):
+        'add the frames drawn by render_frames to the animation, in order'
+        for image_filename, frame in results:
+            if frame is not None:
+                self.fore_image.set_data(frame)
                 self.animation.add_frame(self.fore_image, self.delay)
-            else:
-                image_filename += ftype
-                self.save_foreground(image_filename, file_type=ftype)
 
-        self.last_filename = image_filename
+            self.last_filename = image_filename
 
-        return {'image_filename': image_filename,
-                'time_stamp': time_stamp}
+    @staticmethod
+    def _frame_data(scp):
+        """
+        just the data draw_frame needs from a SpillContainerPairData, to
+        send to a worker process
+        """
+        scs = []
+        for sc in scp.items():
+            data = SpillContainerData({name: np.asarray(sc[name])
+                                       for name in ('positions',
+                                                    'status_codes')
+                                       if name in sc},
+                                      uncertain=sc.uncertain)
+            data.current_time_stamp = sc.current_time_stamp
+            scs.append(data)
+
+        return SpillContainerPairData(*scs)
 
     def post_model_run(self):
         """
         Override this method if a derived class needs to perform
         any actions after a model run is complete (StopIteration triggered)
         """
+        if self.render_post_run:
+            self.render_frames()
+
         if 'gif' in self.formats:
             self.animation.close_anim()
 
@@ -667,6 +817,85 @@ class Renderer(Outputter, MapCanvas):
         return dict_
 
 
+class _FrameCanvas(MapCanvas):
+    """
+    Draws the frames for a Renderer.render_frames() in a worker process,
+    with the Renderer's drawing code, palette and background image.
+    """
+    draw_frame = Renderer.draw_frame
+    draw_elements = Renderer.draw_elements
+    draw_timestamp = Renderer.draw_timestamp
+    draw_props = Renderer.draw_props
+
+    def __init__(self, state):
+        MapCanvas.__init__(self, state['image_size'],
+                           projection=state['projection'],
+                           viewport=state['viewport'],
+                           preset_colors=None)
+
+        # same colors in the same order, so the same color indexes
+        self.add_colors(state['palette'])
+        self.back_image.set_data(state['background'])
+
+        self.draw_back_to_fore = state['draw_back_to_fore']
+        self.draw_ontop = state['draw_ontop']
+        self.timestamp_attribs = state['timestamp_attribs']
+        self.props = state['props']
+        self.formats = state['formats']
+
+
+# the _FrameCanvas of a worker process
+_frame_canvas = None
+
+
+def _init_frame_worker(state):
+    global _frame_canvas
+    _frame_canvas = _FrameCanvas(state)
+
+
+def _render_frame(job):
+    """
+    Draw one frame, and save it in all the formats but gif
+
+    :param job: (image_filename, SpillContainerPairData)
+
+    :returns: (image_filename, frame) where frame is the image as an array,
+              for the animated gif, or None if there isn't one
+    """
+    image_filename, scp = job
+
+    _frame_canvas.draw_frame(scp)
+
+    frame = None
+    for ftype in _frame_canvas.formats:
+        if ftype == 'gif':
+            frame = _frame_canvas.fore_asarray()
+        else:
+            image_filename += ftype
+            _frame_canvas.save_foreground(image_filename, file_type=ftype)
+
+    return image_filename, frame
+
+
+def _ordered_results(pool, func, jobs, max_pending):
+    """
+    The results of func(job) for each of jobs, run in the pool, in order.
+
+    Unlike pool.map(), at most max_pending jobs are submitted at a time,
+    so the jobs are only read from the cache as they are needed.
+    """
+    pending = deque()
+
+    for job in jobs:
+        pending.append(pool.submit(func, job))
+
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
 class GridVisLayer(object):
     def __init__(self, grid, projection, on=True,
                  color='grid_1', width=1):
@@ -739,6 +739,7 @@ class SpatialRelease(Release):
         self._mass_per_le = 0
         self._release_ts = None
         self._tris = None
+        self._tri_coords = None
         self._weights = None
         #self._pos_ts = None
 
@@ -799,6 +800,8 @@ class SpatialRelease(Release):
         else:
             weights = self.weights
         self._tris, self._weights = self.get_polys_as_tris(self.polygons, weights)
+        #vertices of the triangles, so LEs can be placed all at once
+        self._tri_coords = geo_routines.tris_to_array(self._tris)
 
         self._prepared = True
 
@@ -811,10 +814,10 @@ class SpatialRelease(Release):
         """
 
         sl = slice(-to_rel, None, 1)
-        pts = [geo_routines.random_pt_in_tri(s) for s in np.random.choice(self._tris, to_rel, p=self._weights)]
-        pts = [np.append(pt, 0) for pt in pts] #add Z coordinate
-        
-        data['positions'][sl] = pts
+        data['positions'][sl, :2] = geo_routines.random_pts_in_tris(self._tri_coords,
+                                                                    to_rel,
+                                                                    self._weights)
+        data['positions'][sl, 2] = 0
 
         data['mass'][sl] = self._mass_per_le
         data['init_mass'][sl] = self._mass_per_le
@@ -46,6 +46,11 @@ class FateDataView(AddLogger):
                'disperse', 'non_weather', 'all')
 
     def __init__(self):
+        # if shared, the view of a fate is kept open after update_sc(), so
+        # the next weatherer can use it as is, and the changes are written
+        # to the SC arrays by flush()
+        self.shared = False
+
         self.reset()
         # self.substance_id = substance_id
 
@@ -56,6 +61,32 @@ class FateDataView(AddLogger):
         # properties of old LEs and properties of newly released LEs
         self.all = {}
 
+        # for the fates whose data are slices of the SC arrays:
+        # fate_status: (slice, dict of the views handed out)
+        self._slices = {}
+
+        # the (fate_status, fate_mask) of the view kept open, if shared
+        self._open = None
+
+    @staticmethod
+    def _get_fate_slice(fate_mask):
+        '''
+        If the elements in fate_mask are all next to each other, return the
+        slice of the SC arrays that holds them, else None
+        '''
+        start = np.argmax(fate_mask)
+
+        if not fate_mask[start]:
+            # no elements
+            return slice(0, 0)
+
+        stop = len(fate_mask) - np.argmax(fate_mask[::-1])
+
+        if np.all(fate_mask[start:stop]):
+            return slice(start, stop)
+        else:
+            return None
+
     def _get_fate_mask(self, sc, fate):
         '''
         get fate_status mask over SC - only include LEs with 'mass' > 0.0
@@ -82,9 +113,23 @@ class FateDataView(AddLogger):
         #     fate_mask = np.logical_and(sc['substance'] == self.substance_id,
         #                                fate_mask)
 
+        self._slices.pop(fate_status, None)
+
         if np.all(fate_mask):
             # no need to make a copy of array
             setattr(self, fate_status, sc._data_arrays)
+            return
+
+        fate_slice = self._get_fate_slice(fate_mask)
+
+        if fate_slice is not None:
+            # the elements are all together (the SC may be partitioned by
+            # fate) -- views of the SC arrays, rather than copies
+            names = [sc._array_name(at) for at in array_types]
+            views = dict((name, sc[name][fate_slice]) for name in names)
+
+            self._slices[fate_status] = (fate_slice, dict(views))
+            setattr(self, fate_status, views)
         else:
             dict_to_update = getattr(self, fate_status)
             for at in array_types:
@@ -102,13 +147,79 @@ class FateDataView(AddLogger):
 
         Options are: 'all', 'surface_weather', 'subsurf_weather', 'skim', 'non_weather',
         'burn'
+
+        If shared, the view that is open for the fate_status is handed out
+        again, with any arrays it doesn't have yet added to it. The view of
+        another fate is flushed first.
         '''
-        self._set_data(sc,
-                       array_types,
-                       self._get_fate_mask(sc, fate_status),
-                       fate_status)
+        if self._open is not None:
+            if self._open[0] == fate_status:
+                return self._add_arrays(sc, array_types, *self._open)
+
+            self.flush(sc)
+
+        fate_mask = self._get_fate_mask(sc, fate_status)
+        self._set_data(sc, array_types, fate_mask, fate_status)
+
+        if self.shared:
+            self._open = (fate_status, fate_mask)
+
         return getattr(self, fate_status)
 
+    def _add_arrays(self, sc, array_types, fate_status, fate_mask):
+        '''
+        Add the arrays in array_types that the open view doesn't have -- the
+        ones it has may have been changed by a weatherer already.
+        '''
+        data = getattr(self, fate_status)
+
+        if data is sc._data_arrays:
+            return data
+
+        names = [sc._array_name(at) for at in array_types]
+        names = [name for name in names if name not in data]
+
+        if fate_status in self._slices:
+            fate_slice, views = self._slices[fate_status]
+
+            for name in names:
+                data[name] = views[name] = sc[name][fate_slice]
+        else:
+            for name in names:
+                data[name] = sc[name][fate_mask]
+
+        return data
+
+    @staticmethod
+    def _still_selected(data, fate_status):
+        '''
+        True if all the elements in data would still be selected for the
+        fate_status -- if so, an open view can be handed out again.
+        '''
+        if 'mass' in data and not np.all(data['mass'] > 0.0):
+            return False
+
+        if fate_status != 'all' and 'fate_status' in data:
+            fate = getattr(bt_fate, fate_status)
+
+            if not np.all(data['fate_status'] & fate == fate):
+                return False
+
+        return True
+
+    def flush(self, sc):
+        '''
+        Write the changes in the open view to the SC arrays, and close it
+        '''
+        if self._open is None:
+            return
+
+        fate_status = self._open[0]
+        self._open = None
+
+        self.update_sc(sc, fate_status)
+        self.reset()
+
     def update_sc(self, sc, fate_status='surface_weather'):
         '''
         update SC arrays with FateDataView arrays for specified fate
@@ -124,15 +235,37 @@ class FateDataView(AddLogger):
                   again - the assumption is that the fate_mask should be the
                   same between getting the data and resync'ing the original arrays
                   in the SC
+
+        If shared, the changes are left in the open view, unless the
+        weatherer took elements out of the fate (changed their fate_status
+        or removed all their mass).
         '''
         d_to_sync = getattr(self, fate_status)
 
+        if self._open is not None and self._open[0] == fate_status:
+            if self._still_selected(d_to_sync, fate_status):
+                return
+
+            self.flush(sc)
+            return
+
         if d_to_sync is sc._data_arrays:
             self.reset()
             #for fs in self._dicts_:
             #    self._set_data( sc, getattr(self, fs).keys(), self._get_fate_mask(sc, fs), fs)
             return
 
+        if fate_status in self._slices:
+            # views of the SC arrays -- only the arrays a weatherer replaced
+            # need to be copied back
+            fate_slice, views = self._slices[fate_status]
+
+            for key, val in d_to_sync.items():
+                if val is not views.get(key):
+                    sc[key][fate_slice] = val
+
+            return
+
         w_mask = self._get_fate_mask(sc, fate_status)
 
         # if 'substance' in sc:
@@ -292,14 +425,15 @@ class SpillContainerData(object):
         val_is_dict = []
         for key, val in self.__dict__.items():
             'compare dict not including _data_arrays'
-            if isinstance(val, dict):
-                val_is_dict.append(key)
-            elif key == '_substances_spills' or key == '_fate_data_view':
+            if key in ('_substances_spills', '_fate_data_view',
+                       '_buffers', '_views'):
                 '''
                 this is just another view of the data - no need to write extra
                 code to check equality for this
                 '''
                 pass
+            elif isinstance(val, dict):
+                val_is_dict.append(key)
             elif val != other.__dict__[key]:
                 return False
 
@@ -382,6 +516,14 @@ class SpillContainer(AddLogger, SpillContainerData):
     positions = spill_container['positions'] : returns a (num_LEs, 3) array of
     world_point_types
     """
+    # the number of elements there is room for when the storage for the data
+    # arrays is first allocated
+    _min_capacity = 256
+
+    # when removing more elements than this, compact the data arrays with
+    # one fancy-indexing copy instead of moving each block of elements
+    _max_block_moves = 1000
+
     def __init__(self, uncertain=False):
         super(SpillContainer, self).__init__(uncertain=uncertain)
         self.spills = OrderedCollection(dtype=gnome.spill.spill.Spill)
@@ -398,6 +540,11 @@ class SpillContainer(AddLogger, SpillContainerData):
         self._array_types = {}
         self._data_arrays = {}
 
+        # storage for the data arrays, with room to append elements --
+        # _data_arrays[name] is a view of the first len(self) rows of
+        # _buffers[name], as long as it is _views[name]
+        self._buffers = {}
+        self._views = {}
 
     def _reset__substances_spills(self):
         ## Most of this not needed
@@ -576,6 +723,37 @@ class SpillContainer(AddLogger, SpillContainerData):
         else:
             return at.name
 
+    def _storage(self, name, num_needed):
+        '''
+        the storage for data array 'name', with room for at least num_needed
+        elements. The data array is copied to the front of it.
+
+        The storage grows by doubling, so appending elements every step only
+        copies the data every now and then. A data array that has been
+        replaced since its view was handed out (by __setitem__,
+        split_element, loading a save file...) is copied into new storage.
+        '''
+        data = self._data_arrays[name]
+        buf = self._buffers.get(name)
+
+        if (data is self._views.get(name) and data.base is buf and
+                len(buf) >= num_needed):
+            return buf
+
+        old_capacity = len(data) if buf is None else len(buf)
+        capacity = max(self._min_capacity, num_needed, 2 * old_capacity)
+
+        buf = np.empty((capacity,) + data.shape[1:], dtype=data.dtype)
+        buf[:len(data)] = data
+        self._buffers[name] = buf
+
+        return buf
+
+    def _set_view(self, name, num_elements):
+        view = self._buffers[name][:num_elements]
+
+        self._data_arrays[name] = self._views[name] = view
+
     def _append_data_arrays(self, num_released):
         """
         initialize data arrays once spill has spawned particles
@@ -600,7 +778,12 @@ class SpillContainer(AddLogger, SpillContainerData):
                                             initial_value=tuple([0] * self._oil_comp_array_len))
             else:
                 a_append = atype.initialize(num_released)
-            self._data_arrays[name] = np.r_[self._data_arrays[name], a_append]
+
+            num = len(self._data_arrays[name])
+            buf = self._storage(name, num + num_released)
+
+            buf[num:num + num_released] = a_append
+            self._set_view(name, num + num_released)
 
     # def _set_substance_array(self, subs_idx, num_rel_by_substance):
     #     '''
@@ -691,6 +874,27 @@ class SpillContainer(AddLogger, SpillContainerData):
         #     for view in self._fate_data_list:
         #         view.update_sc(self, fate)
 
+    def share_fatedataview(self, share=True):
+        '''
+        Turn sharing of the fate view between weatherers on or off. While
+        it is on, update_from_fatedataview() may leave the changes in the
+        view -- the data arrays are only up to date after
+        flush_fatedataview(). Turning it off flushes the view.
+
+        The model shares the view between the weatherers that only get at
+        the data through itersubstancedata()
+        '''
+        self._fate_data_view.shared = share
+
+        if not share:
+            self.flush_fatedataview()
+
+    def flush_fatedataview(self):
+        '''
+        write the changes in a shared fate view to the data arrays
+        '''
+        self._fate_data_view.flush(self)
+
     def get_substances(self, complete=True):
         ##fixme: remove this method??
         """
@@ -988,11 +1192,79 @@ class SpillContainer(AddLogger, SpillContainerData):
                                  oil_status.to_be_removed)[0]
 
         if len(to_be_removed) > 0:
-            for key in self._array_types:
-                self._data_arrays[key] = np.delete(self[key], to_be_removed,
-                                                   axis=0)
+            # compact the storage in place, keeping the order of the elements
+            # that are left. Only the ones after the first removed element
+            # need to move.
+            num = len(self)
+            num_kept = num - len(to_be_removed)
+            first = to_be_removed[0]
+
+            if len(to_be_removed) <= self._max_block_moves:
+                # shift each block of kept elements down over the gaps
+                starts = to_be_removed + 1
+                ends = np.append(to_be_removed[1:], num)
+                dests = starts - np.arange(1, len(starts) + 1)
+                blocks = [(s, e, d)
+                          for s, e, d in zip(starts, ends, dests) if e > s]
+
+                for key in self._array_types:
+                    buf = self._storage(key, num)
+
+                    for start, end, dest in blocks:
+                        buf[dest:dest + end - start] = buf[start:end]
+
+                    self._set_view(key, num_kept)
+            else:
+                keep = np.ones((num,), dtype=bool)
+                keep[to_be_removed] = False
+                keep_ix = np.flatnonzero(keep[first:]) + first
+
+                for key in self._array_types:
+                    buf = self._storage(key, num)
+
+                    # take() buffers the output, so it can overlap the input
+                    np.take(buf[:num], keep_ix, axis=0,
+                            out=buf[first:num_kept])
+                    self._set_view(key, num_kept)
+
             self._fate_data_view.reset()
 
+    def partition_by_fate(self):
+        '''
+        Reorder the elements so the ones with the same fate_status are
+        together, with the ones with no mass left at the end.
+
+        Then the elements for each fate are a contiguous range of the data
+        arrays, and the FateDataView gives the weatherers views of the
+        arrays, rather than copies that have to be copied back.
+
+        Does nothing if the elements are already in order, so it is cheap to
+        call every time the fate_status may have changed.
+
+        .. note:: this changes the order of the elements in the data arrays,
+                  so nothing should rely on their index -- use 'id'.
+        '''
+        if 'fate_status' not in self._data_arrays or len(self) < 2:
+            return
+
+        key = self['fate_status'].astype(np.int16)
+        key[self['mass'] <= 0.0] += 256
+
+        if np.all(key[1:] >= key[:-1]):
+            return
+
+        num = len(self)
+        order = np.argsort(key, kind='stable')
+
+        for name in self._array_types:
+            buf = self._storage(name, num)
+
+            # take() buffers the output, so it can overlap the input
+            np.take(buf[:num], order, axis=0, out=buf[:num])
+            self._set_view(name, num)
+
+        self._fate_data_view.reset()
+
     def __str__(self):
         return ('gnome.spill_container.SpillContainer\n'
                 'spill LE attributes: {0}'
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+A background thread for writing output
+
+Used by the Model to write the cache and the outputters' output while it
+computes the next time step.
+
+Jobs are run one at a time, in the order they were submitted, so outputters
+see their calls in the same order they would if they were run
+synchronously.
+"""
+
+import threading
+import queue
+
+
+class BackgroundWriter(object):
+    """
+    Runs submitted jobs in order on a single worker thread.
+
+    The queue of pending jobs is bounded: submit() blocks when it is full,
+    so the thread doing the computing can't get more than max_pending jobs
+    ahead of the writing.
+
+    If a job raises an Exception, the rest of the pending jobs are dropped,
+    and the Exception is re-raised in the submitting thread the next time
+    submit(), check() or flush() is called.
+    """
+    def __init__(self, max_pending=2, name='gnome-background-writer'):
+        """
+        :param max_pending=2: the maximum number of jobs that can be waiting
+                              to be run before submit() blocks.
+        :param name: name of the worker thread
+        """
+        self.max_pending = max_pending
+        self.name = name
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._error = None
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+
+                if self._error is None:
+                    func, args, kwargs = job
+                    func(*args, **kwargs)
+            except Exception as excp:
+                self._error = excp
+            finally:
+                self._queue.task_done()
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def check(self):
+        """
+        Re-raise the Exception raised by a job, if there was one.
+
+        The error is cleared once it is raised.
+        """
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue up func(*args, **kwargs) to run on the worker thread.
+
+        Blocks if there are already max_pending jobs waiting.
+        """
+        self.check()
+        self._start()
+
+        self._queue.put((func, args, kwargs))
+
+    def flush(self):
+        """
+        Wait until all the submitted jobs have been run, then re-raise any
+        error from them.
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+        self.check()
+
+    def reset(self):
+        """
+        Wait for the submitted jobs to finish and throw away any error --
+        for rewinding.
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+        self._error = None
+
+    def stop(self):
+        'Flush the pending jobs and shut down the worker thread'
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+        self._thread = None
+        self.check()
@@ -72,6 +72,9 @@ class ElementCache(object):
           the _cache_dir at the whim of the GC.
           We may want to manage this differently.
     """
+    # name used to select this cache type (see cache_backends)
+    backend = 'npz'
+
     def __init__(self, cache_dir=None, enabled=True):
         """
         initialize a new cache object
@@ -249,3 +252,197 @@ class ElementCache(object):
         if os.path.isdir(self._cache_dir):
             shutil.rmtree(self._cache_dir)
         self.create_new_dir()
+
+
+class MemmapElementCache(ElementCache):
+    """
+    Cache for element data that stores each data array in its own
+    preallocated, memory-mapped file.
+
+    Every step's data is appended to the end of the file for each array, and
+    load_timestep() returns read-only views into the mapped files rather than
+    copies -- no per-step deepcopy, np.savez or np.load of the data.
+
+    The files grow by doubling their capacity when they fill up, so the cost
+    of growing is amortized over the run.
+
+    If the cache is not enabled, only the most recent step is kept: its data
+    is written to the start of each file, overwriting the previous step.
+    """
+    backend = 'memmap'
+
+    # number of elements initially allocated for each array file
+    initial_capacity = 1024
+
+    def create_new_dir(self, cache_dir=None):
+        # the array files live in the cache dir, so start over with new ones
+        self._reset_storage()
+        return super(MemmapElementCache, self).create_new_dir(cache_dir)
+
+    def _reset_storage(self):
+        '''
+        Drop all the memmaps and the index into them.
+
+        All of these are dicts keyed by the uncertain flag of the spill
+        container:
+
+        _stores: {array_name: memmap}
+        _next_row: {array_name: first unused row in the memmap}
+        _index: {step_num: (current_time_stamp,
+                            mass_balance,
+                            {array_name: (start_row, num_rows)})}
+        '''
+        self._stores = {False: {}, True: {}}
+        self._next_row = {False: {}, True: {}}
+        self._index = {False: {}, True: {}}
+
+    def _make_array_filename(self, array_name, uncertain=False):
+        'Returns the filename of the memmap file for an array'
+        if uncertain:
+            return os.path.join(self._cache_dir,
+                                '{0}_uncert.dat'.format(array_name))
+        else:
+            return os.path.join(self._cache_dir,
+                                '{0}.dat'.format(array_name))
+
+    def _get_store(self, array_name, array, num_rows, uncertain=False):
+        """
+        Returns the memmap for array_name, large enough to hold num_rows rows
+
+        The memmap is created on first use, and its capacity is doubled
+        (at least) when it needs to grow. Views into the old map remain valid.
+        """
+        stores = self._stores[uncertain]
+        store = stores.get(array_name)
+
+        if store is not None and len(store) >= num_rows:
+            return store
+
+        if store is None:
+            capacity = max(self.initial_capacity, num_rows)
+            mode = 'w+'
+        else:
+            capacity = max(2 * len(store), num_rows)
+            mode = 'r+'  # numpy extends the file to the new size
+            store.flush()
+
+        store = np.memmap(self._make_array_filename(array_name, uncertain),
+                          dtype=array.dtype,
+                          mode=mode,
+                          shape=(capacity,) + array.shape[1:])
+        stores[array_name] = store
+
+        return store
+
+    def _view(self, array_name, start, num_rows, uncertain=False):
+        'Returns a read-only view of the rows of an array for one step'
+        view = self._stores[uncertain][array_name][start:start + num_rows]
+        view = view.view(np.ndarray)
+        view.flags.writeable = False
+
+        return view
+
+    def save_timestep(self, step_num, spill_container_pair):
+        """
+        add a time step of data to the cache
+
+        :param step_num: the step number of the data
+        :param spill_container: the spill container at this step
+        """
+        for sc in spill_container_pair.items():
+            uncertain = sc.uncertain
+            next_row = self._next_row[uncertain]
+
+            if not self.enabled:
+                # only keep the current step -- reuse the start of the files
+                next_row.clear()
+                self._index[uncertain].clear()
+
+            data = {}
+            locations = {}
+            for name, array in sc.data_arrays.items():
+                start = next_row.get(name, 0)
+                num_rows = len(array)
+
+                store = self._get_store(name, array, start + num_rows,
+                                        uncertain)
+                store[start:start + num_rows] = array
+
+                next_row[name] = start + num_rows
+                locations[name] = (start, num_rows)
+                data[name] = self._view(name, start, num_rows, uncertain)
+
+            self._index[uncertain][step_num] = (sc.current_time_stamp,
+                                                dict(sc.mass_balance),
+                                                locations)
+
+            # note: this assumes that the certain SC will be first!
+            if uncertain:
+                self.recent[step_num][1] = data
+            else:
+                # this creates a new dict, so only one step is saved
+                self.recent = {step_num: [data, None]}
+
+    def _load_data(self, step_num, uncertain=False):
+        'Returns a dict of read-only views of the arrays for a step'
+        locations = self._index[uncertain][step_num][2]
+
+        return {name: self._view(name, start, num_rows, uncertain)
+                for name, (start, num_rows) in locations.items()}
+
+    def _make_sc_data(self, step_num, data_arrays, uncertain=False):
+        'Wraps the arrays for a step in a SpillContainerData'
+        current_time_stamp, mass_balance, _locations = \
+            self._index[uncertain][step_num]
+
+        sc = SpillContainerData(data_arrays, uncertain=uncertain)
+        sc.mass_balance = dict(mass_balance)
+        if current_time_stamp:
+            sc.current_time_stamp = current_time_stamp
+
+        return sc
+
+    def load_timestep(self, step_num):
+        """
+        Returns a SpillContainerPairData with read-only views of the data
+        arrays cached in the memmaps
+
+        :param step_num: the step number you want to load.
+        """
+        if step_num not in self._index[False]:
+            raise CacheError('step: {0} is not in the cache'
+                             .format(step_num))
+
+        try:
+            # shallow copies, so arrays added to the recent data -- for
+            # instance 'surface_concentration' -- are included
+            data_arrays, u_data_arrays = self.recent[step_num]
+            data_arrays = dict(data_arrays)
+            if u_data_arrays is not None:
+                u_data_arrays = dict(u_data_arrays)
+        except KeyError:
+            data_arrays = self._load_data(step_num)
+            if step_num in self._index[True]:
+                u_data_arrays = self._load_data(step_num, True)
+            else:
+                u_data_arrays = None
+
+        sc = self._make_sc_data(step_num, data_arrays)
+
+        if u_data_arrays is None:
+            u_sc = None
+        else:
+            u_sc = self._make_sc_data(step_num, u_data_arrays, True)
+
+        return SpillContainerPairData(sc, u_sc)
+
+    def rewind(self):
+        'Rewinds the cache -- clearing out everything'
+        # let go of the memmaps before the files are removed
+        self._reset_storage()
+        super(MemmapElementCache, self).rewind()
+
+
+# the available cache backends, by name
+cache_backends = {ElementCache.backend: ElementCache,
+                  MemmapElementCache.backend: MemmapElementCache}
@@ -0,0 +1,201 @@
+"""
+An on-disk cache: a directory of entries, keyed by a hash of what they were
+built from
+
+This is the base of the caches of things that are slow to build and the
+same every time for the same input, like the land-water rasters of the maps
+(gnome.maps.raster_cache) and the topology of gridded data
+(gnome.movers.topology_cache). Entries can be shared between runs (and
+processes). When a cache gets bigger than its max_size, the least recently
+used entries are removed.
+"""
+
+import os
+import shutil
+import hashlib
+
+import numpy as np
+
+
+def file_hash(filename, blocksize=1024 * 1024):
+    """
+    The sha1 hash of the contents of a file, as a hex string
+    """
+    sha = hashlib.sha1()
+
+    with open(filename, 'rb') as infile:
+        for block in iter(lambda: infile.read(blocksize), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+class DiskCache(object):
+    """
+    A directory of entries, keyed by a hash
+
+    Subclasses add the get() and put() for what they keep. An entry is a file
+    or a directory named key + _suffix.
+    """
+    # bump in a subclass if the format of its entries changes
+    cache_version = 1
+
+    _suffix = ''
+
+    def __init__(self, cache_dir, max_size):
+        """
+        :param cache_dir: directory to keep the cache in. It is created if it
+                          doesn't exist.
+        :param max_size: the maximum total size of the entries, in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    def __repr__(self):
+        return ('{0.__class__.__name__}({0.cache_dir!r}, '
+                'max_size={0.max_size})'.format(self))
+
+    @classmethod
+    def make_key(cls, *parts):
+        """
+        make a key from the things an entry depends on
+
+        :param parts: anything with a repr that identifies it -- numpy arrays
+                      are converted to lists first.
+        """
+        parts = [p.tolist() if isinstance(p, np.ndarray) else p
+                 for p in (cls.cache_version,) + parts]
+
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key + self._suffix)
+
+    def _touch(self, key):
+        """
+        mark an entry as recently used
+
+        :returns: False if it isn't there
+        """
+        try:
+            os.utime(self._entry_path(key), None)
+        except OSError:
+            return False
+
+        return True
+
+    def _entry_size(self, key):
+        path = self._entry_path(key)
+
+        if os.path.isdir(path):
+            return sum(os.path.getsize(os.path.join(path, f))
+                       for f in os.listdir(path))
+
+        return os.path.getsize(path)
+
+    def _entries(self):
+        """
+        list of (last used time, size, key) for all the entries
+        """
+        entries = []
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self._suffix):
+                continue
+
+            # skips temp files, and anything else in the directory
+            key = name[:len(name) - len(self._suffix)]
+            if not key or '.' in key:
+                continue
+
+            try:
+                entries.append((os.path.getmtime(self._entry_path(key)),
+                                self._entry_size(key),
+                                key))
+            except OSError:
+                # removed while we were looking
+                pass
+
+        return entries
+
+    @property
+    def size(self):
+        'total size of the entries in bytes'
+        return sum(e[1] for e in self._entries())
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used entries until the cache is no bigger
+        than max_size
+
+        :param keep=None: key of an entry not to remove
+        """
+        entries = sorted(self._entries())
+        total = sum(e[1] for e in entries)
+
+        for _used, size, key in entries:
+            if total <= self.max_size:
+                break
+
+            if key != keep:
+                self.remove(key)
+                total -= size
+
+    def remove(self, key):
+        'remove an entry, if it is there'
+        path = self._entry_path(key)
+
+        if os.path.isdir(path):
+            shutil.rmtree(path, True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        'remove all the entries'
+        for _used, _size, key in self._entries():
+            self.remove(key)
+
+
+class DefaultCache(object):
+    """
+    The cache a module uses by default: off unless it is set, or the
+    environment variable is set to a directory
+    """
+    def __init__(self, cache_class, env_var, max_size):
+        """
+        :param cache_class: the DiskCache subclass
+        :param env_var: environment variable with the directory to use
+        :param max_size: default maximum size of the cache, in bytes
+        """
+        self.cache_class = cache_class
+        self.max_size = max_size
+        self.cache = None
+
+        if os.environ.get(env_var):
+            self.set(os.environ[env_var])
+
+    def set(self, cache_dir, max_size=None):
+        """
+        :param cache_dir: directory for the cache. None turns the cache off.
+        :param max_size=None: the maximum total size of the cache, in bytes.
+                              Defaults to the max_size this was made with.
+
+        :returns: the cache, or None
+        """
+        if cache_dir is None:
+            self.cache = None
+        else:
+            self.cache = self.cache_class(cache_dir,
+                                          max_size or self.max_size)
+
+        return self.cache
+
+    def get(self):
+        'the cache -- None if it is off'
+        return self.cache
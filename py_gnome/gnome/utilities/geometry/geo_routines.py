@@ -105,6 +105,38 @@ def random_pt_in_tri(tri):
     RPP = A + R*AB + S*AC
     return RPP
 
+def tris_to_array(tris):
+    '''
+    :param tris: iterable of shapely.Polygon triangles
+    :return: (N, 3, 2) array of the vertices of the triangles
+    '''
+    coords = [np.array(t.exterior.coords)[:3, :2] for t in tris]
+    return np.array(coords, dtype=np.float64).reshape((-1, 3, 2))
+
+#tris is a (N, 3, 2) array of triangle vertices, as from tris_to_array
+#returns a (num, 2) array of 2D coordinates
+def random_pts_in_tris(tris, num, weights=None):
+    '''
+    num random points, each in a triangle picked at random (with
+    probability weights, if provided). Same as random_pt_in_tri, but for
+    all the points at once.
+
+    :param tris: (N, 3, 2) array of triangle vertices
+    :param num: number of points
+    :param weights: probability of picking each triangle. Must sum to 1.
+    :return: (num, 2) array of points
+    '''
+    idx = np.random.choice(len(tris), num, p=weights)
+    R = np.random.random(num)
+    S = np.random.random(num)
+    flip = R + S >= 1
+    R[flip] = 1 - R[flip]
+    S[flip] = 1 - S[flip]
+    A = tris[idx, 0]
+    AB = tris[idx, 1] - A
+    AC = tris[idx, 2] - A
+    return A + R[:, None] * AB + S[:, None] * AC
+
 def get_shapefile_args(filename):
     """
     :param filename: string path of a zipped shapefile
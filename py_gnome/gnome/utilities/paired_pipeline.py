@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+
+"""
+Running the same steps on the forecast and the uncertainty spill containers
+at the same time
+
+Used by the Model when parallel_uncertain is on. Each container has a
+list of tasks: (resources, func), where func() does one step for that
+container, and resources are the shared things it uses -- a mover,
+a weatherer, or the global random number generators (RANDOM).
+
+The forecast tasks are run in the calling thread, and the uncertainty tasks
+in a second thread. An uncertainty task is not started until the forecast
+tasks have finished with all the resources it uses, so every shared thing
+sees the two containers in the same order as when they are run one after
+the other, and the results are exactly the same. Anything a task changes
+that is not its own container has to be in its resources.
+"""
+
+import threading
+
+
+# for the tasks that draw from the global random number generators
+# (numpy's, and the C++ one): the numbers each container gets depend on
+# how many the other one has drawn.
+RANDOM = 'random numbers'
+
+
+class _Progress(object):
+    """
+    How far the first list of tasks has got
+    """
+    def __init__(self):
+        self.num_done = 0
+        self.failed = False
+        self.condition = threading.Condition()
+
+    def task_done(self):
+        with self.condition:
+            self.num_done += 1
+            self.condition.notify_all()
+
+    def fail(self):
+        with self.condition:
+            self.failed = True
+            self.condition.notify_all()
+
+    def wait_for(self, num_done):
+        """
+        Wait until at least num_done tasks are done
+
+        :returns: False if the first tasks failed.
+        """
+        with self.condition:
+            while self.num_done < num_done and not self.failed:
+                self.condition.wait()
+
+            return not self.failed
+
+
+def run_tasks(tasks):
+    'run a list of (resources, func) one after the other'
+    for _resources, func in tasks:
+        func()
+
+
+def run_paired(first, second):
+    """
+    Run two lists of tasks at the same time
+
+    :param first: list of (resources, func) for the forecast container
+    :param second: list of (resources, func) for the uncertainty container
+
+    The result is the same as run_tasks(first) then run_tasks(second).
+    If a task raises an Exception, the tasks after it in that list are not
+    run (nor, if it is in first, are the tasks in second that have to wait
+    for it), and the Exception is re-raised once both lists have stopped.
+    """
+    if len(second) == 0:
+        run_tasks(first)
+        return
+
+    # the index (+1) of the last task in first to use each resource
+    last_use = {}
+    for i, (resources, _func) in enumerate(first):
+        for r in resources:
+            last_use[id(r)] = i + 1
+
+    progress = _Progress()
+    errors = []
+
+    def run_second():
+        try:
+            for resources, func in second:
+                wait_for = max([last_use.get(id(r), 0) for r in resources] +
+                               [0])
+
+                if not progress.wait_for(wait_for):
+                    return
+
+                func()
+        except Exception as excp:
+            errors.append(excp)
+
+    thread = threading.Thread(target=run_second, name='gnome-uncertain')
+    thread.daemon = True
+    thread.start()
+
+    try:
+        for _resources, func in first:
+            func()
+            progress.task_done()
+    except Exception:
+        progress.fail()
+        thread.join()
+        raise
+
+    thread.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+
+"""
+Reading time slices of gridded data ahead of when they are needed
+
+Used by the Model (when prefetch_slices is set) to read the next time
+slices of the gridded environment objects on a background thread, while it
+computes the current time step. Each slice is read once, into a bounded
+buffer, and handed over when the environment object asks for it.
+
+The netCDF4 / HDF5 libraries are not thread safe, so while there is a
+background thread that may read or write netCDF files -- a SlicePrefetcher,
+the Model's output writer, or the uncertain spill container's thread when
+parallel_uncertain is on -- every read and write is done holding
+netcdf_lock. With no background thread, it doesn't lock anything. The
+gridded environment objects hold it only while they read a slice of data
+(see TimeSliceCache.reading()), not while they interpolate, and the
+NetCDFOutput while it writes. netCDF files read some other way while a
+model runs with a background thread are not safe.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+class NetCDFLock(object):
+    """
+    The lock for accessing netCDF files from more than one thread
+
+    held() is the context for one read or write of a netCDF file. It only
+    locks while there are users: the threads that may access netCDF files
+    at the same time as the main thread, registered with start() and
+    stop(), or in_use(). A user waits to start until the reads being made
+    without the lock are done -- so don't start() from inside held().
+
+    The lock is reentrant, and wait_for() lets go of it while waiting, so a
+    thread waiting for a prefetched slice doesn't keep the prefetching
+    thread from reading it.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.RLock())
+
+        self._users = 0
+        # reads being made without the lock
+        self._unlocked = 0
+
+    @property
+    def users(self):
+        'number of threads registered'
+        return self._users
+
+    def start(self):
+        'register a thread that may access netCDF files'
+        with self._condition:
+            self._condition.wait_for(lambda: self._unlocked == 0)
+            self._users += 1
+
+    def stop(self):
+        'the thread registered by start() is done'
+        with self._condition:
+            self._users = max(self._users - 1, 0)
+
+    @contextmanager
+    def in_use(self):
+        'context for a thread that may access netCDF files'
+        self.start()
+        try:
+            yield
+        finally:
+            self.stop()
+
+    @contextmanager
+    def held(self):
+        'context for reading or writing a netCDF file'
+        with self._condition:
+            locked = self._users > 0
+            if not locked:
+                self._unlocked += 1
+
+        if locked:
+            with self._condition:
+                yield
+        else:
+            try:
+                yield
+            finally:
+                with self._condition:
+                    self._unlocked -= 1
+                    self._condition.notify_all()
+
+    def wait_for(self, predicate):
+        'wait until predicate() is True, letting go of the lock meanwhile'
+        with self._condition:
+            self._condition.wait_for(predicate)
+
+    def notify(self, _future=None):
+        """
+        wake up the threads in wait_for() -- can be used as the done
+        callback of a Future
+        """
+        with self._condition:
+            self._condition.notify_all()
+
+
+# held for every access to a netCDF file that could be made at the same
+# time as one on another thread
+netcdf_lock = NetCDFLock()
+
+
+class SlicePrefetcher(object):
+    """
+    Reads data[t] for the (data, t) pairs it is asked to prefetch on a
+    worker thread, and keeps them until read() asks for them.
+
+    Keeps counts of the reads that were prefetched (hits), the ones that
+    weren't (misses), and the time spent waiting for prefetched slices
+    that weren't done being read yet.
+    """
+    def __init__(self, max_buffered=8, name='gnome-prefetch'):
+        """
+        :param max_buffered=8: the most slices kept waiting to be read. The
+                               oldest is dropped to make room for a new one.
+        :param name: name of the worker thread
+        """
+        self.max_buffered = max_buffered
+        self.name = name
+
+        self._executor = None
+
+        # (id(data), t): (data, future)
+        self._buffer = OrderedDict()
+        # the slices asked for already, so they aren't read again after
+        # they've been handed over
+        self._seen = OrderedDict()
+
+        self.reset_stats()
+
+    @property
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'wait_time': self.wait_time,
+                'buffered': len(self._buffer)}
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.wait_time = 0.0
+
+    def _read(self, data, t):
+        with netcdf_lock.held():
+            return data[t]
+
+    def _mark_seen(self, key):
+        self._seen[key] = None
+        self._seen.move_to_end(key)
+
+        while len(self._seen) > 4 * self.max_buffered:
+            self._seen.popitem(last=False)
+
+    def prefetch(self, data, t):
+        """
+        Start reading data[t] in the background, if it hasn't been asked
+        for already.
+        """
+        key = (id(data), t)
+        if key in self._seen:
+            return
+
+        self._mark_seen(key)
+
+        if self._executor is None:
+            netcdf_lock.start()
+            self._executor = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix=self.name)
+
+        future = self._executor.submit(self._read, data, t)
+        future.add_done_callback(netcdf_lock.notify)
+        self._buffer[key] = (data, future)
+
+        while len(self._buffer) > self.max_buffered:
+            _key, (_data, future) = self._buffer.popitem(last=False)
+            future.cancel()
+
+    def prefetched(self, data, t):
+        'whether data[t] has been prefetched, and not handed over yet'
+        _data, future = self._buffer.get((id(data), t), (None, None))
+
+        return _data is data and not future.cancelled()
+
+    def read(self, data, t):
+        """
+        Return data[t] -- the prefetched one if there is one.
+
+        An Exception raised reading it in the background is raised here.
+        """
+        key = (id(data), t)
+        _data, future = self._buffer.pop(key, (None, None))
+
+        if future is None or _data is not data or future.cancelled():
+            self.misses += 1
+            self._mark_seen(key)
+
+            return self._read(data, t)
+
+        if not future.done():
+            start = time.perf_counter()
+            # lets go of the lock while waiting -- the caller may be
+            # holding it
+            netcdf_lock.wait_for(future.done)
+            self.wait_time += time.perf_counter() - start
+
+        result = future.result()
+
+        self.hits += 1
+
+        return result
+
+    def reset(self):
+        """
+        Drop all the prefetched slices and zero the counters -- for
+        rewinding.
+        """
+        for _data, future in self._buffer.values():
+            future.cancel()
+
+        self._buffer.clear()
+        self._seen.clear()
+        self.reset_stats()
+
+    def shutdown(self):
+        """
+        Drop the prefetched slices and shut down the worker thread, keeping
+        the counters -- for the end of a run. A new thread is started if
+        anything is prefetched again.
+        """
+        for _data, future in self._buffer.values():
+            future.cancel()
+
+        self._buffer.clear()
+        self._seen.clear()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            netcdf_lock.stop()
+
+    def stop(self):
+        'drop the prefetched slices and shut down the worker thread'
+        self.reset()
+        self.shutdown()
@@ -11,6 +11,10 @@ from gnome.cy_gnome import cy_helpers
 import random
 
 
+# the seed of the per element random streams -- set by seed()
+_stream_seed = 1
+
+
 def random_with_persistance(
     low,
     high,
@@ -118,12 +122,64 @@ def random_with_persistance(
 
 def seed(seed=1):
     """
-    Set the C++, the python and the numpy random seed to desired value
+    Set the C++, the python and the numpy random seed to desired value,
+    and the seed of the per element random streams.
 
     :param seed: Random number generator should be seeded by this value.
         Default is 1
     """
+    global _stream_seed
 
     cy_helpers.srand(seed)
+    cy_helpers.set_random_stream_seed(seed)
     random.seed(seed)
     np.random.seed(seed)
+
+    _stream_seed = seed
+
+
+def _mix_bits(z):
+    'the splitmix64 finalizer, on an array of uint64'
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+
+    return z ^ (z >> np.uint64(31))
+
+
+def stream_random(element_ids, spill_nums, step, stream=0, uncertain=False,
+                  draw=1):
+    """
+    Counter based random numbers in [0, 1): one for each element, from its
+    own stream, keyed by the seed, stream, spill, element id and step. The
+    same key and draw always give the same number, whatever order the
+    elements are in -- so the results don't depend on how many elements
+    there are, or which were removed.
+
+    These are the numbers the C++ random movers draw from a RandomStream
+    (lib_gnome/CompFunctions.cpp).
+
+    :param element_ids: the 'id' of each element
+    :param spill_nums: the 'spill_num' of each element
+    :param step: the time step -- the model time in seconds
+    :param stream=0: which stream -- so the users of random numbers each
+                     get different ones.
+    :param uncertain=False: True for the elements of the uncertain spill
+                            container.
+    :param draw=1: which number of the stream: the first, second...
+    """
+    element_ids = np.asarray(element_ids, dtype=np.uint64)
+    spill = (np.asarray(spill_nums, dtype=np.uint64) * np.uint64(2) +
+             np.uint64(bool(uncertain)))
+
+    with np.errstate(over='ignore'):
+        key = _mix_bits(np.full(element_ids.shape, _stream_seed,
+                                dtype=np.uint64))
+        key = _mix_bits(key ^ np.uint64(stream))
+        key = _mix_bits(key ^ spill)
+        key = _mix_bits(key ^ element_ids)
+        key = _mix_bits(key ^ np.uint64(step))
+
+        bits = _mix_bits(key + np.uint64(draw) *
+                         np.uint64(0x9e3779b97f4a7c15))
+
+    return (bits >> np.uint64(11)) * (1.0 / 9007199254740992.0)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+"""
+Passing numpy arrays between processes through shared memory
+
+Used by the ModelBroadcaster: pickling big arrays, sending them through a
+socket, and unpickling them on the other side copies them three times. The
+process sending a result instead writes its arrays into a block of shared
+memory, and sends the result with each array replaced by a small
+SharedArrayRef. The receiving process copies the arrays out of the shared
+memory.
+
+This works with a request-reply pattern: the sender re-uses its block of
+shared memory for every result, so the receiver has to be done with one
+result before it sends the next request.
+
+Example::
+
+    # in the process doing the work
+    sender = SharedArraySender()
+    socket.send(pickle.dumps(sender.pack(result)))
+
+    # in the process that asked for it
+    receiver = SharedArrayReceiver()
+    result = receiver.unpack(pickle.loads(socket.recv()))
+"""
+
+import os
+from collections import namedtuple
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+
+# what is sent in place of an array
+SharedArrayRef = namedtuple('SharedArrayRef',
+                            ['segment', 'offset', 'shape', 'dtype'])
+
+# the arrays in the shared memory start on multiples of this
+_alignment = 64
+
+
+def _aligned(nbytes):
+    return (nbytes + _alignment - 1) // _alignment * _alignment
+
+
+def start_resource_tracker():
+    """
+    Start the multiprocessing resource tracker, if it isn't running
+
+    Call this before starting the processes that will send arrays, so they
+    all use the same one. Otherwise a receiver that attaches to a sender's
+    shared memory registers it with its own tracker, which tries to remove
+    it again when the receiver exits.
+    """
+    if os.name == 'posix':
+        resource_tracker.ensure_running()
+
+
+def _walk(obj, func):
+    """
+    apply func to everything in obj that isn't a dict, list or tuple,
+    returning a copy of the containers
+    """
+    if type(obj) is dict:
+        return dict((k, _walk(v, func)) for k, v in obj.items())
+    elif type(obj) is list:
+        return [_walk(v, func) for v in obj]
+    elif type(obj) is tuple:
+        return tuple(_walk(v, func) for v in obj)
+    else:
+        return func(obj)
+
+
+class SharedArraySender(object):
+    """
+    Writes the arrays in results into a block of shared memory that it owns.
+
+    The block grows when a result needs more room. The old one is removed,
+    so receivers attach to the new one by name.
+    """
+    def __init__(self, min_nbytes=64 * 1024):
+        """
+        :param min_nbytes=64KB: arrays smaller than this are left in the
+                                result, to be pickled with it.
+        """
+        self.min_nbytes = min_nbytes
+
+        self._shm = None
+
+    def _sent_in_shm(self, obj):
+        return (isinstance(obj, np.ndarray) and
+                obj.nbytes >= self.min_nbytes and
+                not obj.dtype.hasobject)
+
+    def _reserve(self, nbytes):
+        if self._shm is None or self._shm.size < nbytes:
+            self.close()
+
+            # room to grow, so it isn't replaced every time
+            self._shm = shared_memory.SharedMemory(create=True,
+                                                   size=max(nbytes * 2,
+                                                            1024 * 1024))
+
+    def pack(self, result):
+        """
+        Copy the arrays in result into the shared memory
+
+        :param result: anything picklable. numpy arrays in it, or in the
+                       dicts, lists and tuples in it, are replaced.
+
+        :returns: a copy of result with SharedArrayRefs in place of the
+                  arrays
+        """
+        arrays = []
+
+        def find(obj):
+            if self._sent_in_shm(obj):
+                arrays.append(obj)
+            return obj
+
+        _walk(result, find)
+
+        if len(arrays) == 0:
+            return result
+
+        self._reserve(sum(_aligned(a.nbytes) for a in arrays))
+
+        state = {'offset': 0}
+
+        def replace(obj):
+            if not self._sent_in_shm(obj):
+                return obj
+
+            offset = state['offset']
+            dest = np.ndarray(obj.shape, dtype=obj.dtype,
+                              buffer=self._shm.buf, offset=offset)
+            dest[...] = obj
+            del dest
+
+            state['offset'] += _aligned(obj.nbytes)
+
+            return SharedArrayRef(self._shm.name, offset,
+                                  obj.shape, obj.dtype)
+
+        return _walk(result, replace)
+
+    def close(self):
+        'release and remove the block of shared memory'
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+class SharedArrayReceiver(object):
+    """
+    Reads the arrays sent by one SharedArraySender
+    """
+    def __init__(self):
+        self._shm = None
+
+    def _segment(self, name):
+        if self._shm is None or self._shm.name != name:
+            self.close()
+            self._shm = shared_memory.SharedMemory(name=name)
+
+        return self._shm
+
+    def unpack(self, result):
+        """
+        Replace the SharedArrayRefs in a packed result with copies of the
+        arrays
+        """
+        def replace(obj):
+            if not isinstance(obj, SharedArrayRef):
+                return obj
+
+            shm = self._segment(obj.segment)
+
+            return np.ndarray(obj.shape, dtype=obj.dtype,
+                              buffer=shm.buf, offset=obj.offset).copy()
+
+        return _walk(result, replace)
+
+    def close(self, unlink=False):
+        """
+        detach from the shared memory
+
+        :param unlink=False: also remove it -- for when the sender may have
+                             been stopped without removing it.
+        """
+        if self._shm is not None:
+            name = self._shm.name
+            self._shm.close()
+            self._shm = None
+
+            if unlink:
+                try:
+                    shm = shared_memory.SharedMemory(name=name)
+                except FileNotFoundError:
+                    return
+
+                shm.close()
+                shm.unlink()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+"""
+Filtering the elements in a spill container with a simple expression
+
+An expression is a set of conditions joined with '&&' (and) and '||' (or).
+'||' binds more tightly than '&&', so::
+
+    'age > 3600 && status_codes == 2 || status_codes == 3'
+
+means::
+
+    (age > 3600) and ((status_codes == 2) or (status_codes == 3))
+
+Each condition compares one data array to a number, with one of
+<, <=, >, >=, ==, !=. Columns of multi-dimensional arrays are picked out
+with an index::
+
+    'positions[2] > 10.0 && mass >= 0.1'
+
+The expression is parsed once, and evaluated as numpy boolean masks over the
+whole data arrays, so it works on anything that gives access to the arrays
+by name: a SpillContainer, or the SpillContainerData returned by
+ElementCache.load_timestep()
+"""
+
+import operator
+import re
+
+import numpy as np
+
+
+_operators = {'<': operator.lt,
+              '<=': operator.le,
+              '>': operator.gt,
+              '>=': operator.ge,
+              '==': operator.eq,
+              '!=': operator.ne,
+              }
+
+_condition_re = re.compile(r'^\s*(?P<name>\w+)\s*'
+                           r'(?:\[\s*(?P<column>-?\d+)\s*\])?\s*'
+                           r'(?P<op><=|>=|==|!=|<|>)\s*'
+                           r'(?P<value>\S+)\s*$')
+
+
+def _number(s):
+    try:
+        return int(s)
+    except ValueError:
+        return float(s)
+
+
+class SpillQuery(object):
+    """
+    A parsed query on the data arrays of a spill container
+
+    Example::
+
+        query = SpillQuery('status_codes == 2 && positions[2] > 0')
+        mask = query.mask(sc)
+        deep_mass = query.select(sc, ['id', 'mass'])
+    """
+    def __init__(self, conditions):
+        """
+        :param conditions: the query expression. An empty string, or None,
+                           selects all the elements.
+        """
+        self.conditions = conditions
+
+        # list of '&&' clauses, each a list of '||' conditions:
+        # (name, column, op_func, value)
+        self._clauses = []
+
+        if conditions is not None and conditions.strip():
+            for clause in conditions.split('&&'):
+                self._clauses.append([self._parse_condition(cond)
+                                      for cond in clause.split('||')])
+
+    def __repr__(self):
+        return '{0.__class__.__name__}({0.conditions!r})'.format(self)
+
+    @staticmethod
+    def _parse_condition(cond):
+        match = _condition_re.match(cond)
+
+        if match is None:
+            raise ValueError('Could not parse condition: "{0}". '
+                             'It should be of the form: "name op value", '
+                             'or "name[column] op value", '
+                             'with op one of: {1}'
+                             .format(cond.strip(), sorted(_operators)))
+
+        column = match.group('column')
+        if column is not None:
+            column = int(column)
+
+        try:
+            value = _number(match.group('value'))
+        except ValueError:
+            raise ValueError('Could not parse condition: "{0}". '
+                             '"{1}" is not a number'
+                             .format(cond.strip(), match.group('value')))
+
+        return (match.group('name'), column,
+                _operators[match.group('op')], value)
+
+    @property
+    def names(self):
+        'the names of the data arrays used by the conditions'
+        return set(c[0] for clause in self._clauses for c in clause)
+
+    @staticmethod
+    def _column(sc, name, column):
+        try:
+            array = sc[name]
+        except KeyError:
+            raise ValueError('No data array named: "{0}"'.format(name))
+
+        if column is None:
+            if array.ndim > 1:
+                raise ValueError('"{0}" has more than one column -- '
+                                 'select one with "{0}[i]"'.format(name))
+
+            return array
+        else:
+            if (array.ndim != 2 or
+                    not -array.shape[1] <= column < array.shape[1]):
+                raise ValueError('"{0}" does not have a column {1}'
+                                 .format(name, column))
+
+            return array[:, column]
+
+    def mask(self, sc):
+        """
+        the elements in the spill container that match the query
+
+        :param sc: a SpillContainer, SpillContainerData, or any mapping of
+                   data array names to arrays
+
+        :returns: a boolean array, one value per element
+        """
+        if self._clauses:
+            name, column = self._clauses[0][0][:2]
+            num_elements = len(self._column(sc, name, column))
+        else:
+            num_elements = len(sc['id'])
+
+        mask = np.ones((num_elements,), dtype=bool)
+
+        for clause in self._clauses:
+            clause_mask = np.zeros((num_elements,), dtype=bool)
+
+            for name, column, op, value in clause:
+                clause_mask |= op(self._column(sc, name, column), value)
+
+            mask &= clause_mask
+
+        return mask
+
+    def select(self, sc, target_properties):
+        """
+        the data of the elements that match the query
+
+        :param sc: a SpillContainer, SpillContainerData, or any mapping of
+                   data array names to arrays
+        :param target_properties: the names of the data arrays to return
+
+        :returns: dict of arrays for the names in target_properties, holding
+                  just the elements that match
+        """
+        mask = self.mask(sc)
+
+        return dict((name, sc[name][mask]) for name in target_properties)
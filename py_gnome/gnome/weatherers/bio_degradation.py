@@ -22,6 +22,7 @@ class BiodegradationSchema(WeathererSchema):
 class Biodegradation(Weatherer):
 
     _schema = BiodegradationSchema
+    shares_fate_views = True
     _ref_as = 'biodegradation'
     _req_refs = ['waves']
 
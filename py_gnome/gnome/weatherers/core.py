@@ -31,6 +31,11 @@ class Weatherer(Process):
     '''
     _schema = WeathererSchema  # nothing new added so use this schema
 
+    # True if weather_elements() only gets at the element data through
+    # sc.itersubstancedata() and sc.update_from_fatedataview() -- then the
+    # model lets it share the fate views with the other weatherers
+    shares_fate_views = False
+
     def __init__(self, **kwargs):
         '''
         Base weatherer class; defines the API for all weatherers
@@ -157,6 +162,7 @@ class HalfLifeWeatherer(Weatherer):
     Give half-life for all components and decay accordingly
     '''
     _schema = HalfLifeWeathererSchema
+    shares_fate_views = True
 
     def __init__(self, half_lives=(15.*60, ), **kwargs):
         '''
@@ -51,6 +51,7 @@ class DissolutionSchema(WeathererSchema):
 class Dissolution(Weatherer):
 
     _schema = DissolutionSchema
+    shares_fate_views = True
 
     _ref_as = 'dissolution'
     _req_refs = ['waves', 'wind']
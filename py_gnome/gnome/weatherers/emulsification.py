@@ -25,6 +25,7 @@ class EmulsificationSchema(WeathererSchema):
 
 class Emulsification(Weatherer):
     _schema = EmulsificationSchema
+    shares_fate_views = True
     _ref_as = 'emulsification'
     _req_refs = ['waves']
 
@@ -35,6 +35,7 @@ class EvaporationSchema(WeathererSchema):
 
 class Evaporation(Weatherer):
     _schema = EvaporationSchema
+    shares_fate_views = True
     _ref_as = 'evaporation'
     _req_refs = ['water', 'wind']
 
@@ -74,6 +74,7 @@ class Beaching(RemoveMass, Weatherer):
     RemoveMass functionality.
     '''
     _schema = BeachingSchema
+    shares_fate_views = True
 
     def __init__(self,
                  active_range,
@@ -28,6 +28,7 @@ class NaturalDispersionSchema(WeathererSchema):
 
 class NaturalDispersion(Weatherer):
     _schema = NaturalDispersionSchema
+    shares_fate_views = True
     _ref_as = 'dispersion'
     _req_refs = ['waves', 'water']
 
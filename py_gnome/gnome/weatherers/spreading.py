@@ -81,6 +81,20 @@ class FayGravityViscous(Weatherer):
         depends on blob volume, but is on the order of minutes. Cache up to 10
         inputs - don't expect 10 or more spills in one scenario.
         '''
+        return FayGravityViscous._blob_t0(water_viscosity,
+                                          relative_buoyancy,
+                                          blob_init_vol,
+                                          spreading_const)
+
+    @staticmethod
+    def _blob_t0(water_viscosity,
+                 relative_buoyancy,
+                 blob_init_vol,
+                 spreading_const):
+        '''
+        same as _gravity_spreading_t0, but not cached, so blob_init_vol can
+        be an array with the volume of each blob
+        '''
         # time to reach a0
         t0 = ((spreading_const[1] / spreading_const[0]) ** 4.0 *
               (blob_init_vol / (water_viscosity * constants.gravity *
@@ -197,46 +211,17 @@ class FayGravityViscous(Weatherer):
             array inplace. However, the input arrays could be copies so best
             to also return the updates.
         '''
-        if np.any(age == 0):
-            msg = "use init_area for age == 0"
-            raise ValueError(msg)
-
-        # update area for each blob of LEs
-        for b_age in np.unique(age):
-            # within each age blob_init_volume should also be the same
-            m_age = b_age == age
-            t0 = self._gravity_spreading_t0(water_viscosity,
-                                            relative_buoyancy,
-                                            blob_init_volume[m_age][0],
-                                            self.spreading_const)
-
-            if b_age <= t0:
-                '''
-                only update initial area, A_0, if age is past the transient
-                phase. Expect this to be the case since t0 is on the order of
-                minutes; but do a check in case we want to experiment with
-                smaller timesteps.
-                '''
-                continue
-
-            # now update area of old LEs - only update till max area is reached
-            max_area = blob_init_volume[m_age][0] / self.thickness_limit
-            if area[m_age].sum() < max_area:
-                # update area
-                blob_area = self._update_blob_area(water_viscosity,
-                                                   relative_buoyancy,
-                                                   blob_init_volume[m_age][0],
-                                                   age[m_age][0])
-
-                if blob_area >= max_area:
-                    area[m_age] = max_area / m_age.sum()
-                else:
-                    area[m_age] = blob_area / m_age.sum()
-
-                self.logger.debug('{0}\tarea after update: {1}'
-                                  .format(self._pid, blob_area))
+        def new_blob_area(water_viscosity, relative_buoyancy,
+                          blob_init_volume, blob_area, age):
+            return self._update_blob_area(water_viscosity, relative_buoyancy,
+                                          blob_init_volume, age)
 
-        return area
+        return self._update_blobs(water_viscosity,
+                                  relative_buoyancy,
+                                  blob_init_volume,
+                                  area,
+                                  age,
+                                  new_blob_area)
 
     def update_area2(self,
                      water_viscosity,
@@ -283,57 +268,121 @@ class FayGravityViscous(Weatherer):
             array inplace. However, the input arrays could be copies so best
             to also return the updates.
         '''
+        def new_blob_area(water_viscosity, relative_buoyancy,
+                          blob_init_volume, blob_area, age):
+            C = (PI *
+                 self.spreading_const[1] ** 2 *
+                 (blob_init_volume ** 2 *
+                  constants.gravity *
+                  relative_buoyancy /
+                  np.sqrt(water_viscosity)) ** (1. / 3.))
+
+            # make sure area > 0
+            blob_area_fgv = .5 * (C ** 2 / blob_area) * time_step
+
+            K = 4 * PI * 2 * .033
+
+            blob_area_diffusion = ((7. / 6.) * K *
+                                   (blob_area / K) ** (1. / 7.)) * time_step
+
+            return blob_area + blob_area_fgv + blob_area_diffusion
+
+        return self._update_blobs(water_viscosity,
+                                  relative_buoyancy,
+                                  blob_init_volume,
+                                  area,
+                                  age,
+                                  new_blob_area)
+
+    @staticmethod
+    def _blobs(age):
+        '''
+        group LEs into blobs - the LEs with the same age belong to the same
+        blob.
+
+        :returns: (blob_index, first, counts) where blob_index is the blob
+            each LE belongs to, first is the index of the first LE of each
+            blob and counts is the number of LEs in each blob.
+        '''
+        if np.all(age[1:] <= age[:-1]) or np.all(age[1:] >= age[:-1]):
+            # LEs are released in order so the blobs are usually contiguous
+            # runs of the age array - no need to sort
+            first = np.concatenate(([0],
+                                    np.flatnonzero(age[1:] != age[:-1]) + 1))
+            counts = np.diff(np.append(first, len(age)))
+            blob_index = np.repeat(np.arange(len(first)), counts)
+        else:
+            _ages, first, blob_index, counts = np.unique(age,
+                                                         return_index=True,
+                                                         return_inverse=True,
+                                                         return_counts=True)
+            blob_index = blob_index.reshape(-1)
+
+        return blob_index, first, counts
+
+    def _update_blobs(self,
+                      water_viscosity,
+                      relative_buoyancy,
+                      blob_init_volume,
+                      area,
+                      age,
+                      new_blob_area):
+        '''
+        update area of all blobs at once - used by update_area and
+        update_area2.
+
+        Blobs that are past the transient phase and have not reached
+        max_area get the area returned by:
+            new_blob_area(water_viscosity, relative_buoyancy,
+                          blob_init_volume, blob_area, age)
+        where blob_init_volume, blob_area (sum of area of its LEs) and age
+        are arrays with one value per blob to be updated. The updated area is
+        limited to max_area and divided equally between the LEs of the blob.
+        '''
         if np.any(age == 0):
             msg = "use init_area for age == 0"
             raise ValueError(msg)
 
-        # update area for each blob of LEs
-        for b_age in np.unique(age):
-            # within each age blob_init_volume should also be the same
-            m_age = b_age == age
-            t0 = self._gravity_spreading_t0(water_viscosity,
-                                            relative_buoyancy,
-                                            blob_init_volume[m_age][0],
-                                            self.spreading_const)
-
-            if b_age <= t0:
-                '''
-                only update initial area, A_0, if age is past the transient
-                phase. Expect this to be the case since t0 is on the order of
-                minutes; but do a check in case we want to experiment with
-                smaller timesteps.
-                '''
-                continue
+        if len(age) == 0:
+            return area
+
+        blob_index, first, counts = self._blobs(age)
 
-            # now update area of old LEs - only update till max area is reached
-            max_area = blob_init_volume[m_age][0] / self.thickness_limit
-            if area[m_age].sum() < max_area:
+        # within each age blob_init_volume should also be the same
+        b_age = age[first]
+        b_init_vol = blob_init_volume[first]
+        b_area = np.bincount(blob_index, weights=area, minlength=len(first))
 
-                C = (PI *
-                    self.spreading_const[1] ** 2 *
-                    (blob_init_volume[m_age][0] ** 2 *
-                    constants.gravity *
-                    relative_buoyancy /
-                    np.sqrt(water_viscosity)) ** (1. / 3.))
+        t0 = self._blob_t0(water_viscosity,
+                           relative_buoyancy,
+                           b_init_vol,
+                           self.spreading_const)
+        max_area = b_init_vol / self.thickness_limit
 
-                #blob_area_fgv = area[m_age].sum() + .5 * (C**2 / area[m_age].sum()) * time_step	# make sure area > 0
-                blob_area_fgv = .5 * (C**2 / area[m_age].sum()) * time_step	# make sure area > 0
+        # only update initial area, A_0, if age is past the transient phase.
+        # Expect this to be the case since t0 is on the order of minutes; but
+        # do a check in case we want to experiment with smaller timesteps.
+        # Only update till max area is reached
+        update = (b_age > t0) & (b_area < max_area)
 
-                K = 4 * PI * 2 * .033
+        if not np.any(update):
+            return area
 
-                #blob_area_diffusion = area[m_age].sum() + ((7 / 6) * K * (area[m_age].sum() / K) ** (1 / 7)) * time_step
-                blob_area_diffusion = ((7. / 6.) * K * (area[m_age].sum() / K) ** (1. / 7.)) * time_step
+        new_area = np.minimum(new_blob_area(water_viscosity,
+                                            relative_buoyancy,
+                                            b_init_vol[update],
+                                            b_area[update],
+                                            b_age[update]),
+                              max_area[update])
 
-                #blob_area = blob_area_fgv + blob_area_diffusion
-                blob_area = area[m_age].sum() + blob_area_fgv + blob_area_diffusion
+        le_area = np.empty_like(b_area)
+        le_area[update] = new_area / counts[update]
 
-                if blob_area >= max_area:
-                    area[m_age] = max_area / m_age.sum()
-                else:
-                    area[m_age] = blob_area / m_age.sum()
+        le_mask = update[blob_index]
+        area[le_mask] = le_area[blob_index[le_mask]]
 
-                self.logger.debug('{0}\tarea after update: {1}'
-                                  .format(self._pid, blob_area))
+        self.logger.debug('{0}\tarea updated for {1} blobs'
+                          .format(self._pid, np.count_nonzero(update)))
 
         return area
 
@@ -484,6 +533,7 @@ class ConstantArea(Weatherer):
     - must be manually hooked up
     '''
     _ref_as = 'spreading'
+    shares_fate_views = True
 
     def __init__(self, area, **kwargs):
         self.area = area
@@ -542,6 +592,7 @@ class Langmuir(Weatherer):
     _schema = LangmuirSchema
     _ref_as = 'langmuir'
     _req_refs = ['water', 'wind']
+    shares_fate_views = True
 
     def __init__(self,
                  water=None,
@@ -475,6 +475,10 @@ elif sys.platform.startswith("linux"):
                                  language='c++',
                                  define_macros=macros,
                                  libraries=['netcdf'],
+                                 # get_move() may split the LEs between
+                                 # threads (Mover_c::SplitLEs)
+                                 extra_compile_args=['-pthread'],
+                                 extra_link_args=['-pthread'],
                                  # include_dirs=[cpp_code_dir],
                                  include_dirs=include_dirs,
                                  )])
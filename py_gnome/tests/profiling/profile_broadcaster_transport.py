@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""
+Compare the ways the ModelBroadcaster can get results back from its
+subprocesses
+
+The subprocesses answer requests on ZMQ IPC sockets, like the
+ModelConsumers do, with a result holding the element data of a spill
+container. The result is either pickled, with the arrays in it, or the
+arrays are passed through shared memory, and only the rest is pickled.
+
+Reports the throughput of the element data for both.
+"""
+
+import time
+import shutil
+import uuid
+import tempfile
+import multiprocessing as mp
+from pickle import loads, dumps
+
+import numpy as np
+import zmq
+
+from gnome.utilities.shared_arrays import (SharedArraySender,
+                                           SharedArrayReceiver,
+                                           start_resource_tracker)
+
+
+num_consumers = 8
+num_requests = 20
+
+
+def make_result(num_elements):
+    'something like a step of element data, and some weathering output'
+    return {'step_num': 1,
+            'WeatheringOutput': {'evaporated': 10.0, 'floating': 990.0},
+            'spill_data': {'positions': np.random.random((num_elements, 3)),
+                           'mass': np.random.random((num_elements,)),
+                           'age': np.zeros((num_elements,), dtype=np.int32),
+                           'status_codes': np.ones((num_elements,),
+                                                   dtype=np.int16),
+                           'id': np.arange(num_elements, dtype=np.uint32),
+                           }
+            }
+
+
+def consumer(address, num_elements, shared_arrays):
+    context = zmq.Context()
+    sock = context.socket(zmq.REP)
+    sock.bind(address)
+
+    result = make_result(num_elements)
+    sender = SharedArraySender() if shared_arrays else None
+
+    while True:
+        cmd = loads(sock.recv())
+        if cmd is None:
+            sock.send(dumps(None))
+            break
+
+        res = result if sender is None else sender.pack(result)
+        sock.send(dumps(res))
+
+    if sender is not None:
+        sender.close()
+
+    sock.close()
+    context.destroy(linger=0)
+
+
+def time_transport(num_elements, shared_arrays, ipc_folder):
+    if shared_arrays:
+        start_resource_tracker()
+
+    addresses = ['ipc://{}/Task-{}'.format(ipc_folder, uuid.uuid4())
+                 for _i in range(num_consumers)]
+    procs = [mp.Process(target=consumer,
+                        args=(a, num_elements, shared_arrays))
+             for a in addresses]
+    [p.start() for p in procs]
+
+    context = zmq.Context()
+    tasks = []
+    for a in addresses:
+        task = context.socket(zmq.REQ)
+        task.connect(a)
+        tasks.append(task)
+
+    receivers = [SharedArrayReceiver() for _t in tasks]
+
+    def recv(task, receiver):
+        res = loads(task.recv())
+        return receiver.unpack(res) if shared_arrays else res
+
+    # warm up: connect, and create the shared memory
+    [t.send(dumps(('step', {}))) for t in tasks]
+    out = [recv(t, r) for t, r in zip(tasks, receivers)]
+
+    start = time.perf_counter()
+    for _i in range(num_requests):
+        [t.send(dumps(('step', {}))) for t in tasks]
+        out = [recv(t, r) for t, r in zip(tasks, receivers)]
+    elapsed = time.perf_counter() - start
+
+    nbytes = sum(a.nbytes for a in out[0]['spill_data'].values())
+
+    [t.send(dumps(None)) for t in tasks]
+    [t.recv() for t in tasks]
+    [p.join() for p in procs]
+    [r.close() for r in receivers]
+    [t.close() for t in tasks]
+    context.term()
+
+    return (num_consumers * num_requests * nbytes / elapsed / 1e6,
+            elapsed / num_requests * 1000)
+
+
+if __name__ == "__main__":
+    ipc_folder = tempfile.mkdtemp()
+
+    for num_elements in (1000, 100000, 1000000):
+        for shared_arrays, label in ((False, 'pickle'),
+                                     (True, 'shared memory')):
+            mb_per_s, ms = time_transport(num_elements, shared_arrays,
+                                          ipc_folder)
+            print('{0:>13}: {1} consumers, {2} elements: '
+                  '{3:8.1f} MB/s  {4:7.2f} ms per broadcast command'
+                  .format(label, num_consumers, num_elements, mb_per_s, ms))
+
+    shutil.rmtree(ipc_folder)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+Time CyWindMover.get_move for 1 million forecast elements, with the
+elements split between 1, 2, 4, 8 and 16 threads.
+
+The GIL is released while get_move runs, so this measures the C++ loop
+(WindMover_c::get_move). The moves should be the same whatever the number
+of threads.
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+
+from gnome.basic_types import (world_point, status_code_type, oil_status,
+                               spill_type)
+from gnome.utilities import time_utils
+from gnome.cy_gnome.cy_wind_mover import CyWindMover
+
+
+num_le = 1000000
+time_step = 900
+model_time = time_utils.date_to_sec(datetime(2020, 1, 1))
+
+
+def make_data():
+    ref = np.zeros((num_le, ), dtype=world_point)
+    ref['long'] = np.random.uniform(-120, -119, num_le)
+    ref['lat'] = np.random.uniform(30, 31, num_le)
+    windage = np.random.uniform(0.01, 0.04, num_le)
+    status = np.full((num_le, ), oil_status.in_water, dtype=status_code_type)
+
+    return ref, windage, status
+
+
+def time_it(func, num=5):
+    start = time.perf_counter()
+    for _i in range(num):
+        func()
+
+    return (time.perf_counter() - start) / num
+
+
+if __name__ == "__main__":
+    ref, windage, status = make_data()
+
+    wm = CyWindMover()
+    wm.set_constant_wind(5.0, 5.0)
+    wm.prepare_for_model_step(model_time, time_step)
+
+    serial = None
+    for num_threads in (1, 2, 4, 8, 16):
+        wm.num_threads = num_threads
+        delta = np.zeros((num_le, ), dtype=world_point)
+
+        def get_move():
+            wm.get_move(model_time, time_step, ref, delta, windage, status,
+                        spill_type.forecast)
+
+        t = time_it(get_move)
+
+        if serial is None:
+            serial = (t, delta.copy())
+        else:
+            assert np.array_equal(delta, serial[1])
+
+        print("{:2d} threads: {:.4f} s  ({:.2f}x)"
+              .format(num_threads, t, serial[0] / t))
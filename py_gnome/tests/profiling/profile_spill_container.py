@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+
+"""
+Time the per-step cost of managing the SpillContainer's data arrays
+
+A continuous release adds elements every step, and some are removed every
+step (beached, off map, ...), with about 1 million elements in the container.
+
+Compares the SpillContainer (storage that grows by doubling, removal by
+compacting in place) with what it used to do: np.r_ to append to every
+array, and np.delete to remove.
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+
+from gnome.basic_types import oil_status
+from gnome.spill import point_line_release_spill
+from gnome.spill_container import SpillContainer
+
+
+num_elements = 1000000
+num_released = 10000  # released each step
+num_steps = 50
+
+
+def make_sc():
+    spill = point_line_release_spill(1, (0.0, 0.0, 0.0),
+                                     datetime(2020, 1, 1))
+    sc = SpillContainer()
+    sc.spills += spill
+    sc.prepare_for_model_run(spill.all_array_types)
+
+    sc._append_data_arrays(num_elements)
+
+    return sc
+
+
+def removed_elements(num, num_removed):
+    return np.sort(np.random.choice(num, num_removed, replace=False))
+
+
+def step_spill_container(sc, num_removed):
+    sc._append_data_arrays(num_released)
+
+    removed = removed_elements(len(sc), num_removed)
+    sc['status_codes'][removed] = oil_status.to_be_removed
+    sc.model_step_is_done()
+
+
+def step_old(sc, num_removed):
+    """
+    what SpillContainer used to do
+    """
+    data_arrays = sc._data_arrays
+
+    for name, atype in sc._array_types.items():
+        if atype.shape is None:
+            a_append = atype.initialize(num_released,
+                                        shape=(sc._oil_comp_array_len,))
+        else:
+            a_append = atype.initialize(num_released)
+        data_arrays[name] = np.r_[data_arrays[name], a_append]
+
+    to_be_removed = removed_elements(len(sc), num_removed)
+
+    if len(to_be_removed) > 0:
+        for name in sc._array_types:
+            data_arrays[name] = np.delete(data_arrays[name], to_be_removed,
+                                          axis=0)
+
+
+def time_steps(step, label, num_removed):
+    np.random.seed(1)
+    sc = make_sc()
+
+    start = time.perf_counter()
+    for i in range(num_steps):
+        step(sc, num_removed)
+    per_step = (time.perf_counter() - start) / num_steps
+
+    print('{0}: {1} arrays, {2} elements, {3} released and {4} removed '
+          'per step: {5:.2f} ms per step'
+          .format(label, len(sc._array_types), len(sc), num_released,
+                  num_removed, per_step * 1000))
+
+
+if __name__ == "__main__":
+    for num_removed in (0, 100, 10000):
+        time_steps(step_old, 'np.r_ / np.delete', num_removed)
+        time_steps(step_spill_container, 'SpillContainer', num_removed)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+Time FayGravityViscous.update_area2 for a long continuous release
+
+10,000 blobs (one per release time) of 100 elements each -- 1 million
+elements. Compares the grouped update with what it used to do: a loop over
+np.unique(age), with a boolean mask of the whole age array for each blob.
+"""
+
+import time
+
+import numpy as np
+
+from gnome import constants
+from gnome.weatherers import FayGravityViscous
+
+
+num_blobs = 10000
+num_per_blob = 100
+time_step = 900
+water_viscosity = 1.0e-6
+relative_buoyancy = 0.2
+
+
+def make_data():
+    # the oldest are released first
+    ages = np.arange(num_blobs, 0, -1) * 60 + time_step
+    age = np.repeat(ages, num_per_blob).astype(np.int32)
+    blob_init_volume = np.full(len(age), 10.0)
+    area = np.full(len(age), 100.0 / num_per_blob)
+
+    return blob_init_volume, area, age
+
+
+def update_area_loop(spread, blob_init_volume, area, age):
+    'the per-blob loop update_area2 used to do'
+    for b_age in np.unique(age):
+        m_age = b_age == age
+        t0 = spread._gravity_spreading_t0(water_viscosity,
+                                          relative_buoyancy,
+                                          blob_init_volume[m_age][0],
+                                          spread.spreading_const)
+        if b_age <= t0:
+            continue
+
+        max_area = blob_init_volume[m_age][0] / spread.thickness_limit
+        if area[m_age].sum() < max_area:
+            C = (np.pi *
+                 spread.spreading_const[1] ** 2 *
+                 (blob_init_volume[m_age][0] ** 2 *
+                  constants.gravity *
+                  relative_buoyancy /
+                  np.sqrt(water_viscosity)) ** (1. / 3.))
+            blob_area_fgv = .5 * (C ** 2 / area[m_age].sum()) * time_step
+            K = 4 * np.pi * 2 * .033
+            blob_area_diffusion = ((7. / 6.) * K *
+                                   (area[m_age].sum() / K) ** (1. / 7.) *
+                                   time_step)
+            blob_area = (area[m_age].sum() +
+                         blob_area_fgv + blob_area_diffusion)
+
+            area[m_age] = min(blob_area, max_area) / m_age.sum()
+
+    return area
+
+
+def time_it(func, num=1):
+    start = time.perf_counter()
+    for _i in range(num):
+        func()
+
+    return (time.perf_counter() - start) / num
+
+
+if __name__ == "__main__":
+    spread = FayGravityViscous()
+    spread._set_thickness_limit(1e-4)
+
+    blob_init_volume, area, age = make_data()
+
+    loop_area = area.copy()
+    loop_time = time_it(lambda: update_area_loop(spread, blob_init_volume,
+                                                 loop_area, age))
+
+    new_area = area.copy()
+    new_time = time_it(lambda: spread.update_area2(water_viscosity,
+                                                   relative_buoyancy,
+                                                   blob_init_volume,
+                                                   new_area,
+                                                   time_step,
+                                                   age))
+
+    print('{0} blobs, {1} elements'.format(num_blobs, len(age)))
+    print('loop over blobs: {0:9.1f} ms'.format(loop_time * 1000))
+    print('grouped:         {0:9.1f} ms'.format(new_time * 1000))
+    print('max relative difference: {0:.2e}'
+          .format(np.abs(new_area / loop_area - 1).max()))
+
+    # and when the elements aren't in release order
+    order = np.random.permutation(len(age))
+    shuffled = (blob_init_volume[order], area[order], age[order])
+    shuffled_time = time_it(lambda: spread.update_area2(water_viscosity,
+                                                        relative_buoyancy,
+                                                        shuffled[0],
+                                                        shuffled[1].copy(),
+                                                        time_step,
+                                                        shuffled[2]), 5)
+    print('grouped, shuffled: {0:7.1f} ms'.format(shuffled_time * 1000))
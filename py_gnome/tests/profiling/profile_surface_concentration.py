@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""
+Compare the "kde" and "binned" surface concentration algorithms
+
+A continuous release over six hours, drifting and spreading, so the
+particles are in six age bins. Reports the time each algorithm takes, and
+how far the "binned" concentrations are from the "kde" ones.
+"""
+
+import time
+
+import numpy as np
+
+from gnome.utilities.surface_concentration import (surface_conc_kde,
+                                                   surface_conc_binned)
+
+
+def make_sc(num_elements, hours=6):
+    'just the data arrays the surface concentration code needs'
+    rs = np.random.RandomState(0)
+
+    age = rs.randint(0, hours * 3600, num_elements)
+    # older particles have drifted further, and spread more
+    spread = 0.002 + 0.01 * age / 3600.
+    lon = -88.0 + 0.05 * age / 3600. + rs.normal(0, 1, num_elements) * spread
+    lat = (28.0 + 0.3 * (lon + 88.0) +
+           rs.normal(0, 1, num_elements) * spread * 0.5)
+
+    return {'positions': np.c_[lon, lat, np.zeros_like(lon)],
+            'mass': rs.uniform(0.5, 1.5, num_elements),
+            'age': age,
+            'spill_num': np.zeros(num_elements, dtype=np.int32),
+            }
+
+
+def time_it(func, sc):
+    start = time.perf_counter()
+    func(sc)
+
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for num_elements in (2000, 10000, 50000):
+        kde_sc = make_sc(num_elements)
+        binned_sc = make_sc(num_elements)
+
+        kde_time = time_it(surface_conc_kde, kde_sc)
+        binned_time = time_it(surface_conc_binned, binned_sc)
+
+        rel_err = np.abs(binned_sc['surface_concentration'] /
+                         kde_sc['surface_concentration'] - 1)
+
+        print('{0:6} elements: kde {1:7.2f} s  binned {2:6.3f} s  '
+              'relative difference: median {3:.1e}, 99% {4:.1e}, max {5:.1e}'
+              .format(num_elements, kde_time, binned_time,
+                      np.median(rel_err), np.percentile(rel_err, 99),
+                      rel_err.max()))
+
+    # the binned one on its own, for more elements
+    for num_elements in (200000, 1000000):
+        binned_time = time_it(surface_conc_binned, make_sc(num_elements))
+        print('{0:6} elements: binned {1:6.3f} s'
+              .format(num_elements, binned_time))
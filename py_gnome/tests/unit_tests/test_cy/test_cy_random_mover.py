@@ -158,6 +158,49 @@ class TestRandom(object):
         return np.sum(diff**2, axis=1)**.5
 
 
+def stream_move(rm, ref, ids, spill_nums, status):
+    delta = np.zeros((len(ref),), dtype=world_point)
+
+    rm.prepare_for_model_run()
+    rm.prepare_for_model_step(0, 900)
+    rm.get_move(0, 900, ref, delta, status, spill_type.forecast,
+                1, ids, spill_nums)
+    rm.model_step_is_done()
+
+    return delta
+
+
+def test_random_streams():
+    """
+    with random streams, an element's move doesn't depend on the order the
+    elements are in, or on how many threads do them
+    """
+    num_le = 5000
+    cm = cy_fixtures.CyTestMove()
+    ref = np.zeros((num_le,), dtype=world_point)
+    ids = np.arange(num_le, dtype=np.uint32)
+    spill_nums = np.zeros((num_le,), dtype=np.uint16)
+    status = np.empty((num_le,), dtype=cm.status.dtype)
+    status[:] = cm.status[0]
+
+    rm = CyRandomMover()
+    delta = stream_move(rm, ref, ids, spill_nums, status)
+    assert np.all(delta['lat'] != 0)
+
+    order = np.random.permutation(num_le)
+    shuffled = stream_move(CyRandomMover(), ref[order], ids[order],
+                           spill_nums[order], status[order])
+    np.testing.assert_equal(shuffled, delta[order])
+
+    rm = CyRandomMover()
+    rm.num_threads = 4
+    np.testing.assert_equal(stream_move(rm, ref, ids, spill_nums, status),
+                            delta)
+
+    with pytest.raises(ValueError):
+        stream_move(rm, ref, ids[:10], spill_nums, status)
+
+
 if __name__ == '__main__':
     tr = TestRandom()
 
@@ -353,6 +353,43 @@ def test_z_greater_than_0():
     assert np.all((cw.delta['z'])[2:] == 0)
 
 
+def test_num_threads():
+    """
+    splitting the forecast LEs between threads gives the same move
+    """
+    num_le = 5000
+    cm = cy_fixtures.CyTestMove()
+    ref = np.zeros((num_le, ), dtype=world_point)
+    ref['long'] = np.linspace(-120, -119, num_le)
+    ref['lat'] = np.linspace(30, 31, num_le)
+    windage = np.linspace(0.01, 0.04, num_le)
+    status = np.empty((num_le, ), dtype=cm.status.dtype)
+    status[:] = cm.status[0]
+
+    deltas = []
+    for num_threads in (1, 4):
+        wm = CyWindMover()
+        wm.set_constant_wind(const_wind['u'], const_wind['v'])
+        wm.num_threads = num_threads
+        assert wm.num_threads == num_threads
+
+        delta = np.zeros((num_le, ), dtype=world_point)
+        wm.prepare_for_model_step(cm.model_time, cm.time_step)
+        wm.get_move(cm.model_time, cm.time_step,
+                    ref,
+                    delta,
+                    windage,
+                    status,
+                    spill_type.forecast)
+        deltas.append(delta)
+
+    assert np.all(deltas[0]['lat'] != 0)
+    np.testing.assert_equal(deltas[0], deltas[1])
+
+    with raises(ValueError):
+        wm.num_threads = 0
+
+
 class TestObjectSerialization(object):
     '''
         Test all the serialization and deserialization methods that are
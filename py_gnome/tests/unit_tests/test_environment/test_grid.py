@@ -3,8 +3,10 @@
 
 
 import os
+import threading
 
 import pytest
+import numpy as np
 import netCDF4 as nc
 
 from gnome.environment.gridded_objects_base import PyGrid, Grid_U, Grid_S
@@ -140,3 +142,72 @@ class TestPyGrid_U(object):
         pp.pprint(d_ug.serialize())
 
         assert ug == d_ug
+
+
+@pytest.mark.parametrize("grid_name", ('sg', 'ug'))
+def test_hinted_locate_faces(grid_name, request):
+    """
+    starting from the cell each point was last in finds the same cells
+    as searching the whole grid
+    """
+    grid = request.getfixturevalue(grid_name)
+
+    lon = np.asarray(grid.node_lon[:]).reshape(-1)
+    lat = np.asarray(grid.node_lat[:]).reshape(-1)
+    points = np.column_stack((np.random.uniform(lon.min(), lon.max(), 500),
+                              np.random.uniform(lat.min(), lat.max(), 500)))
+
+    # most points stay in their cell from one stage to the next
+    step = (lon.max() - lon.min()) / 1000
+    stages = [points + np.random.normal(0, step, points.shape)
+              for _i in range(4)]
+
+    hints = np.full((len(points),), -1, dtype=np.int64)
+
+    for stage in stages:
+        with grid.hinted(hints):
+            hinted = grid.locate_faces(stage)
+
+        assert np.array_equal(hinted, grid.locate_faces(stage))
+
+    assert np.any(hints >= 0)
+
+
+def test_hints_per_thread(sg):
+    """
+    the hints given on one thread aren't used on another
+    """
+    hints = np.full((10,), -1, dtype=np.int64)
+    seen = []
+
+    def other_thread():
+        seen.append(sg._cell_hints)
+
+    with sg.hinted(hints):
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+        assert sg._cell_hints is hints
+
+    assert seen == [None]
+    assert sg._cell_hints is None
+
+
+def test_hinted_positional_args(sg):
+    """
+    arguments passed by position go straight to gridded: the hints are
+    not used or changed
+    """
+    lon = np.asarray(sg.node_lon[:]).reshape(-1)
+    lat = np.asarray(sg.node_lat[:]).reshape(-1)
+    points = np.column_stack((np.random.uniform(lon.min(), lon.max(), 50),
+                              np.random.uniform(lat.min(), lat.max(), 50)))
+
+    hints = np.full((len(points),), -1, dtype=np.int64)
+
+    with sg.hinted(hints):
+        faces = sg.locate_faces(points, 'celltree')
+
+    assert np.array_equal(faces, sg.locate_faces(points))
+    assert np.all(hints == -1)
@@ -0,0 +1,267 @@
+"""
+tests for the TimeSliceCache used by GridCurrent and GridWind
+
+designed to be run with py.test
+"""
+
+import pickle
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import netCDF4 as nc4
+
+from gnome.environment.gridded_objects_base import (Variable,
+                                                    Grid_S,
+                                                    Time,
+                                                    TimeSliceCache)
+from gnome.environment import GridCurrent
+from gnome.utilities.prefetch import netcdf_lock
+
+
+num_times = 6
+times = [datetime(2020, 1, 1) + timedelta(hours=i) for i in range(num_times)]
+
+node_lon, node_lat = np.meshgrid(np.linspace(0, 1, 11),
+                                 np.linspace(0, 1, 11))
+
+
+def make_variables():
+    'u and v, on the nodes, in a netCDF file'
+    ds = nc4.Dataset('slice_cache.nc', 'w', diskless=True, persist=False)
+    ds.createDimension('time', num_times)
+    ds.createDimension('y', node_lon.shape[0])
+    ds.createDimension('x', node_lon.shape[1])
+
+    grid = Grid_S(node_lon=node_lon, node_lat=node_lat)
+    time = Time(times)
+
+    variables = []
+    for name in ('u', 'v'):
+        ds.createVariable(name, 'f8', dimensions=('time', 'y', 'x'))
+        ds[name][:] = np.random.random((num_times,) + node_lon.shape)
+        variables.append(Variable(name=name, units='m/s', time=time,
+                                  grid=grid, data=ds[name]))
+
+    return ds, variables
+
+
+def test_reading():
+    ds, (u, v) = make_variables()
+    cache = TimeSliceCache(max_windows=2)
+
+    with cache.reading((0, 1), {'u': u, 'v': v}):
+        assert np.array_equal(u.data[0], ds['u'][0])
+        assert np.array_equal(u.data[1, 2:4], ds['u'][1, 2:4])
+        assert np.array_equal(v.data[(1, 3, 5)], ds['v'][1, 3, 5])
+        assert np.array_equal(v.data[:], ds['v'][:])
+
+    # the netCDF variables are put back
+    assert u.data is ds['u']
+    assert v.data is ds['v']
+
+    assert (0, 1) in cache
+
+
+def test_lru():
+    ds, (u, v) = make_variables()
+    cache = TimeSliceCache(max_windows=2)
+
+    for window in ((0, 1), (1, 2), (0, 1), (2, 3)):
+        with cache.reading(window, {'u': u, 'v': v}):
+            u.data[window[0]]
+            v.data[window[1]]
+
+    assert len(cache) == 2
+    assert (0, 1) in cache
+    assert (2, 3) in cache
+    assert (1, 2) not in cache
+
+
+def test_off():
+    '''
+    the slices are read the same way, but not kept
+    '''
+    ds, (u, v) = make_variables()
+    cache = TimeSliceCache(max_windows=0)
+
+    with cache.reading((0, 1), {'u': u, 'v': v}):
+        assert np.array_equal(u.data[0], ds['u'][0])
+
+    assert u.data is ds['u']
+    assert len(cache) == 0
+
+
+def test_grid_current_at():
+    'the same values as reading the file every time'
+    ds, variables = make_variables()
+    current = GridCurrent(name='current', variables=variables,
+                          grid=variables[0].grid, time=variables[0].time)
+
+    uncached = GridCurrent(name='uncached', variables=make_variables()[1],
+                           grid=variables[0].grid, time=variables[0].time)
+    uncached.slice_cache_windows = 0
+    for var, other in zip(current.variables[:2], uncached.variables[:2]):
+        other.data[:] = var.data[:]
+
+    for time in (times[1] + timedelta(minutes=20),
+                 times[1] + timedelta(minutes=40),
+                 times[2] + timedelta(minutes=20)):
+        # new points for each "RK stage"
+        for _stage in range(2):
+            points = np.column_stack((np.random.uniform(0.1, 0.9, 50),
+                                      np.random.uniform(0.1, 0.9, 50),
+                                      np.zeros(50)))
+
+            assert np.allclose(current.at(points, time, memoize=False),
+                               uncached.at(points, time, memoize=False))
+
+    assert len(current.slice_cache) == 2
+    assert len(uncached.slice_cache) == 0
+
+
+def test_reading_keys():
+    'time indices as lists, arrays and slices -- the same as from the file'
+    ds, (u, v) = make_variables()
+    cache = TimeSliceCache(max_windows=2)
+
+    with cache.reading((0, 1), {'u': u, 'v': v}):
+        for key in ([1],
+                    ([0, 1], 2),
+                    (np.array([1, 2]), slice(2, 5)),
+                    (slice(0, 2), Ellipsis),
+                    (np.int64(1), slice(None), 3)):
+            assert np.array_equal(u.data[key], ds['u'][key])
+
+        # arrays of indices after the time index: straight from the file
+        assert np.array_equal(u.data[[0, 1], [2, 3]], ds['u'][[0, 1], [2, 3]])
+
+
+def test_reading_levels():
+    '''
+    with a depth index, only that level of the time slice is read and kept
+    '''
+    ds = nc4.Dataset('slice_cache_3d.nc', 'w', diskless=True, persist=False)
+    for dim, size in zip(('time', 'z', 'y', 'x'),
+                         (num_times, 5) + node_lon.shape):
+        ds.createDimension(dim, size)
+    ds.createVariable('u', 'f8', dimensions=('time', 'z', 'y', 'x'))
+    ds['u'][:] = np.random.random(ds['u'].shape)
+
+    keys = []
+
+    class Data(object):
+        '''records what is read'''
+        shape = ds['u'].shape
+
+        def __getitem__(self, key):
+            keys.append(key)
+            return ds['u'][key]
+
+    u = Variable(name='u', units='m/s', time=Time(times),
+                 grid=Grid_S(node_lon=node_lon, node_lat=node_lat),
+                 data=Data())
+    cache = TimeSliceCache(max_windows=2)
+
+    with cache.reading((0, 1), {'u': u}):
+        assert np.array_equal(u.data[1, 0], ds['u'][1, 0])
+        assert np.array_equal(u.data[1, 0, 2:4], ds['u'][1, 0, 2:4])
+        assert np.array_equal(u.data[[0, 1], -1, 3], ds['u'][[0, 1], -1, 3])
+
+    assert keys == [(1, 0), (0, 4), (1, 4)]
+
+    # the levels are carried over to the next window
+    with cache.reading((1, 2), {'u': u}):
+        assert np.array_equal(u.data[1, 0], ds['u'][1, 0])
+
+    assert len(keys) == 3
+
+
+def test_reading_two_caches():
+    '''
+    a Variable read through two caches at once (as by two threads) always
+    gets its own data back
+    '''
+    ds, (u, v) = make_variables()
+    cache1 = TimeSliceCache(max_windows=2)
+    cache2 = TimeSliceCache(max_windows=2)
+
+    reading1 = cache1.reading((0, 1), {'u': u})
+    reading2 = cache2.reading((0, 1), {'u': u})
+
+    reading1.__enter__()
+    reading2.__enter__()
+    assert np.array_equal(u.data[0], ds['u'][0])
+    reading1.__exit__(None, None, None)
+    # not put back while the other is still reading
+    assert u.data is not ds['u']
+    assert np.array_equal(u.data[1], ds['u'][1])
+    reading2.__exit__(None, None, None)
+
+    assert u.data is ds['u']
+
+    # and caching is still on
+    with cache1.reading((0, 1), {'u': u}):
+        assert u.data is not ds['u']
+
+
+def test_reading_threads():
+    ds, (u, v) = make_variables()
+    cache = TimeSliceCache(max_windows=2)
+    errors = []
+
+    def read(window):
+        try:
+            for _i in range(50):
+                with cache.reading(window, {'u': u, 'v': v}):
+                    for t in window:
+                        assert np.array_equal(u.data[t], ds['u'][t])
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=read, args=(window,))
+               for window in ((0, 1), (1, 2), (2, 3), (3, 4))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert u.data is ds['u']
+    assert len(cache) <= 2
+
+
+def test_reading_lock():
+    '''
+    netcdf_lock is only held while the data is read, not for all of
+    reading()
+    '''
+    ds, (u, v) = make_variables()
+    cache = TimeSliceCache(max_windows=2)
+    locked = []
+
+    class Data(object):
+        '''records whether netcdf_lock is held when it is read'''
+        shape = ds['u'].shape
+
+        def __getitem__(self, key):
+            locked.append(netcdf_lock._condition._is_owned())
+            return ds['u'][key]
+
+    u.data = Data()
+
+    with netcdf_lock.in_use():
+        with cache.reading((0, 1), {'u': u}):
+            assert not netcdf_lock._condition._is_owned()
+            u.data[0, 2:4]
+            u.data[[0, 1], [2, 3]]
+
+    assert locked == [True, True]
+
+
+def test_pickle():
+    cache = TimeSliceCache(max_windows=3)
+    cache2 = pickle.loads(pickle.dumps(cache))
+
+    assert cache2.max_windows == 3
+    assert len(cache2) == 0
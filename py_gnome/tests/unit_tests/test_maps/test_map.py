@@ -12,6 +12,7 @@ Designed to be run with py.test
 
 
 import os
+import shutil
 
 import pytest
 
@@ -347,6 +348,42 @@ class Test_RasterMap:
         # outside polygon, off land:
         assert not gmap.allowable_spill_position((3.0, 3.0, 0.))
 
+    @pytest.mark.parametrize("ratios", [(16, 1), (4, 2, 1), (8, 3, 1)])
+    def test_build_coarser_rasters(self, ratios):
+        """
+        each cell of a coarser raster is land if any of the cells it covers
+        are -- including the partial cells at the edges
+        """
+        gmap = RasterMap(refloat_halflife=6, raster=self.raster,
+                         projection=NoProjection())
+        gmap.ratios = ratios
+
+        assert len(gmap.layers) == len(ratios)
+        assert gmap.layers[-1] is gmap.raster
+
+        for ratio, layer in zip(ratios[:-1], gmap.layers[:-1]):
+            assert layer.dtype == np.uint8
+            assert layer.shape == (-(-self.w // ratio), -(-self.h // ratio))
+
+            for i in range(layer.shape[0]):
+                for j in range(layer.shape[1]):
+                    block = self.raster[i * ratio:(i + 1) * ratio,
+                                        j * ratio:(j + 1) * ratio]
+                    assert layer[i, j] == np.any(block)
+
+    def test_layers_passed_in(self):
+        gmap = RasterMap(raster=self.raster, projection=NoProjection())
+        layer = np.ones((2, 1), dtype=np.uint8)
+
+        gmap2 = RasterMap(raster=self.raster, projection=NoProjection(),
+                          layers=[layer])
+        assert gmap2.layers[0] is layer
+
+        # the wrong shape gets rebuilt
+        gmap3 = RasterMap(raster=self.raster, projection=NoProjection(),
+                          layers=[np.ones((3, 3), dtype=np.uint8)])
+        assert np.array_equal(gmap3.layers[0], gmap.layers[0])
+
 
 class TestRefloat:
 
@@ -608,6 +645,84 @@ class Test_MapfromBNA:
 
         assert gmap == map2
 
+    def test_save_load_raster(self, saveloc_, monkeypatch):
+        """
+        the raster is saved with the map, so it doesn't need to be rebuilt
+        when loaded
+        """
+        gmap = MapFromBNA(testbnamap, 6, raster_size=10000)
+
+        _json_, zipfile_, _refs = gmap.save(saveloc_)
+
+        def build_raster(*args, **kwargs):
+            raise AssertionError('raster should not be rebuilt')
+
+        monkeypatch.setattr(MapFromBNA, 'build_raster', build_raster)
+
+        map2 = MapFromBNA.load(zipfile_)
+
+        assert gmap == map2
+        assert np.array_equal(gmap.raster, map2.raster)
+        assert gmap.projection == map2.projection
+        assert len(gmap.layers) == len(map2.layers)
+        for layer, layer2 in zip(gmap.layers, map2.layers):
+            assert np.array_equal(layer, layer2)
+
+    def test_save_dict_writes_no_file(self):
+        """
+        to_dict('save') only names the raster file -- it is written when
+        the map is saved
+        """
+        gmap = MapFromBNA(testbnamap, 6, raster_size=10000)
+        dict_ = gmap.to_dict('save')
+
+        assert dict_['raster_file'].endswith('_raster.npz')
+        assert not os.path.exists(dict_['raster_file'])
+
+    def test_raster_file_mismatch(self, saveloc_):
+        """
+        a raster saved with a different raster_size is not used
+        """
+        gmap = MapFromBNA(testbnamap, 6, raster_size=10000)
+        raster_file = os.path.join(saveloc_, 'raster.npz')
+        gmap._write_raster_file(raster_file)
+
+        map2 = MapFromBNA(testbnamap, 6, raster_size=20000,
+                          raster_file=raster_file)
+
+        assert map2.raster.size > gmap.raster.size
+
+    def test_raster_file_bna_changed(self, saveloc_, monkeypatch):
+        """
+        a raster saved before the bna file was edited is not used, even if
+        the land is in the same bounding box
+        """
+        bna_file = os.path.join(saveloc_, 'MapBounds_Island.bna')
+        shutil.copy(testbnamap, bna_file)
+
+        gmap = MapFromBNA(bna_file, 6, raster_size=10000)
+        raster_file = os.path.join(saveloc_, 'raster.npz')
+        gmap._write_raster_file(raster_file)
+
+        # same land, but not the same file
+        with open(bna_file) as bna:
+            text = bna.read()
+        with open(bna_file, 'w') as bna:
+            bna.write(text.rstrip() + ' \n')
+
+        built = []
+        build_raster = MapFromBNA.build_raster
+
+        def record_build(*args, **kwargs):
+            built.append(True)
+            return build_raster(*args, **kwargs)
+
+        monkeypatch.setattr(MapFromBNA, 'build_raster', record_build)
+
+        MapFromBNA(bna_file, 6, raster_size=10000, raster_file=raster_file)
+
+        assert built == [True]
+
     def test_update_from_dict_MapFromBNA(self):
         'test update_from_dict for MapFromBNA'
         gmap = MapFromBNA(testbnamap, 6)
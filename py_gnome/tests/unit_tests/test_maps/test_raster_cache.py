@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""
+Tests of the on-disk raster cache
+
+Designed to be run with py.test
+"""
+
+import os
+
+import pytest
+import numpy as np
+
+from gnome.maps import MapFromBNA
+from gnome.maps import raster_cache
+from gnome.maps.raster_cache import RasterCache
+
+
+basedir = os.path.dirname(__file__)
+basedir = os.path.split(basedir)[0]
+datadir = os.path.normpath(os.path.join(basedir, "sample_data"))
+testbnamap = os.path.join(datadir, 'MapBounds_Island.bna')
+
+
+@pytest.fixture
+def cache(tmpdir):
+    '''
+    turn the default cache on for a test
+    '''
+    yield raster_cache.set_default_cache(str(tmpdir.join('raster_cache')))
+
+    raster_cache.set_default_cache(None)
+
+
+def make_raster(shape=(100, 50)):
+    raster = np.zeros(shape, dtype=np.uint8)
+    raster[20:40, 10:30] = 1
+
+    return raster, [raster[::2, ::2].copy(), raster[::4, ::4].copy()]
+
+
+def test_put_get(tmpdir):
+    cache = RasterCache(str(tmpdir))
+    raster, layers = make_raster()
+
+    cache.put('a_key', raster, layers, image_size=[50, 100])
+    raster2, layers2, info = cache.get('a_key')
+
+    assert isinstance(raster2, np.memmap)
+    assert np.array_equal(raster, raster2)
+    assert len(layers2) == len(layers)
+    for layer, layer2 in zip(layers, layers2):
+        assert np.array_equal(layer, layer2)
+    assert info == {'image_size': [50, 100]}
+
+    # copy-on-write: changing it doesn't change the cache
+    raster2[:] = 1
+    assert np.array_equal(cache.get('a_key')[0], raster)
+
+
+def test_get_missing(tmpdir):
+    cache = RasterCache(str(tmpdir))
+
+    assert cache.get('not_a_key') is None
+
+
+def test_map_uses_cache(cache, monkeypatch):
+    '''
+    a second map from the same file and settings doesn't rebuild the raster
+    '''
+    gmap = MapFromBNA(testbnamap, 6, raster_size=10000)
+
+    assert cache.size > 0
+
+    def build_raster(*args, **kwargs):
+        raise AssertionError('raster should not be rebuilt')
+
+    monkeypatch.setattr(MapFromBNA, 'build_raster', build_raster)
+
+    map2 = MapFromBNA(testbnamap, 6, raster_size=10000)
+
+    assert np.array_equal(gmap.raster, map2.raster)
+    assert gmap.projection == map2.projection
+    assert len(gmap.layers) == len(map2.layers)
+    for layer, layer2 in zip(gmap.layers, map2.layers):
+        assert np.array_equal(layer, layer2)
+
+
+def test_map_raster_size_changed(cache):
+    '''
+    a different raster_size is a different entry in the cache
+    '''
+    gmap = MapFromBNA(testbnamap, 6, raster_size=10000)
+    raster = gmap.raster
+
+    gmap.raster_size = 20000
+    assert gmap.raster.size > raster.size
+    assert len(cache._entries()) == 2
+
+    # back to the first one -- from the cache
+    gmap.raster_size = 10000
+    assert np.array_equal(gmap.raster, raster)
+    assert len(cache._entries()) == 2
@@ -17,6 +17,7 @@ import gnome
 import gnome.scripting as gs
 from gnome.basic_types import datetime_value_2d
 from gnome.utilities.inf_datetime import InfDateTime
+from gnome.utilities.prefetch import netcdf_lock
 
 from gnome.maps import GnomeMap, MapFromBNA
 from gnome.environment import Wind, Tide, constant_wind, Water, Waves
@@ -35,7 +36,7 @@ from gnome.weatherers import (HalfLifeWeatherer,
                               Burn,
                               Skimmer,
                               Emulsification)
-from gnome.outputters import Renderer, TrajectoryGeoJsonOutput
+from gnome.outputters import Outputter, Renderer, TrajectoryGeoJsonOutput
 
 from .conftest import sample_model_weathering, testdata, test_oil
 from gnome.spill.substance import NonWeatheringSubstance
@@ -130,6 +131,273 @@ def test_init_with_mode():
         model = Model(mode='bogus')
 
 
+def test_init_with_cache_backend():
+    model = Model()
+    assert model.cache_backend == 'npz'
+    assert model.cache_enabled is False
+
+    model = Model(cache_enabled='memmap')
+    assert model.cache_backend == 'memmap'
+    assert model.cache_enabled is True
+
+    model.cache_backend = 'npz'
+    assert model.cache_backend == 'npz'
+    assert model.cache_enabled is True
+
+    with raises(ValueError):
+        model = Model(cache_backend='bogus')
+
+
+def test_memmap_cache_run():
+    """
+    the memmap cache should give the same data back as the npz cache
+    """
+    start_time = datetime(2012, 9, 15, 12, 0)
+    results = {}
+
+    for backend in ('npz', 'memmap'):
+        model = Model(start_time=start_time,
+                      duration=timedelta(hours=3),
+                      cache_enabled=backend)
+        model.movers += SimpleMover(velocity=(1., 2., 0.))
+        model.spills += point_line_release_spill(num_elements=10,
+                                                 start_position=(0., 0., 0.),
+                                                 release_time=start_time,
+                                                 end_release_time=start_time +
+                                                 timedelta(hours=2))
+        model.full_run()
+
+        results[backend] = [model._cache.load_timestep(step)
+                            for step in range(model.num_time_steps)]
+
+    for npz_scp, memmap_scp in zip(results['npz'], results['memmap']):
+        npz_sc = npz_scp.items()[0]
+        memmap_sc = memmap_scp.items()[0]
+
+        assert npz_sc.current_time_stamp == memmap_sc.current_time_stamp
+        assert np.array_equal(npz_sc['positions'], memmap_sc['positions'])
+        assert np.array_equal(npz_sc['id'], memmap_sc['id'])
+
+
+def test_get_spill_data():
+    """
+    query the live elements and the cached ones
+    """
+    start_time = datetime(2012, 9, 15, 12, 0)
+    model = Model(start_time=start_time,
+                  duration=timedelta(hours=3),
+                  cache_enabled=True)
+    model.movers += SimpleMover(velocity=(1., 2., 0.))
+    model.spills += point_line_release_spill(num_elements=10,
+                                             start_position=(0., 0., 0.),
+                                             release_time=start_time,
+                                             end_release_time=start_time +
+                                             timedelta(hours=2))
+    model.full_run()
+
+    sc = model.spills.items()[0]
+    result = model.get_spill_data(['id', 'positions'],
+                                  'positions[0] > 0 && age >= 7200')
+
+    mask = (sc['positions'][:, 0] > 0) & (sc['age'] >= 7200)
+    assert mask.any()
+    assert np.array_equal(result['id'], sc['id'][mask])
+    assert np.array_equal(result['positions'], sc['positions'][mask])
+
+    # from the cache
+    cached = model._cache.load_timestep(2).items()[0]
+    result = model.get_spill_data('id, age', 'age > 0', step=2)
+
+    assert np.array_equal(result['id'], cached['id'][cached['age'] > 0])
+    assert np.all(result['age'] > 0)
+
+
+class BadOutputter(Outputter):
+    """
+    raises an error when asked to write the given step
+    """
+    def __init__(self, bad_step, **kwargs):
+        self.bad_step = bad_step
+        super(BadOutputter, self).__init__(**kwargs)
+
+    def write_output(self, step_num, islast_step=False):
+        if step_num == self.bad_step:
+            raise ValueError('cannot write step {}'.format(step_num))
+
+
+def _background_output_model(output_queue_size):
+    start_time = datetime(2012, 9, 15, 12, 0)
+
+    model = Model(start_time=start_time,
+                  duration=timedelta(hours=3),
+                  cache_enabled=True,
+                  output_queue_size=output_queue_size)
+    model.movers += SimpleMover(velocity=(1., 2., 0.))
+    model.spills += point_line_release_spill(num_elements=10,
+                                             start_position=(0., 0., 0.),
+                                             release_time=start_time,
+                                             end_release_time=start_time +
+                                             timedelta(hours=2))
+    model.outputters += TrajectoryGeoJsonOutput()
+
+    return model
+
+
+def test_background_output_same_as_sync():
+    sync_model = _background_output_model(0)
+    sync_results = sync_model.full_run()
+
+    async_model = _background_output_model(2)
+    async_results = async_model.full_run()
+
+    assert async_results == sync_results
+
+    for step in range(sync_model.num_time_steps):
+        sync_sc = sync_model._cache.load_timestep(step).items()[0]
+        async_sc = async_model._cache.load_timestep(step).items()[0]
+
+        assert np.array_equal(sync_sc['positions'], async_sc['positions'])
+
+
+def test_background_output_lock():
+    """
+    the background writer uses netcdf_lock only while the model runs
+    """
+    users = netcdf_lock.users
+    model = _background_output_model(2)
+
+    model.step()
+    assert netcdf_lock.users == users + 1
+
+    model.full_run()
+    assert netcdf_lock.users == users
+
+
+def test_background_output_error():
+    """
+    an error writing output is raised from Model.step
+    """
+    model = _background_output_model(2)
+    model.outputters += BadOutputter(bad_step=1)
+
+    with raises(ValueError):
+        for step in model:
+            pass
+
+    # rewinding clears the error
+    model.outputters[-1].bad_step = -1
+    model.full_run()
+
+
+def _parallel_uncertain_model(parallel_uncertain):
+    start_time = datetime(2012, 9, 15, 12, 0)
+
+    model = Model(start_time=start_time,
+                  duration=timedelta(hours=6),
+                  uncertain=True,
+                  cache_enabled=True,
+                  parallel_uncertain=parallel_uncertain)
+    model.environment += Water()
+    model.movers += SimpleMover(velocity=(1., 2., 0.),
+                                uncertainty_scale=0.1)
+    model.movers += RandomMover(diffusion_coef=100000)
+    model.movers += WindMover(constant_wind(10, 45))
+    model.weatherers += HalfLifeWeatherer()
+    model.spills += point_line_release_spill(num_elements=100,
+                                             start_position=(0., 0., 0.),
+                                             release_time=start_time,
+                                             end_release_time=start_time +
+                                             timedelta(hours=4),
+                                             substance=test_oil,
+                                             amount=1000,
+                                             units='kg')
+
+    return model
+
+
+def test_parallel_uncertain_same_as_serial():
+    """
+    running the certain and uncertain spill containers at the same time
+    gives exactly the same results
+    """
+    serial_model = _parallel_uncertain_model(False)
+    serial_model.full_run()
+
+    parallel_model = _parallel_uncertain_model(True)
+    parallel_model.full_run()
+
+    for step in range(serial_model.num_time_steps):
+        serial_scs = serial_model._cache.load_timestep(step).items()
+        parallel_scs = parallel_model._cache.load_timestep(step).items()
+
+        for serial_sc, parallel_sc in zip(serial_scs, parallel_scs):
+            assert serial_sc.uncertain == parallel_sc.uncertain
+
+            for name in serial_sc.data_arrays:
+                assert np.array_equal(serial_sc[name], parallel_sc[name])
+
+
+def _prefetch_model(prefetch_slices):
+    current = gs.GridCurrent.from_netCDF(testdata['GridCurrentMover']
+                                         ['curr_tri'])
+    start_time = current.data_start
+    lon = np.asarray(current.grid.node_lon[:])
+    lat = np.asarray(current.grid.node_lat[:])
+
+    model = Model(start_time=start_time,
+                  time_step=3600,
+                  duration=timedelta(hours=12),
+                  cache_enabled=True,
+                  prefetch_slices=prefetch_slices)
+    model.movers += gs.PyCurrentMover(current=current)
+    model.spills += point_line_release_spill(num_elements=20,
+                                             start_position=(lon.mean(),
+                                                             lat.mean(),
+                                                             0.),
+                                             release_time=start_time)
+
+    return model
+
+
+def test_prefetch_same_as_not():
+    """
+    reading the gridded data ahead of time gives the same results
+    """
+    model = _prefetch_model(0)
+    model.full_run()
+    assert model.prefetch_stats is None
+
+    prefetch_model = _prefetch_model(2)
+    prefetch_model.full_run()
+    assert prefetch_model.prefetch_stats['misses'] >= 0
+
+    for step in range(model.num_time_steps):
+        sc = model._cache.load_timestep(step).items()[0]
+        prefetch_sc = prefetch_model._cache.load_timestep(step).items()[0]
+
+        assert np.array_equal(sc['positions'], prefetch_sc['positions'])
+
+    # counters start over with each run
+    prefetch_model.rewind()
+    assert prefetch_model.prefetch_stats['hits'] == 0
+
+
+def test_prefetch_slices_off():
+    """
+    turning prefetching off takes the prefetcher out of the environment
+    objects
+    """
+    model = _prefetch_model(2)
+    model.step()
+    current = model.movers[0].current
+    assert current.slice_cache.prefetcher is not None
+
+    model.prefetch_slices = 0
+
+    assert model.prefetch_stats is None
+    assert current.slice_cache.prefetcher is None
+
+
 def test_start_time():
     model = Model()
 
@@ -933,6 +1201,46 @@ def test_all_weatherers_in_model(model, add_langmuir):
     expected_keys = {'mass_components'}
     assert expected_keys.issubset(model.spills.LE_data)
 
+
+def test_weathering_times(model):
+    'the time spent in each weatherer is counted, for each run'
+    model.weatherers += HalfLifeWeatherer(name='half_life')
+    model.environment += Water()
+    model.full_run()
+
+    assert model.weathering_times['half_life'] > 0.0
+
+    model.rewind()
+    assert model.weathering_times['half_life'] == 0.0
+
+
+def test_random_streams():
+    '''
+    with random streams, an element's random moves don't depend on how many
+    other elements there are
+    '''
+    start_time = datetime(2020, 1, 1)
+    positions = []
+
+    for num_elements in (10, 20):
+        model = Model(start_time=start_time,
+                      duration=timedelta(hours=6),
+                      random_streams=True)
+        model.movers += RandomMover()
+        model.spills += point_line_release_spill(num_elements,
+                                                 (0.0, 0.0, 0.0),
+                                                 start_time)
+        model.full_run()
+
+        assert model.movers[0].random_stream == 1
+        assert model.map.random_stream == 0
+
+        positions.append(model.spills.LE('positions').copy())
+
+    assert np.all(positions[0][:, :2] != 0.0)
+    assert np.array_equal(positions[0], positions[1][:10])
+
+
 @pytest.mark.xfail()
 def test_setup_model_run(model):
     'turn of movers/weatherers and ensure data_arrays change'
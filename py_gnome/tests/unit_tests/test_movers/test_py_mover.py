@@ -6,9 +6,11 @@ Tests the Process methods and the Mover's get_move
 
 
 from datetime import datetime, timedelta
+from contextlib import contextmanager
 
 import numpy as np
 
+import pytest
 from pytest import raises
 from ..conftest import sample_sc_release
 
@@ -124,3 +126,82 @@ def test_get_move():
     delta = mv.get_move(sc, time_step, model_time)
 
     assert np.all(np.isnan(delta))
+
+
+class HintedGrid(object):
+    'records the hints it is given'
+    def __init__(self, id):
+        self.id = id
+        self.hints = []
+
+    @contextmanager
+    def hinted(self, cell_index):
+        self.hints.append(cell_index)
+        yield
+
+
+class UniformCurrent(object):
+    def __init__(self, grid_id='a_grid'):
+        self.grid = HintedGrid(grid_id)
+
+    def at(self, points, time):
+        return np.tile((0.5, 0.25, 0.0), (len(points), 1))
+
+
+class HintedMover(PyMover):
+    'a PyMover that uses velocities from the fields it is given'
+    def __init__(self, *vel_fields, **kwargs):
+        super(HintedMover, self).__init__(**kwargs)
+        self.vel_fields = vel_fields
+
+    def _vel_fields(self):
+        return self.vel_fields
+
+
+@pytest.mark.parametrize("method", ('Euler', 'RK2', 'RK4'))
+def test_cell_hints(method):
+    """
+    the RK stages are done with the elements' cell_index as hints
+    """
+    time_step = 15 * 60  # seconds
+    model_time = datetime(2012, 8, 20, 13)
+
+    current = UniformCurrent()
+    mv = HintedMover(current)
+    assert 'cell_index_a_grid' in mv.all_array_types
+
+    sc = sample_sc_release(10, (0, 0, 0), arr_types=mv.all_array_types)
+    assert np.all(sc['cell_index_a_grid'] == -1)
+
+    delta = mv.delta_method(method)(sc, time_step, model_time,
+                                    sc['positions'], current)
+
+    assert len(current.grid.hints) == 1
+    assert current.grid.hints[0] is sc['cell_index_a_grid']
+    assert np.allclose(delta, np.array((0.5, 0.25, 0.0)) * time_step)
+
+    # no spill container, no hints
+    mv.delta_method(method)(None, time_step, model_time,
+                            sc['positions'], current)
+    assert len(current.grid.hints) == 1
+
+
+def test_cell_hints_per_grid():
+    """
+    fields on different grids each get their own cell_index array
+    """
+    time_step = 15 * 60  # seconds
+    model_time = datetime(2012, 8, 20, 13)
+
+    current = UniformCurrent('current_grid')
+    wind = UniformCurrent('wind_grid')
+    mv = HintedMover(current, wind)
+
+    sc = sample_sc_release(10, (0, 0, 0), arr_types=mv.all_array_types)
+
+    for vel_field in (current, wind):
+        mv.get_delta_Euler(sc, time_step, model_time, sc['positions'],
+                           vel_field)
+
+    assert current.grid.hints[0] is sc['cell_index_current_grid']
+    assert wind.grid.hints[0] is sc['cell_index_wind_grid']
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+"""
+Tests of the on-disk topology cache
+
+Designed to be run with py.test
+"""
+
+import os
+
+import pytest
+import numpy as np
+import netCDF4
+
+from gnome.movers import GridCurrentMover
+from gnome.movers import topology_cache
+from gnome.movers.topology_cache import TopologyCache, grid_hash
+
+from ..conftest import testdata
+
+
+curr_file = testdata['GridCurrentMover']['curr_curv']
+
+
+@pytest.fixture
+def cache(tmpdir):
+    '''
+    turn the default cache on for a test
+    '''
+    yield topology_cache.set_default_cache(str(tmpdir.join('topology')))
+
+    topology_cache.set_default_cache(None)
+
+
+def write_topology(contents='topology'):
+    '''
+    a stand-in for the export_topology() of a mover
+    '''
+    def export_topology(filename):
+        with open(filename, 'w') as outfile:
+            outfile.write(contents)
+
+    return export_topology
+
+
+def make_grid_file(filename, mask, u=0.0):
+    with netCDF4.Dataset(filename, 'w') as ds:
+        ds.createDimension('time', None)
+        ds.createDimension('y', 3)
+        ds.createDimension('x', 4)
+
+        lon = ds.createVariable('lon', 'f8', ('y', 'x'))
+        lon[:] = np.arange(12.0).reshape(3, 4)
+        if mask.ndim == 3:
+            # wetting and drying
+            mask_var = ds.createVariable('wetdry_mask', 'f8',
+                                         ('time', 'y', 'x'))
+        else:
+            mask_var = ds.createVariable('mask', 'f8', ('y', 'x'))
+        mask_var[:] = mask
+        u_var = ds.createVariable('u', 'f8', ('time', 'y', 'x'))
+        u_var[0] = u
+
+
+def test_grid_hash(tmpdir):
+    '''
+    the data can change without changing the hash -- the mask can't
+    '''
+    fn = str(tmpdir.join('grid.nc'))
+    mask = np.ones((3, 4))
+
+    make_grid_file(fn, mask)
+    hash1 = grid_hash(fn)
+
+    make_grid_file(fn, mask, u=1.0)
+    assert grid_hash(fn) == hash1
+
+    mask[1, 2] = 0
+    make_grid_file(fn, mask)
+    assert grid_hash(fn) != hash1
+
+
+def test_grid_hash_time_dependent_mask(tmpdir):
+    '''
+    a mask that changes with time is part of the hash
+    '''
+    fn = str(tmpdir.join('grid.nc'))
+    mask = np.ones((1, 3, 4))
+
+    make_grid_file(fn, mask)
+    hash1 = grid_hash(fn)
+
+    make_grid_file(fn, mask, u=1.0)
+    assert grid_hash(fn) == hash1
+
+    mask[0, 1, 2] = 0
+    make_grid_file(fn, mask)
+    assert grid_hash(fn) != hash1
+
+
+def test_grid_hash_not_netcdf(tmpdir):
+    fn = str(tmpdir.join('filelist.txt'))
+
+    with open(fn, 'w') as outfile:
+        outfile.write('NetCDF Files\n[FILE] a_file.nc\n')
+    hash1 = grid_hash(fn)
+
+    with open(fn, 'w') as outfile:
+        outfile.write('NetCDF Files\n[FILE] another_file.nc\n')
+
+    assert grid_hash(fn) != hash1
+
+
+def test_put_get(tmpdir):
+    cache = TopologyCache(str(tmpdir))
+
+    topology = cache.put('a_key', write_topology('some topology'))
+
+    assert cache.get('a_key') == topology
+    with open(topology) as infile:
+        assert infile.read() == 'some topology'
+
+
+def test_get_missing(tmpdir):
+    cache = TopologyCache(str(tmpdir))
+
+    assert cache.get('not_a_key') is None
+
+
+def test_put_nothing_exported(tmpdir):
+    '''
+    a grid without a topology to export doesn't add an entry
+    '''
+    cache = TopologyCache(str(tmpdir))
+
+    assert cache.put('a_key', lambda filename: None) is None
+    assert cache.get('a_key') is None
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_mover_uses_cache(cache):
+    '''
+    the topology is built and added to the cache by the first mover, and
+    read from the cache by the second
+    '''
+    curr = GridCurrentMover(curr_file)
+
+    assert len(cache._entries()) == 1
+
+    curr2 = GridCurrentMover(curr_file)
+
+    assert len(cache._entries()) == 1
+
+    # the cache can remove its files -- the movers don't point to them
+    assert curr.topology_file is None
+    assert curr2.topology_file is None
+
+    assert np.array_equal(curr.mover._get_triangle_data(),
+                          curr2.mover._get_triangle_data())
@@ -12,11 +12,14 @@ tests for geojson outputter
 # from builtins import *
 
 import os
+import io
+import gzip
 from glob import glob
 from datetime import timedelta
 
 import numpy as np
 import pytest
+import geojson
 
 from gnome.outputters import TrajectoryGeoJsonOutput
 from gnome.spill import SpatialRelease, Spill, point_line_release_spill
@@ -65,6 +68,43 @@ def test_init():
     assert g.output_dir is None
     assert g.round_to == 4
     assert g.round_data
+    assert not g.gzip_output
+
+
+@pytest.mark.parametrize("gzip_output", [False, True])
+def test_same_as_geojson_dump(model, output_dir, gzip_output):
+    '''
+    the files have the same text as geojson.dump() of the FeatureCollection
+    '''
+    o_geojson = model.outputters[-1]
+    o_geojson.gzip_output = gzip_output
+    o_geojson._chunk_size = 3
+
+    model.rewind()
+    for step in model:
+        filename = step['TrajectoryGeoJsonOutput']['output_filename']
+
+        if gzip_output:
+            assert filename.endswith('.geojson.gz')
+            with gzip.open(filename, 'rt') as infile:
+                text = infile.read()
+        else:
+            with open(filename) as infile:
+                text = infile.read()
+
+        # the uncertain collection is the one written last
+        scs = list(model._cache.load_timestep(step['step_num']).items())
+        _c_fc, uc_fc = o_geojson._feature_collections(scs)
+
+        expected = io.StringIO()
+        geojson.dump(uc_fc, expected, indent=True)
+
+        assert text == expected.getvalue()
+
+    o_geojson.clean_output_files()
+    assert glob(os.path.join(output_dir, 'geojson_*')) == []
+
+    o_geojson.gzip_output = False
 
 
 def test_clean_output_files(model, output_dir):
@@ -10,8 +10,16 @@ VERY incomplete!
 
 
 
+import base64
+from datetime import datetime
+
+import numpy as np
 import pytest
 
+import gnome.utilities.rand
+from gnome.model import Model
+from gnome.movers import RandomMover
+from gnome.spill import point_line_release_spill
 from gnome.outputters.json import SpillJsonOutput
 
 
@@ -41,6 +49,63 @@ def test_deserialize():
     print(sjo)
 
 
+def test_bad_encoding():
+    with pytest.raises(ValueError):
+        SpillJsonOutput(encoding='xml')
+
+
+def run_step(encoding):
+    '''
+    output of the second step of a small model, with the given encoding
+    '''
+    start_time = datetime(2020, 1, 1)
+    model = Model(start_time=start_time, time_step=900, uncertain=True)
+    model.spills += point_line_release_spill(100,
+                                             start_position=(-120, 30, 0),
+                                             release_time=start_time,
+                                             amount=100,
+                                             units='kg')
+    model.movers += RandomMover()
+    model.outputters += SpillJsonOutput(_additional_data=['age',
+                                                          'positions'],
+                                        encoding=encoding)
+
+    model.step()
+    return model.step()['SpillJsonOutput']
+
+
+@pytest.mark.parametrize('encoding', ['base64', 'binary'])
+def test_binary_encoding(encoding):
+    '''
+    the buffers hold the same data as the json lists
+    '''
+    gnome.utilities.rand.seed(1)
+    json_out = run_step('json')
+
+    gnome.utilities.rand.seed(1)
+    bin_out = run_step(encoding)
+
+    assert bin_out['step_num'] == json_out['step_num']
+
+    for key in ('certain', 'uncertain'):
+        for js, bn in zip(json_out[key], bin_out[key]):
+            assert bn['length'] == js['length']
+            assert bn['encoding'] == encoding
+
+            for name in ('longitude', 'latitude', 'status', 'mass',
+                         'spill_num', 'age', 'positions'):
+                buf = bn[name]
+                if encoding == 'base64':
+                    buf = base64.b64decode(buf)
+
+                array = np.frombuffer(buf, dtype=bn['dtypes'][name])
+                array = array.reshape(bn['shapes'][name])
+
+                assert array.shape == np.shape(js[name])
+
+                assert np.allclose(array, js[name], rtol=1e-6, atol=1e-4)
+
+
 
 # @pytest.mark.parametrize(("json_"), ['save', 'webapi'])
 # # @pytest.mark.parametrize(("json_"), ['webapi']) # only used for web api fo
@@ -23,7 +23,7 @@ from gnome.spill_container import SpillContainerPair
 from gnome.weatherers import Evaporation
 from gnome.environment import Water
 from gnome.movers import RandomMover, constant_wind_mover
-from gnome.outputters import NetCDFOutput
+from gnome.outputters import NetCDFOutput, NetCDFReader
 from gnome.model import Model
 from ..conftest import test_oil
 
@@ -365,6 +365,139 @@ def test_run_without_spills(model):
     _run_model(model)
 
 
+@pytest.mark.parametrize("flush_interval", [1, 3, 100])
+def test_flush_interval(model, flush_interval):
+    """
+    the data written should not depend on how many steps are buffered
+    """
+    o_put = [model.outputters[outputter.id]
+             for outputter in model.outputters
+             if isinstance(outputter, NetCDFOutput)][0]
+    o_put.flush_interval = flush_interval
+
+    model.rewind()
+    _run_model(model)
+
+    # files are closed at the end of the run
+    assert o_put._datasets == {}
+
+    uncertain = False
+    for file_ in (o_put.filename, o_put._u_filename):
+        with nc.Dataset(file_) as data:
+            dv = data.variables
+
+            assert len(dv['time']) == model.num_time_steps
+
+            idx = np.cumsum(dv['particle_count'][:])
+            idx = np.insert(idx, 0, 0)
+
+            for step in range(model.num_time_steps):
+                scp = model._cache.load_timestep(step)
+
+                assert (dv['particle_count'][step] ==
+                        len(scp.LE('positions', uncertain)))
+                assert np.allclose(dv['longitude'][idx[step]:idx[step + 1]],
+                                   scp.LE('positions', uncertain)[:, 0],
+                                   rtol=0, atol=1e-5)
+                assert np.all(dv['id'][idx[step]:idx[step + 1]] ==
+                              scp.LE('id', uncertain))
+
+        uncertain = True
+
+
+def test_reader_random_access(model):
+    """
+    NetCDFReader reads any step directly, using the particle_start index
+    """
+    o_put = [model.outputters[outputter.id]
+             for outputter in model.outputters
+             if isinstance(outputter, NetCDFOutput)][0]
+
+    _run_model(model)
+
+    uncertain = False
+    for file_ in (o_put.filename, o_put._u_filename):
+        with NetCDFReader(file_) as reader:
+            assert 'particle_start' in reader.dataset.variables
+            assert len(reader) == model.num_time_steps
+            assert len(reader.offsets) == model.num_time_steps + 1
+
+            # read out of order
+            for step in reversed(range(model.num_time_steps)):
+                scp = model._cache.load_timestep(step)
+                (nc_data, mb) = reader.read_step(step)
+
+                assert (nc_data['current_time_stamp'].item() ==
+                        scp.LE('current_time_stamp', uncertain))
+                assert np.all(nc_data['id'] == scp.LE('id', uncertain))
+                assert np.allclose(nc_data['positions'],
+                                   scp.LE('positions', uncertain),
+                                   rtol=0, atol=1e-5)
+                assert mb == scp.LE('mass_balance', uncertain)
+
+            for step, (nc_data, mb) in enumerate(reader.iter_steps()):
+                (data_by_index, _mb) = NetCDFOutput.read_data(file_,
+                                                              index=step)
+                assert np.all(nc_data['id'] == data_by_index['id'])
+
+            # a slice of steps as one array
+            ids = reader.read_arrays(['id'], 1, 4)['id']
+            offsets = reader.offsets
+            assert len(ids) == offsets[4] - offsets[1]
+            for step in range(1, 4):
+                scp = model._cache.load_timestep(step)
+                start = offsets[step] - offsets[1]
+                stop = offsets[step + 1] - offsets[1]
+                assert np.all(ids[start:stop] == scp.LE('id', uncertain))
+
+            with raises(IndexError):
+                reader.read_step(model.num_time_steps)
+
+        uncertain = True
+
+
+def test_reader_legacy_file(output_filename):
+    """
+    files without the particle_start variable compute the offsets from
+    particle_count
+    """
+    counts = [2, 0, 3, 1]
+    start_time = datetime(2015, 1, 1)
+
+    with nc.Dataset(output_filename, 'w') as data:
+        data.createDimension('time', None)
+        data.createDimension('data', None)
+
+        time_ = data.createVariable('time', np.float64, ('time',))
+        time_.units = 'seconds since {0}'.format(start_time.isoformat())
+        time_.calendar = 'gregorian'
+        time_[:] = np.arange(len(counts)) * 900.
+
+        data.createVariable('particle_count', np.int32,
+                            ('time',))[:] = counts
+        for var in ('longitude', 'latitude', 'depth'):
+            data.createVariable(var, np.float64,
+                                ('data',))[:] = np.arange(sum(counts))
+        data.createVariable('id', np.int32,
+                            ('data',))[:] = np.arange(sum(counts))
+
+    with NetCDFReader(output_filename) as reader:
+        assert np.all(reader.offsets == [0, 2, 2, 5, 6])
+
+        (nc_data, mb) = reader.read_step(2, ['id', 'positions'])
+        assert np.all(nc_data['id'] == [2, 3, 4])
+        assert np.all(nc_data['positions'][:, 0] == [2, 3, 4])
+        assert (nc_data['current_time_stamp'].item() ==
+                start_time + timedelta(seconds=1800))
+        assert mb == {}
+
+        assert len(reader.read_step(1, ['id'])[0]['id']) == 0
+
+    # computed once, then cached
+    with NetCDFReader(output_filename) as reader:
+        assert reader.offsets is reader._legacy_offsets()
+
+
 @pytest.mark.slow
 def test_read_data_exception(model):
     """
@@ -17,9 +17,10 @@ NOTE: some of these only really test if the code crashes
 import os
 from os.path import basename
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
+import numpy as np
 import numpy.random as random
 
 from gnome.basic_types import oil_status
@@ -228,6 +229,68 @@ def test_write_output(output_dir):
     r.save_foreground(os.path.join(output_dir, 'just_elements.png'))
 
 
+@pytest.mark.parametrize("num_workers", (1, 2))
+def test_render_post_run(output_dir, num_workers):
+    """
+    the frames drawn after the run are the same as the ones drawn as it goes
+    """
+    N = 100
+    sc = sample_sc_release(num_elements=N)
+    cache = FakeCache(sc)
+
+    images = []
+    for render_post_run in (False, True):
+        frame_dir = os.path.join(output_dir, 'post_run_{}'.format(render_post_run))
+        os.makedirs(frame_dir, exist_ok=True)
+
+        r = Renderer(bna_star,
+                     frame_dir,
+                     image_size=(400, 400),
+                     formats=['png'],
+                     render_post_run=render_post_run,
+                     num_workers=num_workers)
+        r.draw_background()
+        r.cache = cache
+
+        (min_lon, min_lat), (max_lon, max_lat) = r.map_BB
+        random.seed(1)
+        sc['positions'][:, 0] = random.uniform(min_lon, max_lon, (N, ))
+        sc['positions'][:, 1] = random.uniform(min_lat, max_lat, (N, ))
+
+        filenames = [r.write_output(step)['image_filename']
+                     for step in range(3)]
+        r.post_model_run()
+
+        images.append([open(f, 'rb').read() for f in filenames])
+
+    assert images[0] == images[1]
+
+
+def test_render_post_run_time_stamp(output_dir):
+    """
+    while the model runs, the time stamp of a frame that is drawn later
+    comes from the model time, not from loading the step
+    """
+    class NoLoadCache(FakeCache):
+        enabled = True
+
+        def load_timestep(self, step):
+            raise AssertionError('step {} was loaded'.format(step))
+
+    r = Renderer(bna_star, output_dir, image_size=(400, 400),
+                 formats=['png'], render_post_run=True)
+    start_time = datetime(2020, 1, 1, 12)
+    r.prepare_for_model_run(start_time,
+                            cache=NoLoadCache(sample_sc_release(10)),
+                            model_time_step=900)
+
+    for step in range(3):
+        r.prepare_for_model_step(900, start_time + timedelta(seconds=900 * step))
+        info = r.write_output(step)
+
+        assert info['time_stamp'] == start_time + timedelta(seconds=900 * step)
+
+
 def test_render_beached_elements(output_dir):
 
     r = Renderer(bna_sample,
@@ -358,6 +421,29 @@ def test_draw_raster_map(output_dir):
     r.save_background(os.path.join(output_dir, 'raster_map_render.png'))
 
 
+def test_draw_raster_map_fill():
+    """
+    the image pixels over land cells of the raster are filled
+    """
+    import gnome
+
+    r = Renderer(bna_sample, image_size=(400, 300))
+    r.draw_background()
+
+    r.raster_map = gnome.map.MapFromBNA(bna_sample,
+                                        raster_size=10000)
+    r.raster_map_outline = False
+    r.draw_raster_map()
+
+    image = r.back_asarray()
+    filled = image == r.back_image.get_color_index('raster_map')
+    assert np.any(filled)
+
+    cells = r.raster_map.projection.to_pixel(
+        r.projection.to_lonlat(np.argwhere(filled)), asint=True)
+    assert np.all(r.raster_map.raster[cells[:, 0], cells[:, 1]] == 1)
+
+
 def test_serialize_deserialize(output_dir):
     # non-defaults to check properly..
     r = Renderer(map_filename=bna_sample,
@@ -98,6 +98,28 @@ class TestSpatialRelease(object):
         sr.update_from_dict(ser)
         assert all([w1 == w2 for w1, w2 in zip(sr.weights, [0.75, 0.25])])
 
+    def test_initialize_LEs(self):
+        polys = [shapely.geometry.Polygon([[0,0],[3,0],[3,3],[0,3]]),
+                 shapely.geometry.Polygon([[4,0],[5,0],[5,1],[4,1]])]
+        sr = SpatialRelease(polygons=polys, weights=weights)
+        sr.prepare_for_model_run(900)
+        assert sr._tri_coords.shape == (len(sr._tris), 3, 2)
+
+        num = 1000
+        data = {'positions': np.ones((num, 3)),
+                'mass': np.zeros((num,)),
+                'init_mass': np.zeros((num,))}
+        sr.initialize_LEs(num, data, sr.release_time, 900)
+
+        assert np.all(data['positions'][:, 2] == 0)
+        in_poly = np.array([[p.buffer(1e-9).contains(shapely.geometry.Point(pt[:2]))
+                             for p in polys]
+                            for pt in data['positions']])
+        assert np.all(in_poly.any(axis=1))
+        # weights are per polygon
+        assert np.isclose(in_poly[:, 0].mean(), weights[0], atol=0.05)
+
+
 class TestNESDISRelease(object):
 
     def test_construction(self):
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+"""
+tests for the SpillContainer's storage of the data arrays
+
+designed to be run with py.test
+"""
+
+import numpy as np
+
+import pytest
+
+from gnome.basic_types import oil_status, fate
+
+from .conftest import sample_sc_release
+
+
+def test_append_data_arrays():
+    sc = sample_sc_release(num_elements=10)
+    positions = sc['positions'].copy()
+    buffers = dict(sc._buffers)
+
+    sc._append_data_arrays(5)
+
+    assert len(sc) == 15
+    assert np.array_equal(sc['positions'][:10], positions)
+
+    for name in sc.array_types:
+        assert len(sc[name]) == 15
+        # there was room -- nothing was reallocated
+        assert sc._buffers[name] is buffers[name]
+
+
+def test_storage_grows():
+    sc = sample_sc_release(num_elements=10)
+    positions = sc['positions'].copy()
+
+    sc._append_data_arrays(10 * sc._min_capacity)
+
+    assert len(sc) == 10 * sc._min_capacity + 10
+    assert np.array_equal(sc['positions'][:10], positions)
+
+    for name in sc.array_types:
+        assert len(sc._buffers[name]) >= len(sc)
+        assert sc[name].base is sc._buffers[name]
+
+
+@pytest.mark.parametrize("max_block_moves", [1000, 2])
+def test_model_step_is_done(max_block_moves):
+    """
+    removed elements are taken out, and the rest keep their order
+    """
+    sc = sample_sc_release(num_elements=20)
+    sc._max_block_moves = max_block_moves
+    removed = [0, 3, 4, 11, 19]
+
+    sc['status_codes'][removed] = oil_status.to_be_removed
+    expected = dict((name, np.delete(sc[name], removed, axis=0))
+                    for name in sc.array_types)
+
+    sc.model_step_is_done()
+
+    assert len(sc) == 15
+    for name in sc.array_types:
+        assert np.array_equal(sc[name], expected[name])
+
+    # and the storage can still be appended to
+    sc._append_data_arrays(3)
+
+    assert len(sc) == 18
+    assert np.array_equal(sc['id'][:15], expected['id'])
+
+
+def test_replaced_array():
+    """
+    an array replaced with __setitem__ gets copied into the storage
+    """
+    sc = sample_sc_release(num_elements=10)
+    mass = sc['mass'] * 2
+
+    sc['mass'] = mass
+    sc._append_data_arrays(5)
+
+    assert np.array_equal(sc['mass'][:10], mass)
+    assert sc['mass'].base is sc._buffers['mass']
+
+
+def _mixed_fates_sc():
+    sc = sample_sc_release(num_elements=20)
+
+    sc['fate_status'][:] = fate.surface_weather
+    sc['fate_status'][::3] = fate.subsurf_weather
+    sc['mass'][[4, 5]] = 0.0
+
+    return sc
+
+
+def test_partition_by_fate():
+    sc = _mixed_fates_sc()
+    by_id = dict((name, sc[name][np.argsort(sc['id'])])
+                 for name in sc.array_types)
+
+    sc.partition_by_fate()
+
+    # surface, subsurface, then no mass
+    assert np.all(sc['fate_status'][:-2] ==
+                  np.sort(sc['fate_status'][:-2]))
+    assert np.all(sc['mass'][:-2] > 0)
+    assert np.all(sc['mass'][-2:] == 0)
+
+    # the data for each element moved with it
+    order = np.argsort(sc['id'])
+    for name in sc.array_types:
+        assert np.array_equal(sc[name][order], by_id[name])
+        assert sc[name].base is sc._buffers[name]
+
+
+def test_fate_data_views():
+    """
+    once partitioned, the weatherers get views of the arrays, and arrays
+    they replace are copied back
+    """
+    sc = _mixed_fates_sc()
+    sc.partition_by_fate()
+    surface = ((sc['fate_status'] == fate.surface_weather) &
+               (sc['mass'] > 0))
+
+    _substance, data = sc.itersubstancedata({'mass', 'age'})[0]
+
+    assert len(data['mass']) == surface.sum()
+    assert np.shares_memory(data['mass'], sc['mass'])
+
+    data['mass'][:] = 2.0
+    data['age'] = np.full_like(data['age'], 100)
+    sc.update_from_fatedataview()
+
+    assert np.all(sc['mass'][surface] == 2.0)
+    assert np.all(sc['age'][surface] == 100)
+    assert not np.any(sc['age'][~surface] == 100)
+
+
+@pytest.mark.parametrize("partition", (False, True))
+def test_shared_fate_data_view(partition):
+    """
+    a shared view is handed out again until it is flushed, and the SC
+    arrays end up the same as with a view per weatherer
+    """
+    sc = _mixed_fates_sc()
+    if partition:
+        sc.partition_by_fate()
+    surface = ((sc['fate_status'] == fate.surface_weather) &
+               (sc['mass'] > 0))
+    mass = sc['mass'].copy()
+
+    sc.share_fatedataview()
+
+    _substance, data = sc.itersubstancedata({'mass', 'fate_status'})[0]
+    data['mass'] = data['mass'] / 2
+    sc.update_from_fatedataview()
+
+    _substance, data2 = sc.itersubstancedata({'mass', 'age'})[0]
+    assert data2 is data
+    assert np.all(data['mass'] == mass[surface] / 2)
+
+    data['age'][:] = 100
+    sc.update_from_fatedataview()
+
+    sc.flush_fatedataview()
+
+    assert np.all(sc['mass'][surface] == mass[surface] / 2)
+    assert np.all(sc['mass'][~surface] == mass[~surface])
+    assert np.all(sc['age'][surface] == 100)
+    assert not np.any(sc['age'][~surface] == 100)
+
+
+def test_shared_fate_data_view_fate_change():
+    """
+    a weatherer taking elements out of the fate closes the shared view
+    """
+    sc = _mixed_fates_sc()
+    sc.share_fatedataview()
+
+    _substance, data = sc.itersubstancedata({'mass', 'fate_status'})[0]
+    data['fate_status'][:2] = fate.skim
+    sc.update_from_fatedataview()
+
+    assert np.sum(sc['fate_status'] == fate.skim) == 2
+
+    _substance, data2 = sc.itersubstancedata({'mass', 'fate_status'})[0]
+    assert data2 is not data
+    assert len(data2['mass']) == len(data['mass']) - 2
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+tests for the BackgroundWriter
+
+designed to be run with py.test
+"""
+
+import time
+import threading
+
+import pytest
+
+from gnome.utilities.background_writer import BackgroundWriter
+
+
+def test_runs_in_order():
+    writer = BackgroundWriter(max_pending=2)
+    results = []
+
+    def job(i):
+        time.sleep(0.001)
+        results.append(i)
+
+    for i in range(20):
+        writer.submit(job, i)
+
+    writer.flush()
+
+    assert results == list(range(20))
+
+
+def test_not_on_calling_thread():
+    writer = BackgroundWriter()
+    threads = []
+
+    writer.submit(lambda: threads.append(threading.current_thread()))
+    writer.flush()
+
+    assert threads[0] is not threading.current_thread()
+
+
+def test_back_pressure():
+    """
+    submit() blocks once max_pending jobs are waiting
+    """
+    writer = BackgroundWriter(max_pending=1)
+    release = threading.Event()
+
+    writer.submit(release.wait)  # picked up by the worker, which blocks
+    time.sleep(0.05)
+    writer.submit(lambda: None)  # fills the queue
+
+    submitted = threading.Event()
+
+    def submit_another():
+        writer.submit(lambda: None)
+        submitted.set()
+
+    threading.Thread(target=submit_another).start()
+
+    assert not submitted.wait(0.1)
+
+    release.set()
+    assert submitted.wait(1.0)
+
+    writer.flush()
+
+
+def test_error_propagation():
+    writer = BackgroundWriter()
+    results = []
+
+    def bad_job():
+        raise ValueError('a bad job')
+
+    writer.submit(bad_job)
+    writer.submit(results.append, 1)  # skipped after the error
+
+    with pytest.raises(ValueError):
+        writer.flush()
+
+    assert results == []
+
+    # the error is only raised once
+    writer.submit(results.append, 2)
+    writer.flush()
+
+    assert results == [2]
+
+
+def test_reset_clears_error():
+    writer = BackgroundWriter()
+
+    writer.submit(lambda: 1 / 0)
+    writer.reset()
+
+    writer.check()
+
+
+def test_stop():
+    writer = BackgroundWriter()
+    results = []
+
+    writer.submit(results.append, 1)
+    writer.stop()
+
+    assert results == [1]
+    assert writer._thread is None
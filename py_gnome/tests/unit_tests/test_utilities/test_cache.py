@@ -362,6 +362,70 @@ def test_rewind():
     c.save_timestep(0, scp)
 
 
+@pytest.mark.parametrize("enabled", [True, False])
+def test_memmap_write_and_read_back(enabled):
+    """
+    the memmap cache returns the saved data
+
+    if it is not enabled, only the most recent step is kept
+    """
+    c = cache.MemmapElementCache(enabled=enabled)
+    c.initial_capacity = 16  # so the files have to grow
+
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    u_sc = sample_sc_release(num_elements=10, start_pos=(4.14, 3.72, 2.2),
+                             uncertain=True)
+    scp = SpillContainerPairData(sc, u_sc)
+
+    positions = []
+    for step in range(4):
+        sc.current_time_stamp = dt + tdelta * step
+        sc['positions'] += 1.1
+        u_sc['positions'] += 1.1
+        positions.append((sc['positions'].copy(), u_sc['positions'].copy()))
+
+        c.save_timestep(step, scp)
+
+    for step, (pos, u_pos) in enumerate(positions):
+        if not enabled and step < 3:
+            with pytest.raises(cache.CacheError):
+                c.load_timestep(step)
+            continue
+
+        scp_step = c.load_timestep(step)
+        assert np.array_equal(scp_step._spill_container['positions'], pos)
+        assert np.array_equal(scp_step._u_spill_container['positions'], u_pos)
+        assert scp_step._spill_container.current_time_stamp == dt + tdelta * step
+
+
+def test_memmap_read_only_views():
+    c = cache.MemmapElementCache()
+
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    c.save_timestep(0, SpillContainerPairData(sc))
+    c.save_timestep(1, SpillContainerPairData(sc))
+
+    for step in (0, 1):
+        positions = c.load_timestep(step)._spill_container['positions']
+        with pytest.raises(ValueError):
+            positions[0, 0] = 0.0
+
+
+def test_memmap_rewind():
+    c = cache.MemmapElementCache()
+
+    sc = sample_sc_release(num_elements=10, start_pos=(3.14, 2.72, 1.2))
+    c.save_timestep(0, SpillContainerPairData(sc))
+    c.rewind()
+
+    with pytest.raises(cache.CacheError):
+        c.load_timestep(0)
+
+    # make sure it works again:
+    c.save_timestep(0, SpillContainerPairData(sc))
+    assert np.array_equal(c.load_timestep(0)._spill_container['positions'],
+                          sc['positions'])
+
 #    assert False
 
 if __name__ == '__main__':
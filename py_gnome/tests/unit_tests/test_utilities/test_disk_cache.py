@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+Tests of the on-disk cache base
+
+Designed to be run with py.test
+"""
+
+import os
+
+import numpy as np
+
+from gnome.utilities.disk_cache import DiskCache, DefaultCache, file_hash
+
+
+class TextCache(DiskCache):
+    '''
+    a minimal cache of text files
+    '''
+    _suffix = '.txt'
+
+    def put(self, key, text):
+        with open(self._entry_path(key), 'w') as outfile:
+            outfile.write(text)
+
+        self.evict(keep=key)
+
+    def get(self, key):
+        if not self._touch(key):
+            return None
+
+        with open(self._entry_path(key)) as infile:
+            return infile.read()
+
+
+def test_file_hash(tmpdir):
+    fn = str(tmpdir.join('a_file.txt'))
+
+    with open(fn, 'w') as outfile:
+        outfile.write('some data')
+    hash1 = file_hash(fn)
+
+    with open(fn, 'w') as outfile:
+        outfile.write('some other data')
+
+    assert file_hash(fn) != hash1
+
+
+def test_make_key():
+    key = DiskCache.make_key('abc', 1000.0, np.array([[0., 1.], [2., 3.]]))
+
+    assert key == DiskCache.make_key('abc', 1000.0,
+                                     np.array([[0., 1.], [2., 3.]]))
+    assert key != DiskCache.make_key('abc', 2000.0,
+                                     np.array([[0., 1.], [2., 3.]]))
+    assert key != DiskCache.make_key('abd', 1000.0,
+                                     np.array([[0., 1.], [2., 3.]]))
+
+
+def test_make_key_version():
+    '''
+    a new version of a cache doesn't find the old entries
+    '''
+    class NewTextCache(TextCache):
+        cache_version = 2
+
+    assert TextCache.make_key('abc') != NewTextCache.make_key('abc')
+
+
+def test_entries(tmpdir):
+    '''
+    temp files, and files that aren't entries, are left alone
+    '''
+    cache = TextCache(str(tmpdir), max_size=1024)
+
+    cache.put('a_key', 'some text')
+    tmpdir.join('.tmp-abc.txt').write('half written')
+    tmpdir.join('a_key.dat').write('not an entry')
+
+    assert [e[2] for e in cache._entries()] == ['a_key']
+
+    cache.clear()
+    assert sorted(os.listdir(str(tmpdir))) == ['.tmp-abc.txt', 'a_key.dat']
+
+
+def test_evict(tmpdir):
+    cache = TextCache(str(tmpdir), max_size=1024)
+
+    for key in ('first', 'second', 'third'):
+        cache.put(key, 'some text')
+    entry_size = cache.size // 3
+
+    # make the second one the least recently used
+    os.utime(os.path.join(str(tmpdir), 'second.txt'), (0, 0))
+    cache.max_size = entry_size * 2
+    cache.evict()
+
+    assert cache.get('second') is None
+    assert cache.get('first') is not None
+    assert cache.get('third') is not None
+    assert cache.size <= cache.max_size
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_evict_keep(tmpdir):
+    '''
+    the entry just put in isn't removed, even if it is too big
+    '''
+    cache = TextCache(str(tmpdir), max_size=10)
+
+    cache.put('first', 'some text')
+    cache.put('big', 'some text' * 10)
+
+    assert cache.get('first') is None
+    assert cache.get('big') is not None
+
+
+def test_evict_directories(tmpdir):
+    '''
+    entries can be directories
+    '''
+    cache = DiskCache(str(tmpdir), max_size=0)
+
+    for key in ('first', 'second'):
+        tmpdir.mkdir(key).join('data').write('some data')
+
+    assert cache.size == 2 * len('some data')
+
+    cache.evict(keep='second')
+
+    assert os.listdir(str(tmpdir)) == ['second']
+
+
+def test_default_cache(tmpdir, monkeypatch):
+    monkeypatch.delenv('TEXT_CACHE', raising=False)
+    assert DefaultCache(TextCache, 'TEXT_CACHE', 1024).get() is None
+
+    monkeypatch.setenv('TEXT_CACHE', str(tmpdir))
+    default = DefaultCache(TextCache, 'TEXT_CACHE', 1024)
+    cache = default.get()
+
+    assert isinstance(cache, TextCache)
+    assert cache.cache_dir == str(tmpdir)
+    assert cache.max_size == 1024
+
+    assert default.set(str(tmpdir), 2048).max_size == 2048
+    assert default.set(None) is None
+    assert default.get() is None
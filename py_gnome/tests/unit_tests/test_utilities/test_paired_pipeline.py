@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""
+tests for running the forecast and uncertainty tasks at the same time
+
+designed to be run with py.test
+"""
+
+import time
+import threading
+
+import pytest
+
+from gnome.utilities.paired_pipeline import RANDOM, run_tasks, run_paired
+
+
+class Resource(object):
+    'records the order in which it is used'
+    def __init__(self):
+        self.log = []
+
+    def use(self, who, delay=0.0):
+        time.sleep(delay)
+        self.log.append(who)
+
+
+def test_run_tasks():
+    res = Resource()
+
+    run_tasks([((res,), (lambda i=i: res.use(i))) for i in range(5)])
+
+    assert res.log == list(range(5))
+
+
+def test_shared_resources_in_order():
+    """
+    every resource sees all the forecast tasks before the uncertain ones
+    """
+    resources = [Resource() for _i in range(4)]
+
+    def tasks(who, delay):
+        return [((r,), (lambda r=r: r.use(who, delay))) for r in resources]
+
+    # the forecast tasks are slow, so the uncertain ones would get ahead
+    run_paired(tasks('forecast', 0.01), tasks('uncertain', 0.0))
+
+    for r in resources:
+        assert r.log == ['forecast', 'uncertain']
+
+
+def test_random_waits_for_all():
+    """
+    the uncertain tasks that use RANDOM wait for all the forecast ones
+    """
+    log = []
+
+    def task(who, delay=0.0):
+        def func():
+            time.sleep(delay)
+            log.append(who)
+        return func
+
+    first = [((RANDOM,), task('f1', 0.01)), ((RANDOM,), task('f2', 0.01)),
+             ((), task('f3', 0.02))]
+    second = [((RANDOM,), task('u1')), ((), task('u2'))]
+
+    run_paired(first, second)
+
+    assert log.index('u1') > log.index('f2')
+    # not waiting for f3
+    assert log.index('u2') < log.index('f3')
+
+
+def test_runs_on_two_threads():
+    threads = set()
+
+    def func():
+        threads.add(threading.current_thread())
+        time.sleep(0.01)
+
+    run_paired([((), func)], [((), func)])
+
+    assert len(threads) == 2
+    assert threading.current_thread() in threads
+
+
+def test_no_second():
+    res = Resource()
+
+    run_paired([((res,), lambda: res.use('forecast'))], [])
+
+    assert res.log == ['forecast']
+
+
+def test_error_in_first():
+    res = Resource()
+
+    def fail():
+        raise ValueError('failed')
+
+    first = [((res,), fail), ((res,), lambda: res.use('forecast'))]
+    second = [((res,), lambda: res.use('uncertain'))]
+
+    with pytest.raises(ValueError):
+        run_paired(first, second)
+
+    # the uncertain task was waiting for res, so it was not run
+    assert res.log == []
+
+
+def test_error_in_second():
+    res = Resource()
+
+    def fail():
+        raise ValueError('failed')
+
+    first = [((res,), lambda: res.use('forecast'))]
+    second = [((), fail), ((res,), lambda: res.use('uncertain'))]
+
+    with pytest.raises(ValueError):
+        run_paired(first, second)
+
+    assert res.log == ['forecast']
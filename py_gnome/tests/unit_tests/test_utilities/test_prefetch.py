@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+
+"""
+tests for the SlicePrefetcher
+
+designed to be run with py.test
+"""
+
+import time
+import threading
+
+import numpy as np
+import pytest
+
+from gnome.utilities.prefetch import (SlicePrefetcher, NetCDFLock,
+                                      netcdf_lock)
+
+
+class SlowData(object):
+    """
+    something like a netCDF variable on a slow disk: records the time
+    slices read, the threads they were read on, and whether netcdf_lock
+    was held
+    """
+    def __init__(self, num_times=10, delay=0.0):
+        self.array = np.arange(num_times * 6.0).reshape(num_times, 2, 3)
+        self.delay = delay
+        self.reads = []
+
+    def __getitem__(self, t):
+        self.locked = netcdf_lock._condition._is_owned()
+        time.sleep(self.delay)
+        self.reads.append((t, threading.current_thread().name))
+
+        return self.array[t]
+
+
+def test_hit():
+    data = SlowData()
+    prefetcher = SlicePrefetcher()
+
+    prefetcher.prefetch(data, 3)
+    prefetcher.prefetch(data, 4)
+    assert prefetcher.prefetched(data, 3)
+
+    assert np.array_equal(prefetcher.read(data, 3), data.array[3])
+    assert np.array_equal(prefetcher.read(data, 4), data.array[4])
+
+    assert prefetcher.stats['hits'] == 2
+    assert prefetcher.stats['misses'] == 0
+    assert not prefetcher.prefetched(data, 3)
+
+    # read in the background
+    assert all(name.startswith('gnome-prefetch') for _t, name in data.reads)
+
+    prefetcher.stop()
+
+
+def test_miss():
+    data = SlowData()
+    prefetcher = SlicePrefetcher()
+
+    assert np.array_equal(prefetcher.read(data, 2), data.array[2])
+
+    assert prefetcher.stats['hits'] == 0
+    assert prefetcher.stats['misses'] == 1
+    assert data.reads == [(2, threading.current_thread().name)]
+
+
+def test_read_once():
+    """
+    a slice that has been read already isn't prefetched again
+    """
+    data = SlowData()
+    prefetcher = SlicePrefetcher()
+
+    prefetcher.read(data, 1)
+    prefetcher.prefetch(data, 1)
+    prefetcher.prefetch(data, 2)
+    prefetcher.prefetch(data, 2)
+    prefetcher.read(data, 2)
+
+    assert [t for t, _name in data.reads] == [1, 2]
+
+    prefetcher.stop()
+
+
+def test_wait_time():
+    data = SlowData(delay=0.05)
+    prefetcher = SlicePrefetcher()
+
+    prefetcher.prefetch(data, 0)
+    prefetcher.read(data, 0)
+
+    assert prefetcher.stats['hits'] == 1
+    assert prefetcher.stats['wait_time'] > 0.0
+
+    prefetcher.stop()
+
+
+def test_bounded():
+    data = SlowData(delay=0.01)
+    prefetcher = SlicePrefetcher(max_buffered=2)
+
+    for t in range(5):
+        prefetcher.prefetch(data, t)
+
+    assert prefetcher.stats['buffered'] == 2
+
+    # the oldest were dropped
+    for t in range(5):
+        assert np.array_equal(prefetcher.read(data, t), data.array[t])
+
+    assert prefetcher.stats['hits'] == 2
+    assert prefetcher.stats['misses'] == 3
+
+    prefetcher.stop()
+
+
+def test_error():
+    """
+    an error reading in the background is raised by read()
+    """
+    prefetcher = SlicePrefetcher()
+    data = SlowData(num_times=2)
+
+    prefetcher.prefetch(data, 5)
+
+    with pytest.raises(IndexError):
+        prefetcher.read(data, 5)
+
+    prefetcher.stop()
+
+
+def test_lock():
+    """
+    the slices are read holding netcdf_lock, and read() lets go of it while
+    waiting for one, so it can be called holding it.
+    """
+    data = SlowData(delay=0.05)
+    prefetcher = SlicePrefetcher()
+
+    with netcdf_lock.in_use(), netcdf_lock.held():
+        prefetcher.prefetch(data, 0)
+        # the worker can't read while it's held
+        time.sleep(0.1)
+        assert data.reads == []
+
+        assert np.array_equal(prefetcher.read(data, 0), data.array[0])
+
+    assert data.locked
+    assert prefetcher.stats['hits'] == 1
+
+    prefetcher.stop()
+
+
+def test_lock_users():
+    """
+    the prefetcher's thread is a user of netcdf_lock until it is stopped
+    """
+    users = netcdf_lock.users
+    prefetcher = SlicePrefetcher()
+
+    prefetcher.prefetch(SlowData(), 0)
+    assert netcdf_lock.users == users + 1
+
+    prefetcher.stop()
+    assert netcdf_lock.users == users
+
+
+def test_lock_unused():
+    """
+    with no users, netcdf_lock.held() doesn't lock, and a user waits for the
+    reads being made to be done
+    """
+    lock = NetCDFLock()
+    events = []
+
+    def start():
+        with lock.in_use():
+            events.append('started')
+
+    with lock.held():
+        assert not lock._condition._is_owned()
+
+        thread = threading.Thread(target=start)
+        thread.start()
+        time.sleep(0.05)
+        events.append('read')
+
+    thread.join()
+
+    assert events == ['read', 'started']
+
+    with lock.in_use(), lock.held():
+        assert lock._condition._is_owned()
+
+
+def test_reset():
+    data = SlowData()
+    prefetcher = SlicePrefetcher()
+
+    prefetcher.prefetch(data, 0)
+    prefetcher.read(data, 0)
+    prefetcher.reset()
+
+    assert prefetcher.stats == {'hits': 0,
+                                'misses': 0,
+                                'wait_time': 0.0,
+                                'buffered': 0}
+
+    # after a rewind, slices are read again
+    prefetcher.prefetch(data, 0)
+    prefetcher.read(data, 0)
+
+    assert prefetcher.stats['hits'] == 1
+
+    prefetcher.stop()
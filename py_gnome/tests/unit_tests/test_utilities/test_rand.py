@@ -11,7 +11,8 @@ Test gnome.utilities.rand.py
 import numpy as np
 import random
 
-from gnome.utilities.rand import random_with_persistance, seed
+from gnome.utilities.rand import (random_with_persistance, seed,
+                                  stream_random)
 from gnome.cy_gnome.cy_helpers import rand
 
 import pytest
@@ -95,3 +96,33 @@ def test_set_seed():
     assert xi == xf
     assert np.all(ai == af)
     assert ci == cf
+
+
+def test_stream_random():
+    """
+    each element's numbers depend on its key, not on the other elements
+    """
+    ids = np.arange(1000, dtype=np.uint32)
+    spill_nums = np.repeat([0, 1], 500).astype(np.uint16)
+
+    x = stream_random(ids, spill_nums, 3600)
+    assert np.all((x >= 0.0) & (x < 1.0))
+
+    # in a different order, or only some of them
+    order = np.random.permutation(len(ids))
+    assert np.all(stream_random(ids[order], spill_nums[order], 3600) ==
+                  x[order])
+    assert np.all(stream_random(ids[::7], spill_nums[::7], 3600) == x[::7])
+
+    # every part of the key makes different numbers
+    for other in (stream_random(ids, spill_nums, 4500),
+                  stream_random(ids, spill_nums, 3600, stream=1),
+                  stream_random(ids, spill_nums, 3600, uncertain=True),
+                  stream_random(ids, spill_nums, 3600, draw=2),
+                  stream_random(ids, spill_nums[::-1], 3600)):
+        assert np.sum(other == x) < 10
+
+    seed(2)
+    assert np.all(stream_random(ids, spill_nums, 3600) != x)
+    seed(1)
+    assert np.all(stream_random(ids, spill_nums, 3600) == x)
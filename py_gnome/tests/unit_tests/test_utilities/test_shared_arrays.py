@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+tests for passing arrays through shared memory
+
+designed to be run with py.test
+"""
+
+import multiprocessing as mp
+from pickle import loads, dumps
+
+import numpy as np
+
+from gnome.utilities.shared_arrays import (SharedArraySender,
+                                           SharedArrayReceiver,
+                                           SharedArrayRef,
+                                           start_resource_tracker)
+
+
+def make_result(num_elements):
+    return {'step_num': 3,
+            'positions': np.random.random((num_elements, 3)),
+            'small': np.arange(3),
+            'more': [np.arange(num_elements, dtype=np.int16),
+                     ('a string', 2.0)],
+            }
+
+
+def check_result(result, expected):
+    assert result['step_num'] == expected['step_num']
+    assert np.array_equal(result['positions'], expected['positions'])
+    assert np.array_equal(result['small'], expected['small'])
+    assert np.array_equal(result['more'][0], expected['more'][0])
+    assert result['more'][0].dtype == np.int16
+    assert result['more'][1] == ('a string', 2.0)
+
+
+def test_pack_unpack():
+    sender = SharedArraySender(min_nbytes=100)
+    receiver = SharedArrayReceiver()
+    expected = make_result(1000)
+
+    try:
+        packed = sender.pack(expected)
+
+        assert isinstance(packed['positions'], SharedArrayRef)
+        assert isinstance(packed['more'][0], SharedArrayRef)
+        # small arrays are just pickled
+        assert isinstance(packed['small'], np.ndarray)
+
+        check_result(receiver.unpack(loads(dumps(packed))), expected)
+    finally:
+        receiver.close()
+        sender.close()
+
+
+def test_no_arrays():
+    sender = SharedArraySender()
+    result = {'step_num': 1, 'WeatheringOutput': {'floating': 10.0}}
+
+    assert sender.pack(result) is result
+    assert SharedArrayReceiver().unpack(result) == result
+
+
+def test_grows():
+    """
+    a bigger result gets a new block of shared memory
+    """
+    sender = SharedArraySender(min_nbytes=100)
+    receiver = SharedArrayReceiver()
+
+    try:
+        for num_elements in (1000, 1000000, 1000):
+            expected = make_result(num_elements)
+            check_result(receiver.unpack(sender.pack(expected)), expected)
+    finally:
+        receiver.close()
+        sender.close()
+
+
+def send_results(conn, sizes):
+    sender = SharedArraySender(min_nbytes=100)
+
+    for num_elements in sizes:
+        np.random.seed(num_elements)
+        conn.send_bytes(dumps(sender.pack(make_result(num_elements))))
+        # wait until it's been read
+        conn.recv()
+
+    sender.close()
+
+
+def test_between_processes():
+    sizes = (100, 1000, 1000000)
+    start_resource_tracker()
+
+    conn, child_conn = mp.Pipe()
+    proc = mp.Process(target=send_results, args=(child_conn, sizes))
+    proc.start()
+
+    receiver = SharedArrayReceiver()
+
+    try:
+        for num_elements in sizes:
+            result = receiver.unpack(loads(conn.recv_bytes()))
+            conn.send(None)
+
+            np.random.seed(num_elements)
+            check_result(result, make_result(num_elements))
+    finally:
+        proc.join()
+        receiver.close(unlink=True)
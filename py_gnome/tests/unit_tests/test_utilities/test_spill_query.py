@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+tests for the SpillQuery
+
+designed to be run with py.test
+"""
+
+import numpy as np
+
+import pytest
+
+from gnome.utilities.spill_query import SpillQuery
+
+
+@pytest.fixture
+def data():
+    return {'id': np.arange(6),
+            'age': np.array([0., 10., 20., 30., 40., 50.]),
+            'status_codes': np.array([2, 3, 2, 3, 10, 2], dtype=np.int16),
+            'positions': np.arange(18.).reshape(6, 3),
+            }
+
+
+@pytest.mark.parametrize(('conditions', 'ids'),
+                         [('age > 15', [2, 3, 4, 5]),
+                          ('age>15', [2, 3, 4, 5]),
+                          ('age <= 10 || age >= 50', [0, 1, 5]),
+                          ('status_codes != 2', [1, 3, 4]),
+                          ('age > 15 && status_codes == 2 || '
+                           'status_codes == 3', [2, 3, 5]),
+                          ('positions[2] >= 8.5', [3, 4, 5]),
+                          ('positions[-1] < 3 && positions[0] == 0', [0]),
+                          ('', [0, 1, 2, 3, 4, 5]),
+                          (None, [0, 1, 2, 3, 4, 5]),
+                          ])
+def test_mask(data, conditions, ids):
+    mask = SpillQuery(conditions).mask(data)
+
+    assert mask.dtype == bool
+    assert np.array_equal(data['id'][mask], ids)
+
+
+def test_select(data):
+    result = SpillQuery('status_codes == 3').select(data, ['id', 'positions'])
+
+    assert set(result) == {'id', 'positions'}
+    assert np.array_equal(result['id'], [1, 3])
+    assert np.array_equal(result['positions'], data['positions'][[1, 3]])
+
+
+def test_select_none_match(data):
+    result = SpillQuery('age < 0').select(data, ['positions'])
+
+    assert result['positions'].shape == (0, 3)
+
+
+def test_names():
+    query = SpillQuery('age > 1 && mass < 2 || positions[1] > 3')
+
+    assert query.names == {'age', 'mass', 'positions'}
+
+
+@pytest.mark.parametrize('conditions', ['age = 3',
+                                        'age > x',
+                                        'age >',
+                                        'age > 1 &&',
+                                        ])
+def test_parse_error(conditions):
+    with pytest.raises(ValueError):
+        SpillQuery(conditions)
+
+
+@pytest.mark.parametrize('conditions', ['positions > 1',
+                                        'positions[3] > 1',
+                                        'age[0] > 1',
+                                        'not_there == 1',
+                                        ])
+def test_bad_array(data, conditions):
+    with pytest.raises(ValueError):
+        SpillQuery(conditions).mask(data)
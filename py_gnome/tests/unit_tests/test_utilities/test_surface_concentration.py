@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""
+tests for computing the surface concentration
+
+designed to be run with py.test
+"""
+
+import numpy as np
+import pytest
+
+from gnome.utilities.surface_concentration import (
+    compute_surface_concentration, surface_conc_kde, surface_conc_binned)
+
+
+def make_sc(num_elements, hours=3):
+    '''
+    just the data arrays the surface concentration code uses: a
+    continuous release that is spreading out
+    '''
+    rs = np.random.RandomState(1)
+
+    age = rs.randint(0, hours * 3600, num_elements)
+    spread = 0.002 + 0.01 * age / 3600.
+    lon = -88.0 + 0.05 * age / 3600. + rs.normal(0, 1, num_elements) * spread
+    lat = 28.0 + rs.normal(0, 1, num_elements) * spread * 0.5
+
+    return {'positions': np.c_[lon, lat, np.zeros_like(lon)],
+            'mass': rs.uniform(0.5, 1.5, num_elements),
+            'age': age,
+            'spill_num': np.arange(num_elements) % 2,
+            }
+
+
+@pytest.mark.parametrize("equal_mass", (False, True))
+def test_binned_same_as_kde(equal_mass):
+    kde_sc = make_sc(2000)
+    binned_sc = make_sc(2000)
+    if equal_mass:
+        kde_sc['mass'][:] = binned_sc['mass'][:] = 1.0
+
+    surface_conc_kde(kde_sc)
+    surface_conc_binned(binned_sc)
+
+    kde = kde_sc['surface_concentration']
+    binned = binned_sc['surface_concentration']
+
+    assert np.all(kde > 0)
+    assert np.median(np.abs(binned / kde - 1)) < 0.005
+    assert np.allclose(binned, kde, rtol=0.05)
+
+
+@pytest.mark.parametrize("num_elements", (2000, 20000))
+def test_binned_elongated_diagonal(num_elements):
+    '''
+    a long, thin cloud at 45 degrees: the kernel is too, and the grid has
+    to be lined up with it
+    '''
+    rs = np.random.RandomState(2)
+    along = rs.normal(0, 0.05, num_elements)
+    across = rs.normal(0, 0.0005, num_elements)
+
+    sc = {'positions': np.c_[-88.0 + along + across,
+                             28.0 + along - across,
+                             np.zeros(num_elements)],
+          'mass': np.ones(num_elements),
+          'age': np.zeros(num_elements, dtype=int),
+          'spill_num': np.zeros(num_elements, dtype=int),
+          }
+    binned_sc = {k: v.copy() for k, v in sc.items()}
+
+    surface_conc_kde(sc)
+    surface_conc_binned(binned_sc)
+
+    kde = sc['surface_concentration']
+    binned = binned_sc['surface_concentration']
+
+    assert np.median(np.abs(binned / kde - 1)) < 0.005
+    assert np.allclose(binned, kde, rtol=0.05)
+
+
+def test_binned_too_few_points():
+    'like the kde: nothing computed for less than 3 different positions'
+    sc = make_sc(10)
+    sc['positions'][:] = sc['positions'][0]
+
+    surface_conc_binned(sc)
+
+    assert np.all(sc['surface_concentration'] == 0.0)
+
+
+@pytest.mark.parametrize("algorithm", ("kde", "binned"))
+def test_compute_surface_concentration(algorithm):
+    sc = make_sc(100)
+
+    compute_surface_concentration(sc, algorithm)
+
+    assert sc['surface_concentration'].shape == (100,)
+    assert np.all(sc['surface_concentration'] > 0)
+
+
+def test_compute_surface_concentration_unknown():
+    with pytest.raises(ValueError):
+        compute_surface_concentration(make_sc(100), 'something')
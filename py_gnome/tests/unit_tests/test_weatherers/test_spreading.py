@@ -200,6 +200,45 @@ class TestFayGravityViscous(object):
         assert np.all(area[:4] == i_area)
         assert np.all(area[4:] < i_area)
 
+    @pytest.mark.parametrize("shuffle", (False, True))
+    def test_many_blobs(self, shuffle):
+        '''
+        updating all the blobs at once gives the same area as updating each
+        blob on its own, whether or not the LEs are in release order
+        '''
+        num_blobs = 20
+        bulk_init_volume, age, area = data_arrays(num_blobs * 5)
+
+        age[:] = np.repeat(np.arange(num_blobs, 0, -1) * 900, 5)
+        bulk_init_volume[:] = np.repeat(np.linspace(10, 1000, num_blobs), 5)
+        for i in range(num_blobs):
+            area[i * 5:(i + 1) * 5] = (self.spread.init_area(
+                                           water_viscosity,
+                                           rel_buoy,
+                                           bulk_init_volume[i * 5]) / 5)
+
+        expected = area.copy()
+        for i in range(num_blobs):
+            blob = slice(i * 5, (i + 1) * 5)
+            self.spread.update_area2(water_viscosity,
+                                     rel_buoy,
+                                     bulk_init_volume[blob],
+                                     expected[blob],
+                                     default_ts,
+                                     age[blob])
+
+        order = (np.random.permutation(len(age)) if shuffle
+                 else np.arange(len(age)))
+        result = self.spread.update_area2(water_viscosity,
+                                          rel_buoy,
+                                          bulk_init_volume[order],
+                                          area[order],
+                                          default_ts,
+                                          age[order])
+
+        assert np.allclose(result, expected[order], rtol=1e-12)
+        assert np.any(result != area[order])
+
 
 class TestLangmuir(ObjForTests):
     thick = 1e-4